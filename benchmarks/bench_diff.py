@@ -0,0 +1,37 @@
+"""
+Benchmark diffing the Homes of a plan stage, field by field against comparing JSON.
+
+Run with: python benchmarks/bench_diff.py [repeats]
+"""
+
+import sys
+import timeit
+
+from python_challenge import utils
+from python_challenge.compact import json_diff
+from python_challenge.diff import diff_models
+from python_challenge.types.retrofit_planner import RetrofitPlannerResponsePublic
+
+PATH_RESULTS = utils.PATH_DATA / "1e0e7511-9e40-4b13-8c52-4f9c26c41c55.json"
+
+
+def main(repeats: int) -> None:
+    results = RetrofitPlannerResponsePublic.model_validate_json(
+        PATH_RESULTS.read_text()
+    )
+    baseline = results.baseline_home
+    improved = results.improvement_plan[0].improved_home
+
+    def json_trees() -> None:
+        json_diff(baseline.model_dump(mode="json"), improved.model_dump(mode="json"))
+
+    def models() -> None:
+        diff_models(baseline, improved)
+
+    for name, function in (("JSON trees", json_trees), ("models", models)):
+        elapsed = min(timeit.repeat(function, number=repeats, repeat=5))
+        print(f"{name}: {elapsed / repeats * 1e6:.1f}µs per stage")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,64 @@
+"""
+Benchmark classifying energy sources by fuel class: EnergySource's properties, the
+precomputed tables, and a column of enum codes at once.
+
+Run with: python benchmarks/bench_fuels.py [sources]
+"""
+
+import random
+import sys
+import timeit
+from collections.abc import Callable
+
+from python_challenge.enum_codes import enum_codes
+from python_challenge.fuels import GAS
+from python_challenge.fuels import OIL
+from python_challenge.fuels import SOLID
+from python_challenge.fuels import classify
+from python_challenge.fuels import fuel_class
+from python_challenge.types.enums import EnergySource
+
+
+def _best(run: Callable[[], object]) -> float:
+    """Fastest time of a run, as the machine's other load only slows it."""
+    return min(timeit.repeat(run, number=1, repeat=7))
+
+
+def main(count: int) -> None:
+    sources = random.Random(0).choices(list(EnergySource), k=count)
+    codes = enum_codes().encode(sources)
+
+    def properties() -> list[str]:
+        return [
+            (
+                "gas"
+                if source.is_gas
+                else "oil" if source.is_oil else "solid" if source.is_solid else ""
+            )
+            for source in sources
+        ]
+
+    def frozensets() -> list[str]:
+        return [
+            (
+                "gas"
+                if source in GAS
+                else "oil" if source in OIL else "solid" if source in SOLID else ""
+            )
+            for source in sources
+        ]
+
+    def table() -> list[str]:
+        return [fuel_class(source) for source in sources]
+
+    for name, run in (
+        ("properties", properties),
+        ("frozensets", frozensets),
+        ("table", table),
+        ("vectorized", lambda: classify(codes)),
+    ):
+        print(f"{name}: {_best(run) / count * 1e9:.0f}ns per source")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
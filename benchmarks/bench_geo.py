@@ -0,0 +1,78 @@
+"""
+Benchmark the Home location spatial index with 1 million points.
+
+Run with: python benchmarks/bench_geo.py
+"""
+
+import random
+import resource
+import time
+
+from python_challenge.geo import BoundingBox
+from python_challenge.geo import GridIndex
+
+POINTS = 1_000_000
+QUERIES = 1_000
+
+# Roughly the extent of Great Britain.
+MIN_LONGITUDE, MAX_LONGITUDE = -6.0, 1.8
+MIN_LATITUDE, MAX_LATITUDE = 50.0, 58.5
+
+
+def main() -> None:
+    rng = random.Random(1)
+    points = [
+        (
+            str(100_000_000 + i),
+            rng.uniform(MIN_LONGITUDE, MAX_LONGITUDE),
+            rng.uniform(MIN_LATITUDE, MAX_LATITUDE),
+        )
+        for i in range(POINTS)
+    ]
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    index = GridIndex()
+    for key, longitude, latitude in points:
+        index.insert(key, longitude, latitude)
+    elapsed = time.perf_counter() - start
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - rss_before
+    print(f"build: {POINTS:,} points in {elapsed:.2f}s (+{rss / 1024:.0f} MiB RSS)")
+
+    centres = points[:QUERIES]
+    for radius in (500, 2_000):
+        start = time.perf_counter()
+        found = sum(
+            len(index.within_radius(longitude, latitude, radius))
+            for _, longitude, latitude in centres
+        )
+        elapsed = time.perf_counter() - start
+        print(
+            f"radius {radius}m: {elapsed / QUERIES * 1e6:.0f}µs/query,"
+            f" {found / QUERIES:.1f} homes/query"
+        )
+
+    start = time.perf_counter()
+    found = sum(
+        len(
+            index.within_bbox(
+                BoundingBox(longitude, latitude, longitude + 0.05, latitude + 0.05)
+            )
+        )
+        for _, longitude, latitude in centres
+    )
+    elapsed = time.perf_counter() - start
+    print(
+        f"bbox 0.05°: {elapsed / QUERIES * 1e6:.0f}µs/query,"
+        f" {found / QUERIES:.1f} homes/query"
+    )
+
+    start = time.perf_counter()
+    for key, longitude, latitude in points[:QUERIES]:
+        index.insert(key, longitude + 0.001, latitude)
+    elapsed = time.perf_counter() - start
+    print(f"move: {elapsed / QUERIES * 1e6:.0f}µs/insert")
+
+
+if __name__ == "__main__":
+    main()
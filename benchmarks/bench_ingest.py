@@ -0,0 +1,53 @@
+"""
+Benchmark JSONL ingestion throughput by number of worker processes.
+
+Run with: python benchmarks/bench_ingest.py [documents]
+"""
+
+import os
+import sys
+import tempfile
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from python_challenge import utils
+from python_challenge.ingest import ingest_jsonl
+from python_challenge.types.retrofit_planner import RetrofitPlannerResponsePublic
+
+PATH_RESULTS = utils.PATH_DATA / "1e0e7511-9e40-4b13-8c52-4f9c26c41c55.json"
+
+
+def main(documents: int) -> None:
+    results = RetrofitPlannerResponsePublic.model_validate_json(
+        PATH_RESULTS.read_text()
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        path = Path(directory) / "results.jsonl"
+        with open(path, "w") as file:
+            for _ in range(documents):
+                results.simulation_id = uuid.uuid4()
+                file.write(results.model_dump_json() + "\n")
+
+        cpus = os.cpu_count() or 1
+        for workers in sorted({1, 2, 4, cpus}):
+            utils.PATH_DATA = Path(tempfile.mkdtemp(dir=directory))
+            utils.clear_caches()
+            start = time.perf_counter()
+            with (
+                open(path) as file,
+                ProcessPoolExecutor(max_workers=workers) as executor,
+            ):
+                report = ingest_jsonl(
+                    file, "results", executor, max_pending=workers * 2
+                )
+            elapsed = time.perf_counter() - start
+            print(
+                f"{workers} workers: {report.stored / elapsed:.0f} results/s"
+                f" ({cpus} CPUs)"
+            )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,117 @@
+"""
+Benchmark the latency each middleware adds to a request, with the full stack of
+middleware and with the lean one of the API's paths (see SkippedOnLeanPaths).
+
+The stack is built as Django builds it, each middleware wrapped to time its calls, so a
+middleware's latency is the time spent in it less the time spent in the middleware (and
+view) after it. Async-only middleware is left out, as it only runs under ASGI.
+
+Run with: python benchmarks/bench_middleware.py [repeats]
+"""
+
+import logging
+import os
+import sys
+import time
+from collections.abc import Callable
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "python_challenge.settings")
+django.setup()
+
+from django.conf import settings  # noqa: E402
+from django.http import HttpRequest  # noqa: E402
+from django.http.response import HttpResponseBase  # noqa: E402
+from django.test import RequestFactory  # noqa: E402
+from django.urls import resolve  # noqa: E402
+from django.utils.module_loading import import_string  # noqa: E402
+
+from python_challenge.middleware import SkippedOnLeanPaths  # noqa: E402
+
+PATHS = ["/api/homes", "/docs/"]
+
+Handler = Callable[[HttpRequest], HttpResponseBase]
+
+
+def _unwrapped(path: str) -> str:
+    middleware = import_string(path)
+    if isinstance(middleware, type) and issubclass(middleware, SkippedOnLeanPaths):
+        return middleware.wrapped
+    return path
+
+
+def _timed(handler: Handler, totals: list[float], index: int) -> Handler:
+    def timed(request: HttpRequest) -> HttpResponseBase:
+        start = time.perf_counter()
+        response = handler(request)
+        totals[index] += time.perf_counter() - start
+        return response
+
+    return timed
+
+
+def _breakdown(middleware: list[str], path: str, repeats: int) -> list[float]:
+    """Mean latency of each middleware, and of the view last."""
+    match = resolve(path)
+    # Time spent in each middleware and everything after it, and in its hooks.
+    totals = [0.0] * (len(middleware) + 1)
+    hooks = [0.0] * len(middleware)
+    instances = []
+
+    def view(request: HttpRequest) -> HttpResponseBase:
+        for index, instance in enumerate(instances):
+            if process_view := getattr(instance, "process_view", None):
+                start = time.perf_counter()
+                process_view(request, match.func, match.args, match.kwargs)
+                hooks[index] += time.perf_counter() - start
+        response = match.func(request, *match.args, **match.kwargs)
+        return response.render() if hasattr(response, "render") else response
+
+    handler = _timed(view, totals, len(middleware))
+    for index in reversed(range(len(middleware))):
+        instance = import_string(middleware[index])(handler)
+        instances.insert(0, instance)
+        handler = _timed(instance, totals, index)
+
+    factory = RequestFactory(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+    # Warm up the caches.
+    handler(factory.get(path))
+    totals[:] = [0.0] * len(totals)
+    hooks[:] = [0.0] * len(hooks)
+    for _ in range(repeats):
+        handler(factory.get(path))
+
+    latencies = [
+        total - inner + hook for total, inner, hook in zip(totals, totals[1:], hooks)
+    ]
+    latencies.append(totals[-1] - sum(hooks))
+    return [latency / repeats for latency in latencies]
+
+
+def main(repeats: int) -> None:
+    # Don't time writing the logs of each request.
+    logging.disable(logging.CRITICAL)
+    lean = [
+        path
+        for path in settings.MIDDLEWARE
+        if getattr(import_string(path), "sync_capable", True)
+    ]
+    full = [_unwrapped(path) for path in lean]
+    for path in PATHS:
+        full_breakdown = _breakdown(full, path, repeats)
+        lean_breakdown = _breakdown(lean, path, repeats)
+        print(f"\n{path}, µs per request")
+        print(f"{'middleware':<55}{'full':>8}{'lean':>8}")
+        for name, full_latency, lean_latency in zip(
+            [*full, "(view)"], full_breakdown, lean_breakdown
+        ):
+            print(f"{name:<55}{full_latency * 1e6:>8.1f}{lean_latency * 1e6:>8.1f}")
+        print(
+            f"{'total middleware':<55}{sum(full_breakdown[:-1]) * 1e6:>8.1f}"
+            f"{sum(lean_breakdown[:-1]) * 1e6:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -0,0 +1,49 @@
+"""
+Benchmark the heat loss through the walls and roofs of many Homes, with the Decimal
+U-values of the pydantic models, and with a FabricTable.
+
+Run with: python benchmarks/bench_numeric.py [homes]
+"""
+
+import sys
+import timeit
+from collections.abc import Callable
+from decimal import Decimal
+
+from python_challenge.numeric import FabricTable
+from python_challenge.types.home import Home
+from python_challenge.utils import PATH_DATA
+
+PATH_HOME = PATH_DATA / "906205784.json"
+
+
+def _best(run: Callable[[], object]) -> float:
+    """Fastest time of a run, as the machine's other load only slows it."""
+    return min(timeit.repeat(run, number=1, repeat=7))
+
+
+def main(count: int) -> None:
+    homes = [Home.model_validate_json(PATH_HOME.read_text())] * count
+
+    def decimals() -> list[Decimal]:
+        losses = []
+        for home in homes:
+            loss = Decimal(0)
+            for element in (home.wall, home.roof):
+                if element and element.average_thermal_transmittance is not None:
+                    loss += element.average_thermal_transmittance * Decimal(
+                        element.surface_area or 0
+                    )
+            losses.append(loss)
+        return losses
+
+    table = FabricTable.from_homes(homes)
+    print(f"Decimals: {_best(decimals) * 1000:.2f}ms")
+    print(
+        f"FabricTable: {_best(lambda: FabricTable.from_homes(homes)) * 1000:.2f}ms"
+        f" to build, then {_best(table.opaque_heat_loss) * 1000:.3f}ms"
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
@@ -0,0 +1,59 @@
+"""
+Benchmark the electric peak of a portfolio after each stage of the plans, summing the
+Decimals of the pydantic models, and from a PeakTable.
+
+Run with: python benchmarks/bench_peaks.py [homes]
+"""
+
+import sys
+import timeit
+from collections.abc import Callable
+from decimal import Decimal
+
+from python_challenge.peaks import PeakTable
+from python_challenge.types.enums import EnergySource
+from python_challenge.types.retrofit_planner import RetrofitPlannerResponsePublic
+from python_challenge.utils import PATH_DATA
+
+PATH_RESULTS = PATH_DATA / "1e0e7511-9e40-4b13-8c52-4f9c26c41c55.json"
+
+
+def _best(run: Callable[[], object]) -> float:
+    """Fastest time of a run, as the machine's other load only slows it."""
+    return min(timeit.repeat(run, number=1, repeat=7))
+
+
+def main(homes: int) -> None:
+    results = RetrofitPlannerResponsePublic.model_validate_json(
+        PATH_RESULTS.read_text()
+    )
+    portfolio = [results] * homes
+
+    def decimals() -> list[Decimal]:
+        totals = []
+        for stage in range(len(results.improvement_plan) + 1):
+            total = Decimal(0)
+            for home in portfolio:
+                profile = (
+                    home.improvement_plan[stage - 1].energy_profile
+                    if stage
+                    else home.baseline_energy_profile
+                )
+                total += profile.peak_hourly_energy_sources.get(
+                    EnergySource.ELECTRIC, Decimal(0)
+                )
+            totals.append(total)
+        return totals
+
+    table_seconds = _best(lambda: PeakTable.from_results(portfolio))
+    table = PeakTable.from_results(portfolio)
+    print(f"Decimals: {_best(decimals) * 1000:.2f}ms")
+    print(f"PeakTable: {table_seconds * 1000:.2f}ms to build, then ", end="")
+    print(
+        f"{_best(lambda: table.stage_totals(EnergySource.ELECTRIC)) * 1000:.3f}ms"
+        " per total"
+    )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 10_000)
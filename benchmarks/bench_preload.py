@@ -0,0 +1,105 @@
+"""
+Benchmark gunicorn's workers with and without preload_app: how long each takes from
+being forked to serving, and its memory (RSS, PSS and private) after some requests.
+
+PSS (proportional set size) shares each page between the processes using it, so it is
+the memory a worker really costs. Linux only, as it reads /proc.
+
+Run with: python benchmarks/bench_preload.py [workers]
+"""
+
+import os
+import re
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+SIMULATION_ID = "1e0e7511-9e40-4b13-8c52-4f9c26c41c55"
+URLS = ["/api/homes", f"/api/results/{SIMULATION_ID}", "/api/homes/export"]
+
+BOOTING = re.compile(r"Booting worker with pid: (\d+)")
+STARTED = re.compile(r"Started server process \[(\d+)\]")
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _memory_kb(pid: int) -> dict[str, int]:
+    memory = {}
+    for line in Path(f"/proc/{pid}/smaps_rollup").read_text().splitlines()[1:]:
+        name, value, _ = line.split()
+        memory[name.rstrip(":")] = int(value)
+    return memory
+
+
+def _average_mib(memory: list[dict[str, int]], *names: str) -> float:
+    return sum(worker[name] for worker in memory for name in names) / len(memory) / 1024
+
+
+def run(workers: int, preload: bool) -> None:
+    port = _free_port()
+    env = dict(
+        os.environ,
+        GUNICORN_PRELOAD="1" if preload else "0",
+        GUNICORN_WORKERS=str(workers),
+        PORT=str(port),
+    )
+    start = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    assert process.stderr is not None
+    forked: dict[int, float] = {}
+    started: dict[int, float] = {}
+    for line in process.stderr:
+        if match := BOOTING.search(line):
+            forked[int(match[1])] = time.perf_counter()
+        elif match := STARTED.search(line):
+            started[int(match[1])] = time.perf_counter()
+            if len(started) == workers:
+                break
+    all_ready = time.perf_counter() - start
+    # Keep reading the log, so gunicorn never blocks on a full pipe.
+    threading.Thread(target=process.stderr.read, daemon=True).start()
+
+    for _ in range(workers * 10):
+        for url in URLS:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}{url}") as response:
+                response.read()
+
+    memory = [_memory_kb(pid) for pid in started]
+    process.send_signal(signal.SIGTERM)
+    process.wait()
+
+    boot = sum(started[pid] - forked[pid] for pid in started) / workers
+    rss = _average_mib(memory, "Rss")
+    pss = _average_mib(memory, "Pss")
+    private = _average_mib(memory, "Private_Clean", "Private_Dirty")
+    print(
+        f"preload_app={preload}: all {workers} workers ready after {all_ready:.2f}s,"
+        f" {boot * 1000:.0f}ms from fork to serving,"
+        f" RSS {rss:.1f}MiB, PSS {pss:.1f}MiB, private {private:.1f}MiB per worker"
+    )
+
+
+def main(workers: int) -> None:
+    for preload in (False, True):
+        run(workers, preload)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4)
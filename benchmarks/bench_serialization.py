@@ -0,0 +1,35 @@
+"""
+Benchmark serializing results to JSON with pydantic against dump_json, which rounds the
+FloatJSONRound figures of the EnergyProfiles in bulk.
+
+Run with: python benchmarks/bench_serialization.py [repeats]
+"""
+
+import sys
+import timeit
+
+from python_challenge import utils
+from python_challenge.serialization import dump_json
+from python_challenge.types.retrofit_planner import RetrofitPlannerResponsePublic
+
+PATH_RESULTS = utils.PATH_DATA / "1e0e7511-9e40-4b13-8c52-4f9c26c41c55.json"
+
+
+def main(repeats: int) -> None:
+    results = RetrofitPlannerResponsePublic.model_validate_json(
+        PATH_RESULTS.read_text()
+    )
+    profile = results.baseline_energy_profile
+    assert dump_json(results) == results.model_dump_json()
+
+    for document, model in (("results", results), ("profile", profile)):
+        for name, function in (
+            ("model_dump_json", model.model_dump_json),
+            ("dump_json", lambda: dump_json(model)),
+        ):
+            elapsed = min(timeit.repeat(function, number=repeats, repeat=5))
+            print(f"{document}, {name}: {elapsed / repeats * 1e6:.1f}µs")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,49 @@
+"""
+Benchmark concurrent loads of the same results, as when a dashboard opens, each loading
+the document itself against coalesced into one load by get_results.
+
+Run with: python benchmarks/bench_single_flight.py [threads]
+"""
+
+import sys
+import threading
+import time
+from collections.abc import Callable
+
+from python_challenge import utils
+
+SIMULATION_ID = "1e0e7511-9e40-4b13-8c52-4f9c26c41c55"
+
+
+def _concurrently(load: Callable[[str], object], threads: int) -> tuple[float, float]:
+    barrier = threading.Barrier(threads + 1)
+
+    def run() -> None:
+        barrier.wait()
+        load(SIMULATION_ID)
+
+    workers = [threading.Thread(target=run) for _ in range(threads)]
+    for worker in workers:
+        worker.start()
+    start_wall, start_cpu = time.perf_counter(), time.process_time()
+    barrier.wait()
+    for worker in workers:
+        worker.join()
+    return time.perf_counter() - start_wall, time.process_time() - start_cpu
+
+
+def main(threads: int) -> None:
+    for name, load in (
+        ("each loading", utils._load_results),
+        ("single-flight", utils.get_results),
+    ):
+        load(SIMULATION_ID)
+        wall, cpu = min(_concurrently(load, threads) for _ in range(5))
+        print(
+            f"{threads} concurrent loads, {name}:"
+            f" {wall * 1000:.1f}ms wall, {cpu * 1000:.1f}ms CPU"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 32)
@@ -0,0 +1,53 @@
+"""
+Benchmark the size and load time of the sample documents as JSON and as snapshots.
+
+Run with: python benchmarks/bench_snapshot.py [repeats]
+"""
+
+import sys
+import timeit
+import zlib
+from collections.abc import Callable
+
+import pydantic
+
+from python_challenge.snapshot import dump_snapshot
+from python_challenge.snapshot import load_snapshot
+from python_challenge.types.home import Home
+from python_challenge.types.retrofit_planner import RetrofitPlannerResponsePublic
+from python_challenge.utils import PATH_DATA
+
+DOCUMENTS: list[tuple[str, type[pydantic.BaseModel]]] = [
+    ("906205784.json", Home),
+    ("1e0e7511-9e40-4b13-8c52-4f9c26c41c55.json", RetrofitPlannerResponsePublic),
+]
+
+
+def _best(load: Callable[[], object], repeats: int) -> float:
+    """Fastest mean time of a load, as the machine's other load only slows it."""
+    return min(timeit.repeat(load, number=repeats, repeat=7)) / repeats
+
+
+def main(repeats: int) -> None:
+    for name, model in DOCUMENTS:
+        text = (PATH_DATA / name).read_text()
+        document = model.model_validate_json(text)
+        snapshot = dump_snapshot(document)
+        assert load_snapshot(snapshot, model) == document
+
+        json_time = _best(lambda: model.model_validate_json(text), repeats)
+        snapshot_time = _best(lambda: load_snapshot(snapshot, model), repeats)
+        print(f"\n{model.__name__}")
+        print(
+            f"  size: JSON {len(text.encode()):,}B ({len(zlib.compress(text.encode())):,}B"
+            f" compressed), snapshot {len(snapshot):,}B"
+            f" ({len(zlib.compress(snapshot)):,}B compressed)"
+        )
+        print(
+            f"  load: JSON {json_time * 1e6:.0f}µs, snapshot {snapshot_time * 1e6:.0f}µs"
+            f" ({json_time / snapshot_time:.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
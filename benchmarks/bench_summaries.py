@@ -0,0 +1,58 @@
+"""
+Benchmark the memory used by the consumption summaries of EnergyProfiles, as pydantic
+models and as EnergySummaries.
+
+Run with: python benchmarks/bench_summaries.py [profiles]
+"""
+
+import sys
+import tracemalloc
+from collections.abc import Callable
+from typing import Any
+
+from python_challenge import utils
+from python_challenge.summaries import EnergySummaries
+from python_challenge.types.home import EnergyProfile
+from python_challenge.types.retrofit_planner import RetrofitPlannerResponsePublic
+
+PATH_RESULTS = utils.PATH_DATA / "1e0e7511-9e40-4b13-8c52-4f9c26c41c55.json"
+
+
+def measure(build: Callable[[], Any], profiles: int) -> float:
+    """Bytes allocated per profile for objects kept alive by ``build``."""
+    tracemalloc.start()
+    kept = [build() for _ in range(profiles)]
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return allocated / profiles
+
+
+def main(profiles: int) -> None:
+    results = RetrofitPlannerResponsePublic.model_validate_json(
+        PATH_RESULTS.read_text()
+    )
+    profile_json = results.baseline_energy_profile.model_dump_json()
+    summaries = EnergySummaries.from_profile(results.baseline_energy_profile)
+
+    def pydantic_models() -> dict[str, Any]:
+        # Only the consumption fields, which is what EnergySummaries holds.
+        return EnergySummaries.from_profile(
+            EnergyProfile.model_validate_json(profile_json)
+        ).to_fields()
+
+    def compact() -> EnergySummaries:
+        return EnergySummaries.from_profile(
+            EnergyProfile.model_validate_json(profile_json)
+        )
+
+    print(f"{len(summaries)} summaries per profile")
+    for name, build in (
+        ("pydantic models", pydantic_models),
+        ("EnergySummaries", compact),
+    ):
+        print(f"{name}: {measure(build, profiles):,.0f} bytes per profile")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 1000)
@@ -0,0 +1,48 @@
+"""
+Benchmark the first load of each stored document by a new worker, cold and after
+warm_documents loaded them.
+
+Run with: python benchmarks/bench_warm_documents.py [repeats]
+"""
+
+import os
+import sys
+import time
+
+import django
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "python_challenge.settings")
+django.setup()
+
+from python_challenge import utils  # noqa: E402
+from python_challenge.warmup import warm_documents  # noqa: E402
+
+
+def _first_loads() -> float:
+    start = time.perf_counter()
+    for uprn in utils.iter_uprns():
+        utils.get_home(uprn=uprn)
+    for uuid in utils.iter_simulation_ids():
+        utils.get_results(uuid=uuid)
+    return time.perf_counter() - start
+
+
+def main(repeats: int) -> None:
+    cold = warm = warming = 0.0
+    for _ in range(repeats):
+        utils.clear_caches()
+        cold += _first_loads()
+        utils.clear_caches()
+        start = time.perf_counter()
+        warm_documents()
+        warming += time.perf_counter() - start
+        warm += _first_loads()
+    documents, nbytes = utils.loaded_documents()
+    print(f"{documents} documents, {nbytes / 1024:.0f}KiB of JSON")
+    print(f"first loads, cold: {cold / repeats * 1000:.2f}ms")
+    print(f"first loads, warmed: {warm / repeats * 1000:.2f}ms")
+    print(f"warming, before serving: {warming / repeats * 1000:.2f}ms")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
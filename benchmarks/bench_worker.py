@@ -0,0 +1,129 @@
+"""
+Benchmark requests to the home endpoint served by one gunicorn worker: uvicorn_worker's
+stock UvicornWorker, ours (uvloop and httptools, with the tuned limits), and ours on
+asyncio's event loop and h11's parser, which uvicorn falls back to when uvloop and
+httptools aren't installed.
+
+The client keeps its connections alive, as a load balancer in front would.
+
+Run with: python benchmarks/bench_worker.py [requests]
+"""
+
+import asyncio
+import os
+import re
+import signal
+import socket
+import statistics
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).parent.parent
+PATH = "/api/home/906205784"
+CONNECTIONS = 8
+
+STARTED = re.compile(r"Started server process \[(\d+)\]")
+CONTENT_LENGTH = re.compile(rb"content-length: (\d+)", re.IGNORECASE)
+
+WORKERS = {
+    "stock": ("uvicorn_worker.UvicornWorker", {}),
+    "tuned": ("python_challenge.workers.UvicornWorker", {}),
+    "tuned, asyncio + h11": (
+        "python_challenge.workers.UvicornWorker",
+        {"UVICORN_LOOP": "asyncio", "UVICORN_HTTP": "h11"},
+    ),
+}
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _connection(port: int, requests: int, latencies: list[float]) -> None:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    request = f"GET {PATH} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode()
+    for _ in range(requests):
+        start = time.perf_counter()
+        writer.write(request)
+        headers = await reader.readuntil(b"\r\n\r\n")
+        assert headers.startswith(b"HTTP/1.1 200"), headers
+        match = CONTENT_LENGTH.search(headers)
+        assert match is not None
+        await reader.readexactly(int(match[1]))
+        latencies.append(time.perf_counter() - start)
+    writer.close()
+    await writer.wait_closed()
+
+
+async def _load(port: int, requests: int) -> tuple[float, list[float]]:
+    latencies: list[float] = []
+    start = time.perf_counter()
+    await asyncio.gather(
+        *(
+            _connection(port, requests // CONNECTIONS, latencies)
+            for _ in range(CONNECTIONS)
+        )
+    )
+    return time.perf_counter() - start, latencies
+
+
+def run(name: str, requests: int) -> None:
+    worker_class, worker_env = WORKERS[name]
+    port = _free_port()
+    env = dict(
+        os.environ,
+        GUNICORN_WORKERS="1",
+        PORT=str(port),
+        ALLOW_LOCALHOST="1",
+        **worker_env,
+    )
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "-c",
+            "gunicorn.conf.py",
+            "-k",
+            worker_class,
+            # Don't recycle the worker halfway.
+            "--max-requests",
+            "0",
+        ],
+        cwd=ROOT,
+        env=env,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    assert process.stderr is not None
+    for line in process.stderr:
+        if STARTED.search(line):
+            break
+    # Keep reading the log, so gunicorn never blocks on a full pipe.
+    threading.Thread(target=process.stderr.read, daemon=True).start()
+
+    asyncio.run(_load(port, CONNECTIONS * 10))
+    elapsed, latencies = asyncio.run(_load(port, requests))
+    process.send_signal(signal.SIGTERM)
+    process.wait()
+
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(
+        f"{name}: {len(latencies) / elapsed:.0f} requests/s,"
+        f" p50 {percentiles[49] * 1000:.2f}ms, p99 {percentiles[98] * 1000:.2f}ms"
+    )
+
+
+def main(requests: int) -> None:
+    for name in WORKERS:
+        run(name, requests)
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 4000)
@@ -1,8 +1,10 @@
 """gunicorn configuration."""
 
-import multiprocessing
+import gc
 import os
 
+from python_challenge import tuning
+
 try:  # pragma: no cover
     from rich import traceback
 
@@ -10,12 +12,78 @@ try:  # pragma: no cover
 except ImportError:  # pragma: no cover
     pass
 
+# Measure the I/O ratio and request time with `python manage.py tune_workers`.
+_tuning = tuning.tune(
+    tuning.measure_resources(),
+    io_ratio=float(os.environ.get("GUNICORN_IO_RATIO", tuning.DEFAULT_IO_RATIO)),
+    request_seconds=float(
+        os.environ.get("GUNICORN_REQUEST_SECONDS", tuning.DEFAULT_REQUEST_SECONDS)
+    ),
+    time_budget=float(
+        os.environ.get("REQUEST_TIME_BUDGET", tuning.DEFAULT_TIME_BUDGET)
+    ),
+    backlog_limit=tuning.max_backlog(),
+)
+
 accesslog = "-"
+backlog = int(os.environ.get("GUNICORN_BACKLOG", _tuning.backlog))
 bind = [f"0.0.0.0:{os.environ.get('PORT', 8000)}"]
+# Seconds to keep an idle connection open for its next request.
+keepalive = int(os.environ.get("GUNICORN_KEEPALIVE", 5))
 max_requests = 1000
 max_requests_jitter = 50
 reload = os.environ.get("GUNICORN_RELOAD") == "1"
-timeout = 0
-worker_class = "uvicorn_worker.UvicornWorker"
-workers = os.environ.get("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1)
+# Import and warm up the app once in the master, and fork the workers from it, so they
+# share its memory copy-on-write and are ready as soon as they are forked. Reloading
+# needs each worker to import the app itself.
+preload_app = os.environ.get("GUNICORN_PRELOAD", "1") == "1" and not reload
+# Restart a worker whose event loop hasn't run for this long. Requests themselves are
+# cancelled after REQUEST_TIME_BUDGET, by TimeBudgetMiddleware.
+timeout = int(os.environ.get("GUNICORN_TIMEOUT", 30))
+worker_class = "python_challenge.workers.UvicornWorker"
+# Used by the worker as its limit of concurrent connections and requests.
+worker_connections = int(
+    os.environ.get("GUNICORN_LIMIT_CONCURRENCY", _tuning.limit_concurrency)
+)
+workers = int(os.environ.get("GUNICORN_WORKERS", _tuning.workers))
 wsgi_app = "python_challenge.asgi"
+
+# Budget to load the most requested and most recently stored documents before serving.
+_warm_up_documents = int(os.environ.get("WARM_UP_DOCUMENTS", 100))
+_warm_up_seconds = float(os.environ.get("WARM_UP_SECONDS", 5.0))
+
+
+def when_ready(server):
+    # Runs in the master after it has preloaded the app, before it forks any worker.
+    if not server.cfg.preload_app:
+        return
+    from python_challenge.warmup import warm_up
+
+    report = warm_up(_warm_up_documents, _warm_up_seconds)
+    server.log.info(
+        "Warmed up in %.2fs: built %d models, indexed %d homes, loaded %d documents",
+        report.seconds,
+        report.models,
+        report.homes,
+        report.documents,
+    )
+    # Move everything allocated so far out of the garbage collector's generations, so
+    # the workers' collections don't write to (and so copy) the shared pages.
+    gc.freeze()
+
+
+def post_worker_init(worker):
+    # Runs in each worker before it serves. Preloaded workers inherit the master's.
+    if worker.cfg.preload_app:
+        return
+    from python_challenge.warmup import warm_documents
+
+    documents = warm_documents(_warm_up_documents, _warm_up_seconds)
+    worker.log.info("Loaded %d documents", documents)
+
+
+def worker_exit(server, worker):
+    # Runs in the worker as it exits, to keep the requests counted since its last flush.
+    from python_challenge.hotlist import access_counter
+
+    access_counter.flush()
@@ -4,3 +4,7 @@ from django.apps import AppConfig
 class ApiConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "python_challenge.api"
+
+    def ready(self):
+        # Connect the signal receivers which keep the spatial index up to date.
+        from .. import geo  # noqa: F401
@@ -0,0 +1,27 @@
+from argparse import ArgumentParser
+from typing import Any
+
+from django.core.management.base import BaseCommand
+
+from ....export import iter_ndjson
+from ....utils import DocumentKind
+
+
+class Command(BaseCommand):
+    help = "Export all the stored Homes or results as NDJSON, one document per line."
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument("kind", choices=["homes", "results"])
+        parser.add_argument(
+            "--output",
+            default="-",
+            help="File to write to, default '-' for stdout.",
+        )
+
+    def handle(self, *args: Any, kind: DocumentKind, output: str, **options: Any):
+        if output == "-":
+            for line in iter_ndjson(kind):
+                self.stdout.write(line.decode(), ending="")
+        else:
+            with open(output, "wb") as file:
+                file.writelines(iter_ndjson(kind))
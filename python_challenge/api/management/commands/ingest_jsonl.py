@@ -0,0 +1,61 @@
+import os
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from ....ingest import ingest_jsonl
+from ....utils import DocumentKind
+
+
+class Command(BaseCommand):
+    help = """
+    Validate and store the Homes or results in a JSONL file (one JSON document per
+    line). Invalid lines are reported, with their line numbers, and skipped.
+    """
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument("kind", choices=["homes", "results"])
+        parser.add_argument("path", help="JSONL file to ingest.")
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=os.cpu_count() or 1,
+            help="Number of validation processes, default: the number of CPUs.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=100,
+            help="Number of lines validated, and stored, together.",
+        )
+
+    def handle(
+        self,
+        *args: Any,
+        kind: DocumentKind,
+        path: str,
+        workers: int,
+        chunk_size: int,
+        **options: Any,
+    ) -> None:
+        if workers < 1 or chunk_size < 1:
+            raise CommandError("--workers and --chunk-size must be at least 1")
+        with (
+            open(path) as file,
+            ProcessPoolExecutor(max_workers=workers) as executor,
+        ):
+            report = ingest_jsonl(
+                file,
+                kind,
+                executor,
+                chunk_size=chunk_size,
+                max_pending=workers * 2,
+            )
+        for rejected in report.rejected:
+            self.stderr.write(f"Line {rejected.line_number}: {rejected.error}")
+        self.stdout.write(
+            f"Stored {report.stored} {kind}, rejected {len(report.rejected)} lines."
+        )
@@ -0,0 +1,63 @@
+from argparse import ArgumentParser
+from typing import Any
+from typing import Literal
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from ....importtime import by_package
+from ....importtime import profile_imports
+
+
+class Command(BaseCommand):
+    help = """
+    Profile the imports of a worker's startup in a new interpreter, and print the
+    slowest as tab-separated module, self time and cumulative time in milliseconds.
+    """
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--sort",
+            choices=["self", "cumulative"],
+            default="self",
+            help="Sort by the time of the module alone, or including its imports.",
+        )
+        parser.add_argument(
+            "--by-package",
+            action="store_true",
+            dest="packages",
+            help="Print the total self time of each top-level package instead.",
+        )
+        parser.add_argument(
+            "--top", type=int, default=30, help="Number of modules to print."
+        )
+
+    def handle(
+        self,
+        *args: Any,
+        sort: Literal["self", "cumulative"],
+        packages: bool,
+        top: int,
+        **options: Any,
+    ) -> None:
+        if top < 1:
+            raise CommandError("--top must be at least 1")
+        profile = profile_imports()
+        if packages:
+            for package, self_us in by_package(profile.imports)[:top]:
+                self.stdout.write(f"{package}\t{self_us / 1000:.1f}")
+        else:
+            imports = sorted(
+                profile.imports,
+                key=lambda item: item.self_us if sort == "self" else item.cumulative_us,
+                reverse=True,
+            )
+            for item in imports[:top]:
+                self.stdout.write(
+                    f"{item.module}\t{item.self_us / 1000:.1f}"
+                    f"\t{item.cumulative_us / 1000:.1f}"
+                )
+        self.stderr.write(
+            f"{len(profile.imports)} modules imported, startup took "
+            f"{profile.elapsed * 1000:.0f}ms"
+        )
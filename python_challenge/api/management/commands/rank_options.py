@@ -0,0 +1,62 @@
+from argparse import ArgumentParser
+from collections.abc import Iterator
+from typing import Any
+from typing import get_args
+
+import pydantic
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from ....ranking import CostBound
+from ....ranking import Metric
+from ....ranking import OptionTable
+from ....types.retrofit_planner import RetrofitPlannerResponsePublic
+from ....utils import get_results
+from ....utils import iter_simulation_ids
+
+
+class Command(BaseCommand):
+    help = """
+    Rank the improvement options of all the stored results by cost-effectiveness, and
+    print the best as tab-separated simulation UUID, option index and metric value.
+    """
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--metric", choices=get_args(Metric), default="cost_per_kwh"
+        )
+        parser.add_argument(
+            "--bound",
+            choices=get_args(CostBound),
+            default="low",
+            help="Which end of the capital cost range to use.",
+        )
+        parser.add_argument(
+            "--top", type=int, default=100, help="Number of options to print."
+        )
+
+    def handle(
+        self,
+        *args: Any,
+        metric: Metric,
+        bound: CostBound,
+        top: int,
+        **options: Any,
+    ) -> None:
+        if top < 1:
+            raise CommandError("--top must be at least 1")
+        table = OptionTable.from_results(self._iter_results())
+        values = table.metric(metric, bound)
+        for row in table.rank(metric, bound, limit=top):
+            simulation_id = table.simulation_ids[table.simulation_index[row]]
+            self.stdout.write(
+                f"{simulation_id}\t{table.option_index[row]}\t{values[row]:.2f}"
+            )
+
+    def _iter_results(self) -> Iterator[RetrofitPlannerResponsePublic]:
+        """The stored results, skipping (with a warning) those which can't be loaded."""
+        for uuid in iter_simulation_ids():
+            try:
+                yield get_results(uuid=uuid)
+            except (FileNotFoundError, pydantic.ValidationError) as error:
+                self.stderr.write(f"Skipped {uuid}: {error}")
@@ -0,0 +1,75 @@
+import time
+from argparse import ArgumentParser
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+from django.test import Client
+
+from .... import tuning
+from ....utils import list_simulation_ids
+from ....utils import list_uprns
+
+
+def _default_paths() -> list[str]:
+    paths = ["/api/homes", "/api/results"]
+    paths += [f"/api/home/{uprn}" for uprn in list_uprns(limit=1)]
+    paths += [f"/api/results/{uuid}" for uuid in list_simulation_ids(limit=1)]
+    return paths
+
+
+class Command(BaseCommand):
+    help = """
+    Measure how long requests take, and how much of it is spent waiting on I/O rather
+    than on the CPU, and print the gunicorn settings tuned from it for this machine as
+    environment variables.
+    """
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "paths",
+            nargs="*",
+            help="Paths to request, by default a few of the API's.",
+        )
+        parser.add_argument(
+            "--repeats", type=int, default=20, help="Number of requests of each path."
+        )
+
+    def handle(
+        self, *args: Any, paths: list[str], repeats: int, **options: Any
+    ) -> None:
+        if repeats < 1:
+            raise CommandError("--repeats must be at least 1")
+        paths = paths or _default_paths()
+        client = Client(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+        total_wall = total_cpu = 0.0
+        for path in paths:
+            # Warm up the caches, and check the path first.
+            if (status := client.get(path).status_code) != 200:
+                raise CommandError(f"{path} responded {status}")
+            wall = cpu = 0.0
+            for _ in range(repeats):
+                start_wall, start_cpu = time.perf_counter(), time.thread_time()
+                client.get(path)
+                wall += time.perf_counter() - start_wall
+                cpu += time.thread_time() - start_cpu
+            self.stderr.write(
+                f"{path}\t{wall / repeats * 1000:.1f}ms\t{max(0.0, 1 - cpu / wall):.0%} I/O"
+            )
+            total_wall += wall
+            total_cpu += cpu
+        io_ratio = round(max(0.0, 1 - total_cpu / total_wall), 2)
+        request_seconds = round(total_wall / (repeats * len(paths)), 4)
+        tuned = tuning.tune(
+            tuning.measure_resources(),
+            io_ratio=io_ratio,
+            request_seconds=request_seconds,
+            time_budget=settings.REQUEST_TIME_BUDGET or tuning.DEFAULT_TIME_BUDGET,
+            backlog_limit=tuning.max_backlog(),
+        )
+        self.stdout.write(f"GUNICORN_IO_RATIO={io_ratio}")
+        self.stdout.write(f"GUNICORN_REQUEST_SECONDS={request_seconds}")
+        self.stdout.write(f"GUNICORN_WORKERS={tuned.workers}")
+        self.stdout.write(f"GUNICORN_LIMIT_CONCURRENCY={tuned.limit_concurrency}")
+        self.stdout.write(f"GUNICORN_BACKLOG={tuned.backlog}")
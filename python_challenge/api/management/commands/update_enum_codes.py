@@ -0,0 +1,37 @@
+from argparse import ArgumentParser
+from typing import Any
+
+from django.core.management.base import BaseCommand
+from django.core.management.base import CommandError
+
+from ....enum_codes import assign_codes
+from ....enum_codes import read_table
+from ....enum_codes import str_enums
+from ....enum_codes import write_table
+
+
+class Command(BaseCommand):
+    help = """
+    Give codes to the members of the StrEnums of the types not in the table of enum
+    codes yet, keeping the codes of the others.
+    """
+
+    def add_arguments(self, parser: ArgumentParser) -> None:
+        parser.add_argument(
+            "--check",
+            action="store_true",
+            help="Fail if any member has no code, rather than updating the table.",
+        )
+
+    def handle(self, *args: Any, check: bool, **options: Any) -> None:
+        table = read_table()
+        updated = assign_codes(table, str_enums())
+        added = sum(len(codes) for codes in updated.values()) - sum(
+            len(codes) for codes in table.values()
+        )
+        if check:
+            if added:
+                raise CommandError(f"{added} members have no code")
+            return
+        write_table(updated)
+        self.stderr.write(f"{added} members added")
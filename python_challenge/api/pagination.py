@@ -0,0 +1,102 @@
+import base64
+import binascii
+from collections.abc import Callable
+
+from drf_spectacular.utils import OpenApiParameter
+from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.request import Request
+from rest_framework.utils.urls import replace_query_param
+
+INVALID_CURSOR = "Invalid cursor"
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination over ordered keys, such as UPRNs or simulation UUIDs.
+
+    The cursor is the last key of the previous page, so each page is a seek to that key
+    rather than skipping over every earlier item: deep pages cost the same as the
+    first, and items inserted while paging can not shift items between pages.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    page_size = 1000
+    max_page_size = 10_000
+
+    def __init__(self) -> None:
+        self.next_link: str | None = None
+
+    def paginate_keys(
+        self, fetch: Callable[[str | None, int], list[str]], request: Request
+    ) -> list[str]:
+        """
+        Keys for the requested page.
+
+        ``fetch(after, limit)`` must return up to ``limit`` keys in order, following
+        the ``after`` key (or from the start if None).
+        """
+        page_size = self.get_page_size(request)
+        # Fetch one extra to find out whether there is a next page.
+        keys = fetch(self.decode_cursor(request), page_size + 1)
+        if len(keys) > page_size:
+            keys = keys[:page_size]
+            self.next_link = replace_query_param(
+                request.build_absolute_uri(),
+                self.cursor_query_param,
+                self.encode_cursor(keys[-1]),
+            )
+        else:
+            self.next_link = None
+        return keys
+
+    def get_page_size(self, request: Request) -> int:
+        value = request.query_params.get(self.page_size_query_param)
+        if value is None:
+            return self.page_size
+        try:
+            page_size = int(value)
+        except ValueError:
+            page_size = 0
+        if not 0 < page_size <= self.max_page_size:
+            raise ValidationError(
+                detail=f"{self.page_size_query_param} must be between 1 and {self.max_page_size}"
+            )
+        return page_size
+
+    def decode_cursor(self, request: Request) -> str | None:
+        cursor = request.query_params.get(self.cursor_query_param)
+        if cursor is None:
+            return None
+        try:
+            key = base64.b64decode(
+                cursor.encode("ascii"), altchars=b"-_", validate=True
+            )
+            return key.decode("utf-8")
+        except (binascii.Error, UnicodeError):
+            raise NotFound(detail=INVALID_CURSOR)
+
+    def encode_cursor(self, key: str) -> str:
+        return base64.urlsafe_b64encode(key.encode("utf-8")).decode("ascii")
+
+    def get_schema_parameters(self) -> list[OpenApiParameter]:
+        return [
+            OpenApiParameter(
+                self.cursor_query_param,
+                str,
+                description="The pagination cursor, from the previous page's 'next' link.",
+            ),
+            OpenApiParameter(
+                self.page_size_query_param,
+                int,
+                description=f"Number of results per page, default {self.page_size}, maximum {self.max_page_size}.",
+            ),
+        ]
+
+
+class ResultsPagination(KeysetPagination):
+    # Retrofit plans are much larger documents than Homes.
+    page_size = 100
+    max_page_size = 1000
@@ -0,0 +1,216 @@
+from io import StringIO
+from pathlib import Path
+
+import pytest
+from django.core.management import CommandError
+from django.core.management import call_command
+
+from python_challenge import enum_codes
+from python_challenge import utils
+from python_challenge.enum_codes import enum_name
+from python_challenge.enum_codes import read_table
+from python_challenge.enum_codes import write_table
+from python_challenge.types.enums import DomesticEnergyEndUse
+from python_challenge.types.home import Home
+from python_challenge.types.retrofit_planner import RetrofitPlannerResponsePublic
+
+
+class TestExportNDJSON:
+
+    def test_stdout(self, path_data: Path, home: Home):
+        utils.save_home(home)
+        stdout = StringIO()
+
+        call_command("export_ndjson", "homes", stdout=stdout)
+
+        assert stdout.getvalue().count("\n") == 1
+        assert Home.model_validate_json(stdout.getvalue()) == home
+
+    def test_output_file(self, path_data: Path, tmp_path: Path, home: Home):
+        utils.save_home(home)
+        output = tmp_path / "export" / "homes.ndjson"
+        output.parent.mkdir()
+
+        call_command("export_ndjson", "homes", output=str(output))
+
+        assert output.read_text().count("\n") == 1
+        assert Home.model_validate_json(output.read_text()) == home
+
+
+class TestIngestJSONL:
+
+    def test_ingest(self, path_data: Path, tmp_path: Path, home: Home):
+        path = tmp_path / "upload" / "homes.jsonl"
+        path.parent.mkdir()
+        path.write_text(f"{home.model_dump_json()}\n{{}}\n")
+        stdout = StringIO()
+        stderr = StringIO()
+
+        call_command(
+            "ingest_jsonl",
+            "homes",
+            str(path),
+            workers=2,
+            chunk_size=1,
+            stdout=stdout,
+            stderr=stderr,
+        )
+
+        assert stdout.getvalue() == "Stored 1 homes, rejected 1 lines.\n"
+        assert stderr.getvalue().startswith("Line 2: location: Field required")
+        assert utils.get_home(uprn="906205784") == home
+
+    def test_invalid_workers(self, tmp_path: Path):
+        with pytest.raises(CommandError):
+            call_command("ingest_jsonl", "homes", str(tmp_path), workers=0)
+
+
+class TestRankOptions:
+
+    def test_rank(
+        self, path_data: Path, results: RetrofitPlannerResponsePublic, run_id: str
+    ):
+        stage = results.improvement_plan[0]
+        expensive = stage.model_copy(
+            update={
+                "improvements": [
+                    stage.improvements[0].model_copy(
+                        update={"capital_cost": (30000, 40000)}
+                    )
+                ]
+            }
+        )
+        cheap = stage.model_copy(
+            update={
+                "improvements": [
+                    stage.improvements[0].model_copy(update={"capital_cost": (1, 2)})
+                ]
+            }
+        )
+        results.improvement_option_evaluation = [expensive, cheap]
+        utils.save_results(results)
+        stdout = StringIO()
+
+        call_command("rank_options", "--top", "1", stdout=stdout)
+
+        assert stdout.getvalue() == f"{run_id}\t1\t0.00\n"
+
+    def test_skips_invalid(
+        self, path_data: Path, results: RetrofitPlannerResponsePublic, run_id: str
+    ):
+        stage = results.improvement_plan[0]
+        results.improvement_option_evaluation = [
+            stage.model_copy(
+                update={
+                    "improvements": [
+                        stage.improvements[0].model_copy(
+                            update={"capital_cost": (1, 2)}
+                        )
+                    ]
+                }
+            )
+        ]
+        utils.save_results(results)
+        invalid = "2e0e7511-9e40-4b13-8c52-4f9c26c41c55"
+        (path_data / f"{invalid}.json").write_text("{}")
+        stdout, stderr = StringIO(), StringIO()
+
+        call_command("rank_options", stdout=stdout, stderr=stderr)
+
+        assert stderr.getvalue().startswith(f"Skipped {invalid}: ")
+        assert stdout.getvalue() == f"{run_id}\t0\t0.00\n"
+
+    def test_invalid_top(self, path_data: Path):
+        with pytest.raises(CommandError):
+            call_command("rank_options", "--top", "0")
+
+
+class TestProfileImports:
+    def test_modules(self):
+        stdout = StringIO()
+        call_command(
+            "profile_imports",
+            "--sort",
+            "cumulative",
+            "--top",
+            "5",
+            stdout=stdout,
+            stderr=StringIO(),
+        )
+        rows = [line.split("\t") for line in stdout.getvalue().splitlines()]
+        assert len(rows) == 5
+        cumulative = [float(row[2]) for row in rows]
+        assert cumulative == sorted(cumulative, reverse=True)
+
+    def test_by_package(self):
+        stdout = StringIO()
+        call_command(
+            "profile_imports", "--by-package", stdout=stdout, stderr=StringIO()
+        )
+        packages = [line.split("\t")[0] for line in stdout.getvalue().splitlines()]
+        assert "django" in packages
+        assert "python_challenge" in packages
+
+    def test_invalid_top(self):
+        with pytest.raises(CommandError):
+            call_command("profile_imports", "--top", "0")
+
+
+class TestTuneWorkers:
+    def test_default_paths(
+        self,
+        path_data: Path,
+        uprn: str,
+        home: Home,
+        run_id: str,
+        results: RetrofitPlannerResponsePublic,
+    ):
+        utils.save_home(home)
+        utils.save_results(results)
+        stdout = StringIO()
+        stderr = StringIO()
+
+        call_command("tune_workers", "--repeats", "2", stdout=stdout, stderr=stderr)
+
+        measured = [line.split("\t")[0] for line in stderr.getvalue().splitlines()]
+        assert measured == [
+            "/api/homes",
+            "/api/results",
+            f"/api/home/{uprn}",
+            f"/api/results/{run_id}",
+        ]
+        tuned = dict(line.split("=") for line in stdout.getvalue().splitlines())
+        assert 0 <= float(tuned["GUNICORN_IO_RATIO"]) < 1
+        assert float(tuned["GUNICORN_REQUEST_SECONDS"]) > 0
+        assert int(tuned["GUNICORN_WORKERS"]) >= 1
+        assert int(tuned["GUNICORN_LIMIT_CONCURRENCY"]) >= 1
+        assert int(tuned["GUNICORN_BACKLOG"]) >= 1
+
+    def test_not_found(self, path_data: Path):
+        with pytest.raises(CommandError, match="/api/home/missing responded 404"):
+            call_command("tune_workers", "/api/home/missing", stderr=StringIO())
+
+    def test_invalid_repeats(self):
+        with pytest.raises(CommandError):
+            call_command("tune_workers", "--repeats", "0")
+
+
+class TestUpdateEnumCodes:
+    def test_update(self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+        table = read_table()
+        name = enum_name(DomesticEnergyEndUse)
+        del table[name]["LIGHTING"]
+        monkeypatch.setattr(enum_codes, "TABLE_PATH", tmp_path / "enum_codes.json")
+        write_table(table)
+        with pytest.raises(CommandError, match="1 members have no code"):
+            call_command("update_enum_codes", "--check")
+        stderr = StringIO()
+
+        call_command("update_enum_codes", stderr=stderr)
+
+        assert stderr.getvalue().strip() == "1 members added"
+        assert (
+            read_table()[name]["LIGHTING"]
+            == max(code for codes in table.values() for code in codes.values()) + 1
+        )
+        call_command("update_enum_codes", "--check")
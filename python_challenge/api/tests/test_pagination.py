@@ -0,0 +1,61 @@
+import pytest
+from rest_framework.exceptions import NotFound
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from python_challenge.api.pagination import KeysetPagination
+
+KEYS = [f"{i:03}" for i in range(25)]
+
+
+def _fetch(after: str | None, limit: int) -> list[str]:
+    keys = [key for key in KEYS if after is None or key > after]
+    return keys[:limit]
+
+
+def _request(**params: str) -> Request:
+    return Request(APIRequestFactory().get("/api/things", params))
+
+
+class TestKeysetPagination:
+
+    def test_pages(self):
+        paginator = KeysetPagination()
+        paginator.page_size = 10
+
+        pages = []
+        request = _request()
+        while True:
+            pages.append(paginator.paginate_keys(_fetch, request))
+            if paginator.next_link is None:
+                break
+            cursor = paginator.next_link.split("cursor=")[1]
+            request = _request(cursor=cursor)
+
+        assert [len(page) for page in pages] == [10, 10, 5]
+        assert sum(pages, []) == KEYS
+
+    def test_page_size_param(self):
+        paginator = KeysetPagination()
+
+        keys = paginator.paginate_keys(_fetch, _request(page_size="25"))
+
+        assert keys == KEYS
+        assert paginator.next_link is None
+
+    @pytest.mark.parametrize("page_size", ["0", "10001", "ten"])
+    def test_invalid_page_size(self, page_size: str):
+        with pytest.raises(ValidationError):
+            KeysetPagination().paginate_keys(_fetch, _request(page_size=page_size))
+
+    @pytest.mark.parametrize("cursor", ["!", "é", "_w=="])
+    def test_invalid_cursor(self, cursor: str):
+        with pytest.raises(NotFound):
+            KeysetPagination().paginate_keys(_fetch, _request(cursor=cursor))
+
+    def test_cursor_round_trip(self):
+        paginator = KeysetPagination()
+        cursor = paginator.encode_cursor("906205784")
+
+        assert paginator.decode_cursor(_request(cursor=cursor)) == "906205784"
@@ -1,19 +1,41 @@
 import http
+from collections.abc import AsyncIterator
 
 import pydantic_core
+import pytest
+from django.http import StreamingHttpResponse
+from django.test.client import AsyncClient
 from django.urls import reverse
 from pydantic import ValidationError
 from pytest_mock import MockerFixture
 from rest_framework.test import APIClient
 
+from python_challenge.api.types import BreakdownResponse
+from python_challenge.api.types import CompactResultsDetailsResponse
 from python_challenge.api.types import HomeDetailsResponse
+from python_challenge.api.types import HomeListResponse
+from python_challenge.api.types import HomeLocationsResponse
+from python_challenge.api.types import ResultsDetailsResponse
+from python_challenge.api.types import ResultsListResponse
+from python_challenge.api.types import StageChangesResponse
+from python_challenge.breakdown import EnergyColumns
+from python_challenge.diff import FieldChange
+from python_challenge.geo import GridIndex
+from python_challenge.hotlist import AccessCounter
+from python_challenge.savings import PlanPrefixSums
 from python_challenge.types.home import Home
+from python_challenge.types.retrofit_planner import RetrofitPlannerResponsePublic
 
 
 class TestHomeDetailsResponse:
 
     def test_get_uprn(
-        self, home: Home, uprn: str, mocker: MockerFixture, api_client: APIClient
+        self,
+        home: Home,
+        uprn: str,
+        mocker: MockerFixture,
+        api_client: APIClient,
+        access_counter: AccessCounter,
     ):
         mock_get_home = mocker.patch(
             "python_challenge.api.views.get_home", return_value=home
@@ -26,6 +48,7 @@ class TestHomeDetailsResponse:
         actual_response = HomeDetailsResponse.model_validate_json(response.content)
         assert actual_response.home == home
         mock_get_home.assert_called_once_with(uprn=uprn)
+        assert access_counter._counts == {("homes", uprn): 1}
 
     def test_get_unknown_uprn(
         self, uprn: str, mocker: MockerFixture, api_client: APIClient
@@ -57,3 +80,486 @@ class TestHomeDetailsResponse:
         )
         assert response.status_code == http.HTTPStatus.BAD_REQUEST
         mock_get_home.assert_called_once_with(uprn=uprn)
+
+
+class TestResultsDetails:
+
+    def test_get(
+        self,
+        results: RetrofitPlannerResponsePublic,
+        run_id: str,
+        mocker: MockerFixture,
+        api_client: APIClient,
+        access_counter: AccessCounter,
+    ):
+        mock_get_results = mocker.patch(
+            "python_challenge.api.views.get_results", return_value=results
+        )
+        mock_get_cumulative_energy_change = mocker.patch(
+            "python_challenge.api.views.get_cumulative_energy_change",
+            return_value=PlanPrefixSums.from_plan(results).cumulative(),
+        )
+
+        response = api_client.get(reverse("get-results", kwargs={"uuid": run_id}))
+
+        assert response.status_code == http.HTTPStatus.OK
+        actual_response = ResultsDetailsResponse.model_validate_json(response.content)
+        assert actual_response.results == results
+        [cumulative] = actual_response.cumulative_energy_change
+        assert cumulative.annual_energy_total.energy == pytest.approx(
+            results.improvement_plan[
+                0
+            ].relative_energy_change.annual_energy_total.energy
+        )
+        mock_get_results.assert_called_once_with(uuid=run_id)
+        mock_get_cumulative_energy_change.assert_called_once_with(uuid=run_id)
+        assert access_counter._counts == {("results", run_id): 1}
+
+    def test_get_compact(
+        self,
+        results: RetrofitPlannerResponsePublic,
+        run_id: str,
+        mocker: MockerFixture,
+        api_client: APIClient,
+    ):
+        mocker.patch("python_challenge.api.views.get_results", return_value=results)
+        mocker.patch(
+            "python_challenge.api.views.get_cumulative_energy_change",
+            return_value=PlanPrefixSums.from_plan(results).cumulative(),
+        )
+
+        response = api_client.get(
+            reverse("get-results", kwargs={"uuid": run_id}), {"compact": "true"}
+        )
+
+        assert response.status_code == http.HTTPStatus.OK
+        actual_response = CompactResultsDetailsResponse.model_validate_json(
+            response.content
+        )
+        assert actual_response.results.to_results() == results
+
+    def test_get_invalid_compact(self, run_id: str, api_client: APIClient):
+        response = api_client.get(
+            reverse("get-results", kwargs={"uuid": run_id}), {"compact": "maybe"}
+        )
+        assert response.status_code == http.HTTPStatus.BAD_REQUEST
+
+    def test_get_unknown_uuid(
+        self, run_id: str, mocker: MockerFixture, api_client: APIClient
+    ):
+        mocker.patch(
+            "python_challenge.api.views.get_results",
+            side_effect=FileNotFoundError("Couldn't find the file"),
+        )
+
+        response = api_client.get(reverse("get-results", kwargs={"uuid": run_id}))
+        assert response.status_code == http.HTTPStatus.NOT_FOUND
+
+    def test_get_invalid_data(
+        self, run_id: str, mocker: MockerFixture, api_client: APIClient
+    ):
+        mocker.patch(
+            "python_challenge.api.views.get_results",
+            side_effect=ValidationError.from_exception_data(
+                "some value is missing",
+                [pydantic_core.InitErrorDetails(type="missing", input="input data")],
+            ),
+        )
+
+        response = api_client.get(reverse("get-results", kwargs={"uuid": run_id}))
+        assert response.status_code == http.HTTPStatus.BAD_REQUEST
+
+
+class TestResultsStageChanges:
+
+    def test_get(
+        self,
+        run_id: str,
+        mocker: MockerFixture,
+        api_client: APIClient,
+        access_counter: AccessCounter,
+    ):
+        mock_get_plan_changes = mocker.patch(
+            "python_challenge.api.views.get_plan_changes",
+            return_value=[[FieldChange("wall.has_insulation", False, True)]],
+        )
+
+        response = api_client.get(
+            reverse("get-stage-changes", kwargs={"uuid": run_id, "stage": 0})
+        )
+
+        assert response.status_code == http.HTTPStatus.OK
+        actual_response = StageChangesResponse.model_validate_json(response.content)
+        assert actual_response.stage == 0
+        assert [change.model_dump() for change in actual_response.changes] == [
+            {"path": "wall.has_insulation", "old": False, "new": True}
+        ]
+        mock_get_plan_changes.assert_called_once_with(uuid=run_id)
+        assert access_counter._counts == {("results", run_id): 1}
+
+    def test_get_unknown_stage(
+        self, run_id: str, mocker: MockerFixture, api_client: APIClient
+    ):
+        mocker.patch("python_challenge.api.views.get_plan_changes", return_value=[[]])
+
+        response = api_client.get(
+            reverse("get-stage-changes", kwargs={"uuid": run_id, "stage": 1})
+        )
+        assert response.status_code == http.HTTPStatus.NOT_FOUND
+
+    def test_get_unknown_uuid(
+        self, run_id: str, mocker: MockerFixture, api_client: APIClient
+    ):
+        mocker.patch(
+            "python_challenge.api.views.get_plan_changes",
+            side_effect=FileNotFoundError("Couldn't find the file"),
+        )
+
+        response = api_client.get(
+            reverse("get-stage-changes", kwargs={"uuid": run_id, "stage": 0})
+        )
+        assert response.status_code == http.HTTPStatus.NOT_FOUND
+
+    def test_get_invalid_data(
+        self, run_id: str, mocker: MockerFixture, api_client: APIClient
+    ):
+        mocker.patch(
+            "python_challenge.api.views.get_plan_changes",
+            side_effect=ValidationError.from_exception_data(
+                "some value is missing",
+                [pydantic_core.InitErrorDetails(type="missing", input="input data")],
+            ),
+        )
+
+        response = api_client.get(
+            reverse("get-stage-changes", kwargs={"uuid": run_id, "stage": 0})
+        )
+        assert response.status_code == http.HTTPStatus.BAD_REQUEST
+
+
+class TestResultsBreakdown:
+
+    def test_get(
+        self,
+        run_id: str,
+        results: RetrofitPlannerResponsePublic,
+        mocker: MockerFixture,
+        api_client: APIClient,
+        access_counter: AccessCounter,
+    ):
+        mock_get_energy_columns = mocker.patch(
+            "python_challenge.api.views.get_energy_columns",
+            return_value=EnergyColumns.from_results(results),
+        )
+
+        response = api_client.get(
+            reverse("get-results-breakdown", kwargs={"uuid": run_id}),
+            {
+                "group_by": "stage,fuel_class",
+                "metric": "operating_cost",
+                "stages": "baseline,0",
+            },
+        )
+
+        assert response.status_code == http.HTTPStatus.OK
+        assert set(response.json()["cells"][0]) == {"stage", "fuel_class", "value"}
+        actual_response = BreakdownResponse.model_validate_json(response.content)
+        assert actual_response.group_by == ["stage", "fuel_class"]
+        baseline = [cell for cell in actual_response.cells if cell.stage == "baseline"]
+        assert sum(cell.value for cell in baseline) == pytest.approx(
+            results.baseline_energy_profile.annual_energy_total.operating_cost
+        )
+        assert {cell.stage for cell in actual_response.cells} == {"baseline", 0}
+        mock_get_energy_columns.assert_called_once_with(uuid=run_id)
+        assert access_counter._counts == {("results", run_id): 1}
+
+    @pytest.mark.parametrize(
+        "query",
+        [
+            {"group_by": "month,colour"},
+            {"metric": "price"},
+            {"group_by": "source,end_use"},
+            {"stages": "baseline,0"},
+            {"group_by": "stage", "stages": "-1"},
+        ],
+        ids=[
+            "dimension",
+            "metric",
+            "source by end use",
+            "stages not grouped",
+            "negative stage",
+        ],
+    )
+    def test_get_invalid_query(
+        self,
+        run_id: str,
+        results: RetrofitPlannerResponsePublic,
+        query: dict[str, str],
+        mocker: MockerFixture,
+        api_client: APIClient,
+    ):
+        mocker.patch(
+            "python_challenge.api.views.get_energy_columns",
+            return_value=EnergyColumns.from_results(results),
+        )
+
+        response = api_client.get(
+            reverse("get-results-breakdown", kwargs={"uuid": run_id}), query
+        )
+        assert response.status_code == http.HTTPStatus.BAD_REQUEST
+
+    def test_get_unknown_stage(
+        self,
+        run_id: str,
+        results: RetrofitPlannerResponsePublic,
+        mocker: MockerFixture,
+        api_client: APIClient,
+    ):
+        mocker.patch(
+            "python_challenge.api.views.get_energy_columns",
+            return_value=EnergyColumns.from_results(results),
+        )
+
+        response = api_client.get(
+            reverse("get-results-breakdown", kwargs={"uuid": run_id}),
+            {"group_by": "stage", "stages": "5"},
+        )
+        assert response.status_code == http.HTTPStatus.NOT_FOUND
+
+    def test_get_unknown_uuid(
+        self, run_id: str, mocker: MockerFixture, api_client: APIClient
+    ):
+        mocker.patch(
+            "python_challenge.api.views.get_energy_columns",
+            side_effect=FileNotFoundError("Couldn't find the file"),
+        )
+
+        response = api_client.get(
+            reverse("get-results-breakdown", kwargs={"uuid": run_id})
+        )
+        assert response.status_code == http.HTTPStatus.NOT_FOUND
+
+    def test_get_invalid_data(
+        self, run_id: str, mocker: MockerFixture, api_client: APIClient
+    ):
+        mocker.patch(
+            "python_challenge.api.views.get_energy_columns",
+            side_effect=ValidationError.from_exception_data(
+                "some value is missing",
+                [pydantic_core.InitErrorDetails(type="missing", input="input data")],
+            ),
+        )
+
+        response = api_client.get(
+            reverse("get-results-breakdown", kwargs={"uuid": run_id})
+        )
+        assert response.status_code == http.HTTPStatus.BAD_REQUEST
+
+
+class TestHomesNearby:
+
+    def test_get(self, mocker: MockerFixture, api_client: APIClient):
+        index = GridIndex()
+        index.insert("906205784", -3.2119865, 55.9593075)
+        index.insert("1", -3.2119865, 55.9620000)
+        index.insert("2", -3.2119865, 55.9700000)
+        mocker.patch("python_challenge.api.views.get_home_index", return_value=index)
+
+        response = api_client.get(
+            reverse("homes-nearby"),
+            {"longitude": -3.2119865, "latitude": 55.9593075, "radius": 400},
+        )
+
+        assert response.status_code == http.HTTPStatus.OK
+        actual_response = HomeLocationsResponse.model_validate_json(response.content)
+        assert [home.uprn for home in actual_response.homes] == ["906205784", "1"]
+        assert actual_response.homes[0].distance == 0
+
+    def test_get_invalid(self, api_client: APIClient):
+        response = api_client.get(
+            reverse("homes-nearby"), {"longitude": -3.2, "latitude": 95}
+        )
+        assert response.status_code == http.HTTPStatus.BAD_REQUEST
+
+
+class TestHomesInBoundingBox:
+
+    def test_get(self, mocker: MockerFixture, api_client: APIClient):
+        index = GridIndex()
+        index.insert("906205784", -3.2119865, 55.9593075)
+        index.insert("1", -3.1, 55.9)
+        mocker.patch("python_challenge.api.views.get_home_index", return_value=index)
+
+        response = api_client.get(
+            reverse("homes-bbox"),
+            {
+                "min_longitude": -3.3,
+                "min_latitude": 55.9,
+                "max_longitude": -3.2,
+                "max_latitude": 56,
+            },
+        )
+
+        assert response.status_code == http.HTTPStatus.OK
+        actual_response = HomeLocationsResponse.model_validate_json(response.content)
+        assert [home.uprn for home in actual_response.homes] == ["906205784"]
+        assert actual_response.homes[0].distance is None
+
+    def test_get_invalid_longitudes(self, api_client: APIClient):
+        response = api_client.get(
+            reverse("homes-bbox"),
+            {
+                "min_longitude": -3.1,
+                "min_latitude": 55.9,
+                "max_longitude": -3.2,
+                "max_latitude": 56,
+            },
+        )
+        assert response.status_code == http.HTTPStatus.BAD_REQUEST
+
+    def test_get_invalid_latitudes(self, api_client: APIClient):
+        response = api_client.get(
+            reverse("homes-bbox"),
+            {
+                "min_longitude": -3.3,
+                "min_latitude": 56.1,
+                "max_longitude": -3.2,
+                "max_latitude": 56,
+            },
+        )
+        assert response.status_code == http.HTTPStatus.BAD_REQUEST
+
+
+class TestHomeList:
+
+    def test_get(self, home: Home, mocker: MockerFixture, api_client: APIClient):
+        mock_list_uprns = mocker.patch(
+            "python_challenge.api.views.list_uprns", return_value=["1", "2", "3"]
+        )
+        mocker.patch("python_challenge.api.views.get_home", return_value=home)
+
+        response = api_client.get(reverse("list-homes"), {"page_size": 2})
+
+        assert response.status_code == http.HTTPStatus.OK
+        actual_response = HomeListResponse.model_validate_json(response.content)
+        assert actual_response.homes == [home, home]
+        assert actual_response.next is not None
+        mock_list_uprns.assert_called_once_with(None, 3)
+
+        response = api_client.get(actual_response.next)
+
+        assert response.status_code == http.HTTPStatus.OK
+        mock_list_uprns.assert_called_with("2", 3)
+
+    def test_get_skips_unloadable(
+        self, home: Home, mocker: MockerFixture, api_client: APIClient
+    ):
+        mock_list_uprns = mocker.patch(
+            "python_challenge.api.views.list_uprns", return_value=["1", "2", "3"]
+        )
+        invalid = ValidationError.from_exception_data(
+            "some value is missing",
+            [pydantic_core.InitErrorDetails(type="missing", input="input data")],
+        )
+        mocker.patch(
+            "python_challenge.api.views.get_home",
+            side_effect=[FileNotFoundError("deleted"), invalid, home, home],
+        )
+
+        response = api_client.get(reverse("list-homes"), {"page_size": 2})
+
+        assert response.status_code == http.HTTPStatus.OK
+        actual_response = HomeListResponse.model_validate_json(response.content)
+        assert actual_response.homes == []
+        # Continues after the last UPRN examined.
+        assert actual_response.next is not None
+        api_client.get(actual_response.next)
+        mock_list_uprns.assert_called_with("2", 3)
+
+
+class TestResultsList:
+
+    def test_get(
+        self,
+        results: RetrofitPlannerResponsePublic,
+        run_id: str,
+        mocker: MockerFixture,
+        api_client: APIClient,
+    ):
+        mock_list_simulation_ids = mocker.patch(
+            "python_challenge.api.views.list_simulation_ids", return_value=[run_id]
+        )
+        mock_get_results = mocker.patch(
+            "python_challenge.api.views.get_results", return_value=results
+        )
+
+        response = api_client.get(reverse("list-results"))
+
+        assert response.status_code == http.HTTPStatus.OK
+        actual_response = ResultsListResponse.model_validate_json(response.content)
+        assert actual_response.results == [results]
+        assert actual_response.next is None
+        mock_list_simulation_ids.assert_called_once_with(None, 101)
+        mock_get_results.assert_called_once_with(uuid=run_id)
+
+    def test_get_skips_unloadable(
+        self,
+        results: RetrofitPlannerResponsePublic,
+        run_id: str,
+        mocker: MockerFixture,
+        api_client: APIClient,
+    ):
+        mocker.patch(
+            "python_challenge.api.views.list_simulation_ids",
+            return_value=["deleted", run_id],
+        )
+        mocker.patch(
+            "python_challenge.api.views.get_results",
+            side_effect=[FileNotFoundError("deleted"), results],
+        )
+
+        response = api_client.get(reverse("list-results"))
+
+        assert response.status_code == http.HTTPStatus.OK
+        actual_response = ResultsListResponse.model_validate_json(response.content)
+        assert actual_response.results == [results]
+
+
+class TestExport:
+
+    def test_get_homes(self, mocker: MockerFixture, api_client: APIClient):
+        mock_iter_ndjson = mocker.patch(
+            "python_challenge.api.views.iter_ndjson", return_value=iter(["{}\n"] * 2)
+        )
+
+        response = api_client.get(reverse("export-homes"))
+
+        assert response.status_code == http.HTTPStatus.OK
+        assert response["Content-Type"] == "application/x-ndjson"
+        assert response.getvalue() == b"{}\n{}\n"
+        mock_iter_ndjson.assert_called_once_with("homes")
+
+    def test_get_results(self, mocker: MockerFixture, api_client: APIClient):
+        mock_iter_ndjson = mocker.patch(
+            "python_challenge.api.views.iter_ndjson", return_value=iter(["{}\n"])
+        )
+
+        response = api_client.get(reverse("export-results"))
+
+        assert response.status_code == http.HTTPStatus.OK
+        assert response.getvalue() == b"{}\n"
+        mock_iter_ndjson.assert_called_once_with("results")
+
+    @pytest.mark.asyncio
+    async def test_get_asgi(self, mocker: MockerFixture):
+        mocker.patch(
+            "python_challenge.api.views.iter_ndjson", return_value=iter(["{}\n"] * 2)
+        )
+
+        response = await AsyncClient().get(reverse("export-homes"))
+
+        assert response.status_code == http.HTTPStatus.OK
+        assert isinstance(response, StreamingHttpResponse)
+        content = response.streaming_content
+        assert isinstance(content, AsyncIterator)
+        assert [part async for part in content] == [b"{}\n"] * 2
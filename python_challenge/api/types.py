@@ -1,7 +1,176 @@
+from typing import Any
+from typing import Literal
+
 import pydantic
 
+from ..breakdown import Dimension
+from ..compact import CompactRetrofitPlannerResponse
+from ..fuels import FuelClass
+from ..savings import CumulativeEnergyChange
+from ..summaries import Figure
+from ..types.enums import DomesticEnergyEndUse
+from ..types.enums import EnergySource
 from ..types.home import Home
+from ..types.pydantic.fields import UPRN
+from ..types.retrofit_planner import RetrofitPlannerResponsePublic
+
+# The response models holding whole Homes or results take long to build, so they are
+# built on first use rather than when every worker imports the views.
+_DEFERRED = pydantic.ConfigDict(defer_build=True)
+
+DOC_NEXT = "Link to the next page of results, null on the last page."
 
 
 class HomeDetailsResponse(pydantic.BaseModel):
+    model_config = _DEFERRED
+
     home: Home
+
+
+class HomeListResponse(pydantic.BaseModel):
+    model_config = _DEFERRED
+
+    next: str | None = pydantic.Field(description=DOC_NEXT)
+    homes: list[Home]
+
+
+DOC_CUMULATIVE_ENERGY_CHANGE = """
+Change from the baseline after each stage of the improvement plan, i.e. the savings if
+the plan stopped at that stage. Negative for reductions.
+"""
+
+
+class ResultsDetailsResponse(pydantic.BaseModel):
+    model_config = _DEFERRED
+
+    results: RetrofitPlannerResponsePublic
+    cumulative_energy_change: list[CumulativeEnergyChange] = pydantic.Field(
+        description=DOC_CUMULATIVE_ENERGY_CHANGE
+    )
+
+
+class CompactResultsDetailsResponse(pydantic.BaseModel):
+    model_config = _DEFERRED
+
+    results: CompactRetrofitPlannerResponse
+    cumulative_energy_change: list[CumulativeEnergyChange] = pydantic.Field(
+        description=DOC_CUMULATIVE_ENERGY_CHANGE
+    )
+
+
+class ResultsDetailsQuery(pydantic.BaseModel):
+    compact: bool = pydantic.Field(
+        description="""
+        Return the improved Homes as JSON patches against the baseline Home, which is
+        much smaller for plans with many stages.
+        """,
+        default=False,
+    )
+
+
+class HomeChange(pydantic.BaseModel):
+    path: str = pydantic.Field(
+        description="Dotted path of the changed field, e.g. `wall.has_insulation`."
+    )
+    old: Any = pydantic.Field(description="Value in the baseline Home.")
+    new: Any = pydantic.Field(description="Value in the improved Home.")
+
+
+class StageChangesResponse(pydantic.BaseModel):
+    stage: int = pydantic.Field(description="Index of the improvement plan stage.")
+    changes: list[HomeChange]
+
+
+class BreakdownQuery(pydantic.BaseModel):
+    group_by: list[Dimension] = pydantic.Field(
+        description="""
+        Comma-separated dimensions to group by, in the order of the cells' keys: `stage`,
+        `month`, `source`, `fuel_class` and/or `end_use`. Sources (and their fuel
+        classes) can't be grouped with end uses. None for the grand total.
+        """,
+        default=[],
+    )
+    metric: Figure = pydantic.Field(
+        description="Figure summed in each cell.", default="energy"
+    )
+    stages: list[pydantic.NonNegativeInt | Literal["baseline"]] | None = pydantic.Field(
+        description="""
+        Comma-separated stages to break down: `baseline` and/or indexes of improvement
+        plan stages. Every stage when grouped by stage, otherwise the baseline only.
+        """,
+        default=None,
+    )
+
+    @pydantic.field_validator("group_by", "stages", mode="before")
+    @classmethod
+    def _split(cls, value: str) -> list[str]:
+        """Comma-separated values of the query parameter, as a list."""
+        return [item.strip() for item in value.split(",") if item.strip()]
+
+
+class BreakdownCell(pydantic.BaseModel):
+    stage: int | Literal["baseline"] | None = None
+    month: int | None = None
+    source: EnergySource | None = None
+    fuel_class: FuelClass | None = None
+    end_use: DomesticEnergyEndUse | None = None
+    value: float = pydantic.Field(description="The sum of the metric.")
+
+
+class BreakdownResponse(pydantic.BaseModel):
+    metric: Figure
+    group_by: list[Dimension]
+    cells: list[BreakdownCell] = pydantic.Field(
+        description="""
+        One per combination of the dimensions grouped by with any consumption, with
+        only those dimensions.
+        """
+    )
+
+
+class ResultsListResponse(pydantic.BaseModel):
+    model_config = _DEFERRED
+
+    next: str | None = pydantic.Field(description=DOC_NEXT)
+    results: list[RetrofitPlannerResponsePublic]
+
+
+class NearbyHomesQuery(pydantic.BaseModel):
+    longitude: float = pydantic.Field(ge=-180, le=180)
+    latitude: float = pydantic.Field(ge=-90, le=90)
+    radius: float = pydantic.Field(
+        title="Radius (metres)",
+        gt=0,
+        le=50_000,
+        default=500,
+    )
+
+
+class BoundingBoxHomesQuery(pydantic.BaseModel):
+    min_longitude: float = pydantic.Field(ge=-180, le=180)
+    min_latitude: float = pydantic.Field(ge=-90, le=90)
+    max_longitude: float = pydantic.Field(ge=-180, le=180)
+    max_latitude: float = pydantic.Field(ge=-90, le=90)
+
+    @pydantic.model_validator(mode="after")
+    def _validate_bounds(self) -> "BoundingBoxHomesQuery":
+        if self.min_longitude > self.max_longitude:
+            raise ValueError("min_longitude must not be greater than max_longitude")
+        if self.min_latitude > self.max_latitude:
+            raise ValueError("min_latitude must not be greater than max_latitude")
+        return self
+
+
+class HomeLocation(pydantic.BaseModel):
+    uprn: UPRN
+    longitude: float
+    latitude: float
+    distance: float | None = pydantic.Field(
+        title="Distance (metres)",
+        description="Distance from the search point, for radius searches.",
+        default=None,
+    )
+
+
+class HomeLocationsResponse(pydantic.BaseModel):
+    homes: list[HomeLocation]
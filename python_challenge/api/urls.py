@@ -9,4 +9,49 @@ urlpatterns = [
         views.HomeDetailsByUPRN.as_view(),
         name="get-home",
     ),
+    path(
+        r"homes",
+        views.HomeList.as_view(),
+        name="list-homes",
+    ),
+    path(
+        r"homes/export",
+        views.HomesExport.as_view(),
+        name="export-homes",
+    ),
+    path(
+        r"homes/nearby",
+        views.HomesNearby.as_view(),
+        name="homes-nearby",
+    ),
+    path(
+        r"homes/bbox",
+        views.HomesInBoundingBox.as_view(),
+        name="homes-bbox",
+    ),
+    path(
+        r"results",
+        views.ResultsList.as_view(),
+        name="list-results",
+    ),
+    path(
+        r"results/export",
+        views.ResultsExport.as_view(),
+        name="export-results",
+    ),
+    path(
+        r"results/<str:uuid>",
+        views.ResultsDetails.as_view(),
+        name="get-results",
+    ),
+    path(
+        r"results/<str:uuid>/plan/<int:stage>/changes",
+        views.ResultsStageChanges.as_view(),
+        name="get-stage-changes",
+    ),
+    path(
+        r"results/<str:uuid>/breakdown",
+        views.ResultsBreakdown.as_view(),
+        name="get-results-breakdown",
+    ),
 ]
@@ -1,22 +1,69 @@
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
 from typing import Any
+from typing import TypeVar
 
 import pydantic
+import structlog
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from drf_spectacular.utils import OpenApiParameter
 from drf_spectacular.utils import OpenApiResponse
 from drf_spectacular.utils import extend_schema
-from markdown import markdown
 from rest_framework.exceptions import NotFound
 from rest_framework.exceptions import ValidationError
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
+from ..breakdown import BASELINE
+from ..breakdown import get_energy_columns
+from ..compact import CompactRetrofitPlannerResponse
+from ..diff import get_plan_changes
+from ..docs.descriptions import markdown
+from ..export import NDJSON_CONTENT_TYPE
+from ..export import aiter_lines
+from ..export import iter_ndjson
+from ..geo import BoundingBox
+from ..geo import IndexedLocation
+from ..geo import get_home_index
+from ..hotlist import record_access
+from ..savings import get_cumulative_energy_change
+from ..utils import DocumentKind
 from ..utils import get_home
+from ..utils import get_results
+from ..utils import list_simulation_ids
+from ..utils import list_uprns
+from .pagination import KeysetPagination
+from .pagination import ResultsPagination
+from .types import BoundingBoxHomesQuery
+from .types import BreakdownCell
+from .types import BreakdownQuery
+from .types import BreakdownResponse
+from .types import CompactResultsDetailsResponse
+from .types import HomeChange
 from .types import HomeDetailsResponse
+from .types import HomeListResponse
+from .types import HomeLocation
+from .types import HomeLocationsResponse
+from .types import NearbyHomesQuery
+from .types import ResultsDetailsQuery
+from .types import ResultsDetailsResponse
+from .types import ResultsListResponse
+from .types import StageChangesResponse
+
+M = TypeVar("M", bound=pydantic.BaseModel)
+
+logger = structlog.get_logger(__name__)
 
 UPRN_NOT_FOUND = """The UPRN can not be found in the OS Open UPRN database.
 This may mean the UPRN is incorrect, or that the building was
 constructed recently and the UPRN has not been published yet."""
 
+RESULTS_NOT_FOUND = "There are no results for this simulation UUID."
+STAGE_NOT_FOUND = "The improvement plan does not have this stage."
+
 
 class HomeDetailsByUPRN(APIView):
     http_method_names = ["get"]
@@ -45,8 +92,397 @@ Get all the details ZUoS has about a Home, by it's UPRN.
             raise NotFound(detail=UPRN_NOT_FOUND)
         except pydantic.ValidationError as error:
             raise ValidationError(detail=str(error))
+        record_access("homes", uprn)
 
         response = HomeDetailsResponse(
             home=home,
         )
         return Response(data=response.model_dump(mode="json"))
+
+
+class ResultsDetails(APIView):
+    http_method_names = ["get"]
+    description = markdown(
+        """
+Get the retrofit plan results of a simulation, by it's UUID, with the cumulative
+change in energy, carbon and cost after each stage of the improvement plan.
+
+With `compact=true`, each `improved_home` is replaced by an `improved_home_patch`: the
+JSON patch ([RFC 6902](https://datatracker.ietf.org/doc/html/rfc6902)) operations which
+turn the `baseline_home` into the improved Home.
+"""
+    )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "compact",
+                bool,
+                description="Return the improved Homes as patches of the baseline Home.",
+            ),
+        ],
+        responses={
+            "200": OpenApiResponse(
+                response=ResultsDetailsResponse,
+                description="CompactResultsDetailsResponse with `compact=true`.",
+            ),
+            "400": OpenApiResponse(description="Validation error"),
+            "404": OpenApiResponse(description=RESULTS_NOT_FOUND),
+        },
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        try:
+            query = ResultsDetailsQuery.model_validate(request.query_params.dict())
+        except pydantic.ValidationError as error:
+            raise ValidationError(detail=str(error))
+        try:
+            results = get_results(uuid=self.kwargs["uuid"])
+            cumulative_energy_change = get_cumulative_energy_change(
+                uuid=self.kwargs["uuid"]
+            )
+        except FileNotFoundError:
+            raise NotFound(detail=RESULTS_NOT_FOUND)
+        except pydantic.ValidationError as error:
+            raise ValidationError(detail=str(error))
+        record_access("results", self.kwargs["uuid"])
+
+        response: ResultsDetailsResponse | CompactResultsDetailsResponse
+        if query.compact:
+            response = CompactResultsDetailsResponse(
+                results=CompactRetrofitPlannerResponse.from_results(results),
+                cumulative_energy_change=cumulative_energy_change,
+            )
+        else:
+            response = ResultsDetailsResponse(
+                results=results, cumulative_energy_change=cumulative_energy_change
+            )
+        return Response(data=response.model_dump(mode="json"))
+
+
+class ResultsStageChanges(APIView):
+    http_method_names = ["get"]
+    description = markdown(
+        """
+Get the changes to the Home made by a stage of a simulation's improvement plan: each
+field which differs between the `baseline_home` and the stage's `improved_home`, with
+its old and new values.
+
+Stages are numbered from 0, in the order of the `improvement_plan`.
+"""
+    )
+
+    @extend_schema(
+        responses={
+            "200": OpenApiResponse(response=StageChangesResponse),
+            "400": OpenApiResponse(description="Validation error"),
+            "404": OpenApiResponse(description="Unknown simulation UUID or stage"),
+        },
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        stage = self.kwargs["stage"]
+        try:
+            stages = get_plan_changes(uuid=self.kwargs["uuid"])
+        except FileNotFoundError:
+            raise NotFound(detail=RESULTS_NOT_FOUND)
+        except pydantic.ValidationError as error:
+            raise ValidationError(detail=str(error))
+        record_access("results", self.kwargs["uuid"])
+        if stage >= len(stages):
+            raise NotFound(detail=STAGE_NOT_FOUND)
+
+        response = StageChangesResponse(
+            stage=stage,
+            changes=[
+                HomeChange(path=change.path, old=change.old, new=change.new)
+                for change in stages[stage]
+            ],
+        )
+        return Response(data=response.model_dump(mode="json"))
+
+
+class ResultsBreakdown(APIView):
+    http_method_names = ["get"]
+    description = markdown(
+        """
+Get a breakdown of the energy, carbon or operating cost of a simulation's baseline and
+improvement plan stages, e.g. the monthly energy by fuel class of the baseline and of
+stage 3 (`group_by=stage,month,fuel_class&stages=baseline,3`), or the annual cost by
+end use (`group_by=end_use&metric=operating_cost`).
+
+The figures are those of each stage's full `energy_profile`, summed by the dimensions
+grouped by. Only the cells are returned, not the whole profiles.
+"""
+    )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                "group_by",
+                str,
+                description="Comma-separated stage, month, source, fuel_class, end_use.",
+            ),
+            OpenApiParameter(
+                "metric",
+                str,
+                enum=["energy", "co2e", "operating_cost"],
+                description="Figure summed in each cell, default energy.",
+            ),
+            OpenApiParameter(
+                "stages",
+                str,
+                description="Comma-separated baseline and/or plan stage indexes.",
+            ),
+        ],
+        responses={
+            "200": OpenApiResponse(response=BreakdownResponse),
+            "400": OpenApiResponse(description="Validation error"),
+            "404": OpenApiResponse(description="Unknown simulation UUID or stage"),
+        },
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        try:
+            query = BreakdownQuery.model_validate(request.query_params.dict())
+        except pydantic.ValidationError as error:
+            raise ValidationError(detail=str(error))
+        try:
+            columns = get_energy_columns(uuid=self.kwargs["uuid"])
+        except FileNotFoundError:
+            raise NotFound(detail=RESULTS_NOT_FOUND)
+        except pydantic.ValidationError as error:
+            raise ValidationError(detail=str(error))
+        record_access("results", self.kwargs["uuid"])
+
+        stages = None
+        if query.stages is not None:
+            stages = [
+                BASELINE if stage == "baseline" else stage for stage in query.stages
+            ]
+        try:
+            cells = columns.breakdown(query.group_by, query.metric, stages)
+        except ValueError as error:
+            raise ValidationError(detail=str(error))
+        except IndexError:
+            raise NotFound(detail=STAGE_NOT_FOUND)
+
+        response = BreakdownResponse(
+            metric=query.metric,
+            group_by=query.group_by,
+            cells=[
+                BreakdownCell(**dict(zip(query.group_by, cell.key)), value=cell.value)
+                for cell in cells
+            ],
+        )
+        return Response(data=response.model_dump(mode="json", exclude_none=True))
+
+
+def _iter_listed(keys: Iterable[str], get: Callable[[str], M]) -> Iterator[M]:
+    """
+    The documents of a page, without those deleted since the keys were listed, or
+    which fail validation, so one bad document doesn't fail the whole page.
+    """
+    for key in keys:
+        try:
+            yield get(key)
+        except (FileNotFoundError, pydantic.ValidationError) as error:
+            logger.warning("document_not_listed", key=key, error=str(error))
+
+
+class HomeList(APIView):
+    http_method_names = ["get"]
+    description = markdown(
+        """
+List all the Homes, ordered by UPRN as text, so e.g. `10` comes before `9`.
+
+Use the `next` link to fetch the following page, it stays valid while Homes are added.
+Homes which can't be loaded are left out, so a page may have fewer than `page_size`.
+"""
+    )
+    pagination_class = KeysetPagination
+
+    @extend_schema(
+        parameters=KeysetPagination().get_schema_parameters(),
+        responses={
+            "200": OpenApiResponse(response=HomeListResponse),
+            "400": OpenApiResponse(description="Invalid page size"),
+            "404": OpenApiResponse(description="Invalid cursor"),
+        },
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        paginator = self.pagination_class()
+        uprns = paginator.paginate_keys(list_uprns, request)
+        response = HomeListResponse(
+            next=paginator.next_link,
+            homes=list(_iter_listed(uprns, lambda uprn: get_home(uprn=uprn))),
+        )
+        return Response(data=response.model_dump(mode="json"))
+
+
+class ResultsList(APIView):
+    http_method_names = ["get"]
+    description = markdown(
+        """
+List all the retrofit plan results, ordered by simulation UUID.
+
+Use the `next` link to fetch the following page, it stays valid while results are
+added. Results which can't be loaded are left out, so a page may have fewer than
+`page_size`.
+"""
+    )
+    pagination_class = ResultsPagination
+
+    @extend_schema(
+        parameters=ResultsPagination().get_schema_parameters(),
+        responses={
+            "200": OpenApiResponse(response=ResultsListResponse),
+            "400": OpenApiResponse(description="Invalid page size"),
+            "404": OpenApiResponse(description="Invalid cursor"),
+        },
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        paginator = self.pagination_class()
+        simulation_ids = paginator.paginate_keys(list_simulation_ids, request)
+        response = ResultsListResponse(
+            next=paginator.next_link,
+            results=list(
+                _iter_listed(simulation_ids, lambda uuid: get_results(uuid=uuid))
+            ),
+        )
+        return Response(data=response.model_dump(mode="json"))
+
+
+def _ndjson_response(request: Request, kind: DocumentKind) -> StreamingHttpResponse:
+    lines = iter_ndjson(kind)
+    if isinstance(request._request, ASGIRequest):
+        return StreamingHttpResponse(
+            aiter_lines(lines), content_type=NDJSON_CONTENT_TYPE
+        )
+    return StreamingHttpResponse(lines, content_type=NDJSON_CONTENT_TYPE)
+
+
+class HomesExport(APIView):
+    http_method_names = ["get"]
+    description = markdown(
+        """
+Export all the Homes as NDJSON (one JSON `Home` document per line), ordered by UPRN
+as text, so e.g. `10` comes before `9`.
+
+The response is streamed, so it can be processed line by line as it arrives.
+"""
+    )
+
+    @extend_schema(
+        responses={
+            (200, NDJSON_CONTENT_TYPE): OpenApiResponse(
+                description="One Home JSON document per line."
+            ),
+        },
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> StreamingHttpResponse:
+        return _ndjson_response(request, "homes")
+
+
+class ResultsExport(APIView):
+    http_method_names = ["get"]
+    description = markdown(
+        """
+Export all the retrofit plan results as NDJSON (one JSON
+`RetrofitPlannerResponsePublic` document per line), ordered by simulation UUID.
+
+The response is streamed, so it can be processed line by line as it arrives.
+"""
+    )
+
+    @extend_schema(
+        responses={
+            (200, NDJSON_CONTENT_TYPE): OpenApiResponse(
+                description="One RetrofitPlannerResponsePublic JSON document per line."
+            ),
+        },
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> StreamingHttpResponse:
+        return _ndjson_response(request, "results")
+
+
+def _home_locations_response(locations: list[IndexedLocation]) -> Response:
+    response = HomeLocationsResponse(
+        homes=[
+            HomeLocation(
+                uprn=location.key,
+                longitude=location.longitude,
+                latitude=location.latitude,
+                distance=location.distance,
+            )
+            for location in locations
+        ]
+    )
+    return Response(data=response.model_dump(mode="json"))
+
+
+class HomesNearby(APIView):
+    http_method_names = ["get"]
+    description = markdown(
+        """
+Find the Homes within a radius (in metres) of a point, nearest first.
+"""
+    )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("longitude", float, required=True),
+            OpenApiParameter("latitude", float, required=True),
+            OpenApiParameter(
+                "radius", float, description="Search radius (metres), default 500."
+            ),
+        ],
+        responses={
+            "200": OpenApiResponse(response=HomeLocationsResponse),
+            "400": OpenApiResponse(description="Validation error"),
+        },
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        try:
+            query = NearbyHomesQuery.model_validate(request.query_params.dict())
+        except pydantic.ValidationError as error:
+            raise ValidationError(detail=str(error))
+
+        locations = get_home_index().within_radius(
+            longitude=query.longitude, latitude=query.latitude, radius=query.radius
+        )
+        return _home_locations_response(locations)
+
+
+class HomesInBoundingBox(APIView):
+    http_method_names = ["get"]
+    description = markdown(
+        """
+Find the Homes inside a longitude/latitude bounding box.
+"""
+    )
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter("min_longitude", float, required=True),
+            OpenApiParameter("min_latitude", float, required=True),
+            OpenApiParameter("max_longitude", float, required=True),
+            OpenApiParameter("max_latitude", float, required=True),
+        ],
+        responses={
+            "200": OpenApiResponse(response=HomeLocationsResponse),
+            "400": OpenApiResponse(description="Validation error"),
+        },
+    )
+    def get(self, request: Request, *args: Any, **kwargs: Any) -> Response:
+        try:
+            query = BoundingBoxHomesQuery.model_validate(request.query_params.dict())
+        except pydantic.ValidationError as error:
+            raise ValidationError(detail=str(error))
+
+        locations = get_home_index().within_bbox(
+            BoundingBox(
+                min_longitude=query.min_longitude,
+                min_latitude=query.min_latitude,
+                max_longitude=query.max_longitude,
+                max_latitude=query.max_latitude,
+            )
+        )
+        return _home_locations_response(locations)
@@ -0,0 +1,194 @@
+"""
+Breakdowns of the energy consumption of a simulation's baseline and plan stages, e.g.
+the monthly energy by fuel class of the baseline and of stage 3, or the annual cost by
+end use.
+
+The consumption summaries of every stage are loaded once into columns of numpy arrays,
+with energy sources and end uses as their enum codes (see enum_codes). A breakdown is
+then a filter of the rows, and a sum of one figure grouped by integer keys, rather
+than a Python loop over the pydantic models.
+"""
+
+import functools
+from collections.abc import Callable
+from collections.abc import Sequence
+from typing import Any
+from typing import Literal
+from typing import NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .enum_codes import NONE
+from .enum_codes import enum_codes
+from .fuels import FUEL_CLASSES
+from .fuels import classify
+from .summaries import FIGURES
+from .summaries import Figure
+from .summaries import iter_summaries
+from .types.retrofit_planner import RetrofitPlannerResponsePublic
+from .utils import get_results
+from .utils import get_results_version
+
+Dimension = Literal["stage", "month", "source", "fuel_class", "end_use"]
+"""
+- ``stage``: ``"baseline"``, or the index of the improvement plan stage.
+- ``month``: month number (January=1).
+- ``source``: EnergySource.
+- ``fuel_class``: fuel class of the EnergySource, see fuels.
+- ``end_use``: DomesticEnergyEndUse.
+"""
+
+BASELINE = -1
+"""Stage of the baseline profile, before the first stage of the plan."""
+
+FIELDS = (
+    "annual_energy_total",
+    "annual_energy_sources",
+    "annual_energy_end_use",
+    "monthly_energy_total",
+    "monthly_energy_sources",
+    "monthly_energy_end_use",
+)
+
+IntArray = npt.NDArray[np.int64]
+FloatArray = npt.NDArray[np.float64]
+
+
+class BreakdownCell(NamedTuple):
+    key: tuple[Any, ...]
+    """The value of each dimension grouped by, in their order."""
+    value: float
+
+
+class EnergyColumns:
+    """
+    The consumption summaries of the baseline and of each stage of a plan, as columns.
+
+    Row ``i`` is the summary of ``FIELDS[field[i]]`` of the absolute ``energy_profile``
+    of stage ``stage[i]`` (BASELINE for the baseline), for month ``month[i]`` (0 for
+    annual fields) and the source or end use of enum code ``key[i]`` (NONE for totals),
+    with its FIGURES in ``figures[i]``.
+    """
+
+    def __init__(
+        self,
+        stages: int,
+        stage: IntArray,
+        field: IntArray,
+        month: IntArray,
+        key: IntArray,
+        figures: FloatArray,
+    ) -> None:
+        self.stages = stages
+        """Number of stages of the plan."""
+        self.stage = stage
+        self.field = field
+        self.month = month
+        self.key = key
+        self.figures = figures
+
+    def __len__(self) -> int:
+        return len(self.stage)
+
+    @classmethod
+    def from_results(cls, results: RetrofitPlannerResponsePublic) -> "EnergyColumns":
+        registry = enum_codes()
+        fields = {field: index for index, field in enumerate(FIELDS)}
+        profiles = [results.baseline_energy_profile] + [
+            stage.energy_profile for stage in results.improvement_plan
+        ]
+        rows: list[tuple[int, int, int, int]] = []
+        figures: list[tuple[float, float, float]] = []
+        for stage, profile in enumerate(profiles, start=BASELINE):
+            for slot, summary in iter_summaries(profile):
+                key = NONE if slot.key is None else registry.code(slot.key)
+                rows.append((stage, fields[slot.field], slot.month or 0, key))
+                figures.append((summary.energy, summary.co2e, summary.operating_cost))
+        columns = np.array(rows, dtype=np.int64).reshape(-1, 4).T
+        return cls(
+            len(results.improvement_plan),
+            *columns,
+            figures=np.array(figures, dtype=np.float64).reshape(-1, len(FIGURES)),
+        )
+
+    def breakdown(
+        self,
+        group_by: Sequence[Dimension],
+        metric: Figure = "energy",
+        stages: Sequence[int] | None = None,
+    ) -> list[BreakdownCell]:
+        """
+        A figure summed over the rows of each combination of the dimensions grouped
+        by, in the order of their keys.
+
+        Only the baseline by default, or the stages grouped by. Sources can't be broken
+        down by end use, as the profiles don't relate them. Raises ValueError for
+        invalid combinations, and IndexError for a stage the plan doesn't have.
+        """
+        if len(set(group_by)) < len(group_by):
+            raise ValueError("Dimensions can only be grouped by once")
+        by_source = "source" in group_by or "fuel_class" in group_by
+        if by_source and "end_use" in group_by:
+            raise ValueError("Energy sources can't be broken down by end use")
+        if stages is None:
+            stages = list(range(BASELINE, self.stages)) if "stage" in group_by else []
+        elif len(stages) > 1 and "stage" not in group_by:
+            raise ValueError("Group by stage to break down more than one stage")
+        if invalid := [
+            stage for stage in stages if not BASELINE <= stage < self.stages
+        ]:
+            raise IndexError(f"The plan has no stage {invalid[0]}")
+
+        period = "monthly" if "month" in group_by else "annual"
+        kind = (
+            "sources" if by_source else "end_use" if "end_use" in group_by else "total"
+        )
+        rows = (self.field == FIELDS.index(f"{period}_energy_{kind}")) & np.isin(
+            self.stage, stages or [BASELINE]
+        )
+        columns: dict[Dimension, npt.NDArray[Any]] = {
+            "stage": self.stage[rows],
+            "month": self.month[rows],
+            "source": self.key[rows],
+            "end_use": self.key[rows],
+        }
+        if "fuel_class" in group_by:
+            columns["fuel_class"] = classify(self.key[rows].astype(np.uint16))
+        values = self.figures[rows, FIGURES.index(metric)]
+        if not group_by:
+            return [BreakdownCell((), float(values.sum()))]
+        keys = np.stack([columns[dimension] for dimension in group_by], axis=1)
+        unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+        sums = np.bincount(inverse.ravel(), weights=values, minlength=len(unique))
+        decoders = [_decoder(dimension) for dimension in group_by]
+        return [
+            BreakdownCell(
+                tuple(decode(key) for decode, key in zip(decoders, row)), float(total)
+            )
+            for row, total in zip(unique.tolist(), sums.tolist())
+        ]
+
+
+def _decoder(dimension: Dimension) -> Callable[[int], Any]:
+    if dimension == "stage":
+        return lambda stage: "baseline" if stage == BASELINE else stage
+    if dimension == "fuel_class":
+        return FUEL_CLASSES.__getitem__
+    if dimension in ("source", "end_use"):
+        return enum_codes().member
+    return int
+
+
+@functools.lru_cache(maxsize=256)
+def _get_energy_columns(uuid: str, version: tuple[int, int]) -> EnergyColumns:
+    return EnergyColumns.from_results(get_results(uuid=uuid))
+
+
+def get_energy_columns(uuid: str) -> EnergyColumns:
+    """
+    The consumption of the stored results of a simulation, as columns.
+
+    Memoized per simulation, until its results are stored again.
+    """
+    return _get_energy_columns(uuid, get_results_version(uuid))
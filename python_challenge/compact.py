@@ -0,0 +1,231 @@
+"""
+Compact representation of retrofit plan results.
+
+Every stage of the plan (and every improvement option) carries a full ``improved_home``
+which is mostly identical to the ``baseline_home``. The compact form stores the
+baseline once, and each improved Home as a JSON patch (RFC 6902) against the baseline,
+which is applied when the improved Home is first accessed.
+"""
+
+import copy
+import functools
+from typing import Any
+from typing import Literal
+from uuid import UUID
+
+import pydantic
+
+from .types.home import EnergyProfile
+from .types.home import Home
+from .types.home import Occupancy
+from .types.recommendations import Improvement
+from .types.recommendations import ImprovementDetails
+from .types.recommendations import ImprovementEnergyProfile
+from .types.retrofit_planner import RetrofitPlannerResponsePublic
+
+JSON = Any
+
+
+class PatchOperation(pydantic.BaseModel):
+    """
+    A JSON patch operation (RFC 6902), limited to add, remove and replace.
+    """
+
+    op: Literal["add", "remove", "replace"]
+    path: str = pydantic.Field(description="JSON pointer (RFC 6901) to the value.")
+    value: JSON = None
+
+    @pydantic.model_serializer(mode="wrap")
+    def _serialize(self, handler: pydantic.SerializerFunctionWrapHandler) -> JSON:
+        data = handler(self)
+        if self.op == "remove":
+            # Remove operations have no value, but a null value is a valid replacement.
+            del data["value"]
+        return data
+
+
+def _escape(key: str | int) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _same(source: JSON, target: JSON) -> bool:
+    # Compare types as well, in python True == 1 == 1.0 but not in JSON.
+    return type(source) is type(target) and source == target
+
+
+def json_diff(source: JSON, target: JSON, path: str = "") -> list[PatchOperation]:
+    """
+    JSON patch operations which change the source JSON data into the target.
+
+    Objects are compared key by key, and lists of the same length item by item.
+    Any other change replaces the whole value.
+    """
+    if isinstance(source, dict) and isinstance(target, dict):
+        operations = []
+        for key, value in source.items():
+            key_path = f"{path}/{_escape(key)}"
+            if key not in target:
+                operations.append(PatchOperation(op="remove", path=key_path))
+            else:
+                operations.extend(json_diff(value, target[key], key_path))
+        for key, value in target.items():
+            if key not in source:
+                operations.append(
+                    PatchOperation(op="add", path=f"{path}/{_escape(key)}", value=value)
+                )
+        return operations
+    if (
+        isinstance(source, list)
+        and isinstance(target, list)
+        and len(source) == len(target)
+    ):
+        operations = []
+        for index, (source_item, target_item) in enumerate(zip(source, target)):
+            operations.extend(json_diff(source_item, target_item, f"{path}/{index}"))
+        return operations
+    if _same(source, target):
+        return []
+    return [PatchOperation(op="replace", path=path, value=target)]
+
+
+def json_patch(document: JSON, operations: list[PatchOperation]) -> JSON:
+    """
+    Apply JSON patch operations to a copy of the document.
+    """
+    document = copy.deepcopy(document)
+    for operation in operations:
+        if not operation.path:
+            if operation.op == "remove":
+                raise ValueError("Can not remove the whole document")
+            document = copy.deepcopy(operation.value)
+            continue
+        *parents, last = (_unescape(token) for token in operation.path.split("/")[1:])
+        parent = document
+        try:
+            for token in parents:
+                parent = parent[int(token) if isinstance(parent, list) else token]
+            if isinstance(parent, list):
+                index = len(parent) if last == "-" else int(last)
+                if operation.op == "add":
+                    parent.insert(index, copy.deepcopy(operation.value))
+                elif operation.op == "remove":
+                    del parent[index]
+                else:
+                    parent[index] = copy.deepcopy(operation.value)
+            elif operation.op == "remove":
+                del parent[last]
+            elif operation.op == "replace" and last not in parent:
+                raise KeyError(last)
+            else:
+                parent[last] = copy.deepcopy(operation.value)
+        except (KeyError, IndexError, ValueError, TypeError):
+            raise ValueError(f"Invalid JSON patch path: {operation.path}")
+    return document
+
+
+class CompactImprovementEnergyProfile(pydantic.BaseModel):
+    """
+    ImprovementEnergyProfile with the improved Home as a patch against the baseline.
+    """
+
+    improvements: list[Improvement | ImprovementDetails]
+    improved_home_patch: list[PatchOperation] = pydantic.Field(
+        description="""
+        JSON patch (RFC 6902) operations to apply to the JSON of the baseline_home to
+        get the improved Home for this set of improvements.
+        """
+    )
+    energy_profile: EnergyProfile
+    relative_energy_change: EnergyProfile
+    payback_years: tuple[int | None, int | None]
+
+    _baseline_home: JSON = pydantic.PrivateAttr(default=None)
+
+    @functools.cached_property
+    def improved_home(self) -> Home:
+        if self._baseline_home is None:
+            raise ValueError("Baseline Home is only available from the compact results")
+        return Home.model_validate(
+            json_patch(self._baseline_home, self.improved_home_patch)
+        )
+
+    @classmethod
+    def from_profile(
+        cls, profile: ImprovementEnergyProfile, baseline_home: JSON
+    ) -> "CompactImprovementEnergyProfile":
+        return cls(
+            improvements=profile.improvements,
+            improved_home_patch=json_diff(
+                baseline_home, profile.improved_home.model_dump(mode="json")
+            ),
+            energy_profile=profile.energy_profile,
+            relative_energy_change=profile.relative_energy_change,
+            payback_years=profile.payback_years,
+        )
+
+    def to_profile(self) -> ImprovementEnergyProfile:
+        return ImprovementEnergyProfile(
+            improvements=self.improvements,
+            improved_home=self.improved_home,
+            energy_profile=self.energy_profile,
+            relative_energy_change=self.relative_energy_change,
+            payback_years=self.payback_years,
+        )
+
+
+class CompactRetrofitPlannerResponse(pydantic.BaseModel):
+    """
+    RetrofitPlannerResponsePublic, with the improved Homes stored as patches against
+    the baseline Home.
+    """
+
+    simulation_id: UUID
+    baseline_energy_profile: EnergyProfile
+    baseline_home: Home
+    occupancy_profile: Occupancy
+    improvement_option_evaluation: list[CompactImprovementEnergyProfile]
+    improvement_plan: list[CompactImprovementEnergyProfile]
+
+    def model_post_init(self, context: Any) -> None:
+        # Shared by all the stages, patches are applied to a copy.
+        baseline_home = self.baseline_home.model_dump(mode="json")
+        for profile in self.improvement_option_evaluation + self.improvement_plan:
+            profile._baseline_home = baseline_home
+
+    @classmethod
+    def from_results(
+        cls, results: RetrofitPlannerResponsePublic
+    ) -> "CompactRetrofitPlannerResponse":
+        baseline_home = results.baseline_home.model_dump(mode="json")
+        return cls(
+            simulation_id=results.simulation_id,
+            baseline_energy_profile=results.baseline_energy_profile,
+            baseline_home=results.baseline_home,
+            occupancy_profile=results.occupancy_profile,
+            improvement_option_evaluation=[
+                CompactImprovementEnergyProfile.from_profile(profile, baseline_home)
+                for profile in results.improvement_option_evaluation
+            ],
+            improvement_plan=[
+                CompactImprovementEnergyProfile.from_profile(profile, baseline_home)
+                for profile in results.improvement_plan
+            ],
+        )
+
+    def to_results(self) -> RetrofitPlannerResponsePublic:
+        return RetrofitPlannerResponsePublic(
+            simulation_id=self.simulation_id,
+            baseline_energy_profile=self.baseline_energy_profile,
+            baseline_home=self.baseline_home,
+            occupancy_profile=self.occupancy_profile,
+            improvement_option_evaluation=[
+                profile.to_profile() for profile in self.improvement_option_evaluation
+            ],
+            improvement_plan=[
+                profile.to_profile() for profile in self.improvement_plan
+            ],
+        )
@@ -0,0 +1,56 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from python_challenge import hotlist
+from python_challenge import utils
+from python_challenge.types.home import Home
+from python_challenge.types.retrofit_planner import RetrofitPlannerResponsePublic
+
+PATH_DATA = Path(__file__).parent.parent / "data"
+
+
+@pytest.fixture
+def uprn() -> str:
+    return "906205784"
+
+
+@pytest.fixture
+def home() -> Home:
+    with open(PATH_DATA / "906205784.json") as file:
+        return Home.model_validate_json(file.read())
+
+
+@pytest.fixture
+def run_id() -> str:  # pragma: no cover
+    return "1e0e7511-9e40-4b13-8c52-4f9c26c41c55"
+
+
+@pytest.fixture
+def results() -> RetrofitPlannerResponsePublic:  # pragma: no cover
+    with open(PATH_DATA / "1e0e7511-9e40-4b13-8c52-4f9c26c41c55.json") as file:
+        return RetrofitPlannerResponsePublic.model_validate_json(file.read())
+
+
+@pytest.fixture
+def plan(results: RetrofitPlannerResponsePublic) -> RetrofitPlannerResponsePublic:
+    """The results, with a plan of three identical stages."""
+    return results.model_copy(update={"improvement_plan": results.improvement_plan * 3})
+
+
+@pytest.fixture
+def path_data(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Iterator[Path]:
+    """Use an empty temporary directory as the data store."""
+    monkeypatch.setattr("python_challenge.utils.PATH_DATA", tmp_path)
+    utils.clear_caches()
+    yield tmp_path
+    utils.clear_caches()
+
+
+@pytest.fixture(autouse=True)
+def access_counter(monkeypatch: pytest.MonkeyPatch) -> hotlist.AccessCounter:
+    """Count the requests of each test apart, without adding them to the hot list."""
+    counter = hotlist.AccessCounter()
+    monkeypatch.setattr("python_challenge.hotlist.access_counter", counter)
+    return counter
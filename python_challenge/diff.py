@@ -0,0 +1,97 @@
+"""
+Structural diff of Homes, to explain what each stage of a retrofit plan changes.
+
+The differ walks the fields of the pydantic models (Wall, Roof, HeatingSystem...)
+directly, rather than serializing both Homes to JSON and comparing the trees, and skips
+any sub-tree shared by both Homes.
+"""
+
+import functools
+from typing import Any
+from typing import NamedTuple
+
+import pydantic
+
+from .types.retrofit_planner import RetrofitPlannerResponsePublic
+from .utils import get_results
+from .utils import get_results_version
+
+
+class FieldChange(NamedTuple):
+    path: str
+    """Dotted path of the field, with list indexes, e.g. ``doors.0.area``."""
+    old: Any
+    new: Any
+
+
+def _diff(
+    old: Any, new: Any, path: tuple[str | int, ...], changes: list[FieldChange]
+) -> None:
+    if old is new:
+        return
+    if isinstance(old, pydantic.BaseModel):
+        if type(new) is type(old):
+            for name in type(old).model_fields:
+                _diff(getattr(old, name), getattr(new, name), (*path, name), changes)
+            return
+    elif isinstance(old, (list, tuple)):
+        if type(new) is type(old) and len(new) == len(old):
+            for index, (old_item, new_item) in enumerate(zip(old, new)):
+                _diff(old_item, new_item, (*path, index), changes)
+            return
+    elif isinstance(old, dict):
+        if isinstance(new, dict):
+            for key, old_value in old.items():
+                _diff(old_value, new.get(key), (*path, key), changes)
+            for key, new_value in new.items():
+                if key not in old:
+                    changes.append(
+                        FieldChange(_format_path((*path, key)), None, new_value)
+                    )
+            return
+    elif old == new:
+        return
+    changes.append(FieldChange(_format_path(path), old, new))
+
+
+def _format_path(path: tuple[str | int, ...]) -> str:
+    return ".".join(str(key) for key in path)
+
+
+def diff_models(old: pydantic.BaseModel, new: pydantic.BaseModel) -> list[FieldChange]:
+    """
+    The fields which differ between two models, e.g. two Homes.
+
+    Nested models, lists of the same length and dicts are compared field by field,
+    item by item and key by key. Anything else which differs (including a nested model
+    of a different type, or a list of a different length) is one change of the whole
+    value. Added or removed dict keys have a value of None on the missing side.
+    """
+    changes: list[FieldChange] = []
+    _diff(old, new, (), changes)
+    return changes
+
+
+def diff_plan(results: RetrofitPlannerResponsePublic) -> list[list[FieldChange]]:
+    """
+    Changes from the baseline Home to the improved Home of each stage of the plan.
+    """
+    return [
+        diff_models(results.baseline_home, stage.improved_home)
+        for stage in results.improvement_plan
+    ]
+
+
+@functools.lru_cache(maxsize=1024)
+def _get_plan_changes(uuid: str, version: tuple[int, int]) -> list[list[FieldChange]]:
+    return diff_plan(get_results(uuid=uuid))
+
+
+def get_plan_changes(uuid: str) -> list[list[FieldChange]]:
+    """
+    Changes made by each stage of the stored plan of a simulation.
+
+    Memoized per simulation, until its results are stored again.
+    The returned lists are shared, and must not be modified.
+    """
+    return _get_plan_changes(uuid, get_results_version(uuid))
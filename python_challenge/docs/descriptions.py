@@ -0,0 +1,12 @@
+"""
+Descriptions of the views, written in markdown.
+
+They are only rendered to HTML when first used (in the OpenAPI schema or an OPTIONS
+response), rather than by every worker when it imports the views.
+"""
+
+from django.utils.functional import lazy
+from markdown import markdown as render_markdown
+
+markdown = lazy(render_markdown, str)
+"""Lazy ``markdown.markdown``: renders the text when the result is first used."""
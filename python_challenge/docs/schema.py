@@ -0,0 +1,44 @@
+"""
+OpenAPI schema generation with drf-spectacular, and its pydantic extension.
+
+This module is the DEFAULT_SCHEMA_CLASS, so drf-spectacular imports it (registering the
+extension) whenever it needs the schema class, rather than the docs app importing
+drf-spectacular's internals while Django sets up.
+"""
+
+from drf_spectacular.extensions import OpenApiSerializerExtension
+from drf_spectacular.openapi import AutoSchema
+from drf_spectacular.plumbing import ResolvedComponent
+from pydantic.json_schema import model_json_schema
+
+__all__ = ["AutoSchema", "PydanticExtension"]
+
+
+class PydanticExtension(OpenApiSerializerExtension):
+    """DRF pydantic extension, so that it can use the pydantic models' schemas."""
+
+    target_class = "pydantic.BaseModel"
+    match_subclasses = True
+    # Over drf-spectacular's own pydantic extension, which it loads first.
+    priority = 1
+
+    def get_name(self, auto_schema, direction):
+        return self.target.__name__
+
+    def map_serializer(self, auto_schema, direction):
+        # let pydantic generate a JSON schema
+        schema = model_json_schema(
+            self.target, ref_template="#/components/schemas/{model}"
+        )
+
+        # pull out potential sub-schemas and put them into component section
+        for sub_name, sub_schema in schema.pop("$defs", {}).items():
+            component = ResolvedComponent(
+                name=sub_name,
+                type=ResolvedComponent.SCHEMA,
+                object=sub_name,
+                schema=sub_schema,
+            )
+            auto_schema.registry.register_on_missing(component)
+
+        return schema
@@ -1,8 +1,43 @@
+import functools
+from collections.abc import Callable
+from typing import Any
+
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
 from django.urls import path
-from drf_spectacular.views import SpectacularAPIView
-from drf_spectacular.views import SpectacularSwaggerSplitView
+from django.views.decorators.csrf import csrf_exempt
+
+View = Callable[..., HttpResponseBase]
+
+
+def _lazy_view(load: Callable[[], View]) -> View:
+    """
+    A view which only imports the real one (and drf-spectacular) on its first request.
+    """
+    load = functools.cache(load)
+
+    @csrf_exempt
+    def view(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        return load()(request, *args, **kwargs)
+
+    return view
+
+
+@_lazy_view
+def docs() -> View:
+    from drf_spectacular.views import SpectacularSwaggerSplitView
+
+    return SpectacularSwaggerSplitView.as_view(url_name="schema")
+
+
+@_lazy_view
+def schema() -> View:
+    from drf_spectacular.views import SpectacularAPIView
+
+    return SpectacularAPIView.as_view()
+
 
 urlpatterns = [
-    path("", SpectacularSwaggerSplitView.as_view(url_name="schema"), name="docs"),
-    path("schema", SpectacularAPIView.as_view(), name="schema"),
+    path("", docs, name="docs"),
+    path("schema", schema, name="schema"),
 ]
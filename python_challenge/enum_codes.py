@@ -0,0 +1,168 @@
+"""
+Stable integer codes for the members of every StrEnum of ``python_challenge.types``.
+
+A code stands for a member wherever the member's string would be repeated, e.g. in
+snapshots, and lets columns of members be grouped and looked up as integer arrays.
+
+The codes are global, unique across all the enums, and kept in ``enum_codes.json``
+beside this module, so they don't change with the order the enums are imported in, nor
+between releases: new members are appended with new codes, and the codes of removed
+members are never given to another. Members not in the table yet get the codes the
+``update_enum_codes`` command would give them, and a warning to run it.
+"""
+
+import functools
+import importlib
+import json
+import pkgutil
+from collections.abc import Iterable
+from collections.abc import Mapping
+from pathlib import Path
+
+import numpy as np
+import numpy.typing as npt
+import structlog
+
+from . import types
+from .types.basic import StrEnum
+
+logger = structlog.get_logger(__name__)
+
+TABLE_PATH = Path(__file__).with_name("enum_codes.json")
+NONE = 0
+"""Code of no member, e.g. a missing value. Members' codes start at 1."""
+
+Table = dict[str, dict[str, int]]
+"""Codes of the members of each enum by the enum's ``module.qualname``, by name."""
+CodeArray = npt.NDArray[np.uint16]
+
+
+def enum_name(cls: type[StrEnum]) -> str:
+    # Qualified by module, as some enums share their name, e.g. WindowGlazingType.
+    return f"{cls.__module__}.{cls.__qualname__}"
+
+
+def _subclasses(cls: type[StrEnum]) -> Iterable[type[StrEnum]]:
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _subclasses(subclass)
+
+
+def str_enums() -> list[type[StrEnum]]:
+    """Every StrEnum with members in ``python_challenge.types``, by name."""
+    for module in pkgutil.walk_packages(types.__path__, f"{types.__name__}."):
+        importlib.import_module(module.name)
+    enums = {
+        enum_name(cls): cls
+        for cls in _subclasses(StrEnum)
+        if cls.__module__.startswith(f"{types.__name__}.") and len(cls)
+    }
+    return [enums[name] for name in sorted(enums)]
+
+
+def read_table() -> Table:
+    return json.loads(TABLE_PATH.read_text())
+
+
+def write_table(table: Table) -> None:
+    TABLE_PATH.write_text(json.dumps(table, indent=2) + "\n")
+
+
+def assign_codes(table: Table, enums: Iterable[type[StrEnum]]) -> Table:
+    """
+    The table with the members of the enums it lacks, given the next codes in the
+    order of the enums and of their members. Removed members keep their codes.
+    """
+    assigned = {name: dict(codes) for name, codes in table.items()}
+    last = max((code for codes in table.values() for code in codes.values()), default=0)
+    for cls in enums:
+        codes = assigned.setdefault(enum_name(cls), {})
+        for member in cls:
+            if member.name not in codes:
+                last += 1
+                codes[member.name] = last
+    return assigned
+
+
+class EnumCodes:
+    """
+    Two-way lookup between the members of the enums and their codes, in O(1).
+
+    Members are looked up by enum first: members of different enums may be equal, as
+    strings, and have the same hash, as names.
+    """
+
+    def __init__(self, table: Table, enums: Iterable[type[StrEnum]]) -> None:
+        enums = list(enums)
+        table = assign_codes(table, enums)
+        self._codes: dict[type[StrEnum], dict[StrEnum, int]] = {}
+        self._value_codes: dict[type[StrEnum], dict[str, int]] = {}
+        members: list[StrEnum | None] = [None] * (
+            max(
+                (code for codes in table.values() for code in codes.values()), default=0
+            )
+            + 1
+        )
+        for cls in enums:
+            codes = table[enum_name(cls)]
+            self._codes[cls] = {member: codes[member.name] for member in cls}
+            self._value_codes[cls] = {
+                member.value: code for member, code in self._codes[cls].items()
+            }
+            for member, code in self._codes[cls].items():
+                members[code] = member
+        self.members = tuple(members)
+        """Member of each code, None for NONE and the codes of removed members."""
+
+    def __len__(self) -> int:
+        """One more than the highest code, e.g. the length of a table by code."""
+        return len(self.members)
+
+    def __contains__(self, cls: object) -> bool:
+        """Whether the members of an enum have codes."""
+        return cls in self._codes
+
+    def code(self, member: StrEnum) -> int:
+        return self._codes[type(member)][member]
+
+    def member(self, code: int) -> StrEnum:
+        if (member := self.members[code]) is None:
+            raise KeyError(code)
+        return member
+
+    def codes(self, cls: type[StrEnum]) -> Mapping[StrEnum, int]:
+        """The codes of the members of an enum."""
+        return self._codes[cls]
+
+    def value_codes(self, cls: type[StrEnum]) -> Mapping[str, int]:
+        """
+        The codes of the members of an enum by their values, e.g. to check the keys of
+        a dict of JSON without creating the members.
+        """
+        return self._value_codes[cls]
+
+    def encode(self, members: Iterable[StrEnum | None]) -> CodeArray:
+        """The codes of members of any enums, NONE for None, as an array."""
+        return np.fromiter(
+            (NONE if member is None else self.code(member) for member in members),
+            dtype=np.uint16,
+        )
+
+    def decode(self, codes: Iterable[int]) -> list[StrEnum | None]:
+        """The members of codes, None for NONE."""
+        return [self.members[code] for code in codes]
+
+
+@functools.cache
+def enum_codes() -> EnumCodes:
+    """The codes of the members of every StrEnum, from the table."""
+    enums = str_enums()
+    table = read_table()
+    if missing := [
+        f"{enum_name(cls)}.{member.name}"
+        for cls in enums
+        for member in cls
+        if member.name not in table.get(enum_name(cls), {})
+    ]:
+        logger.warning("enum_codes_missing", members=missing[:10], count=len(missing))
+    return EnumCodes(table, enums)
@@ -0,0 +1,90 @@
+"""
+Bulk export of stored documents as NDJSON (newline delimited JSON).
+
+Documents are read, validated and serialized one at a time, so memory use stays flat
+regardless of how many are exported, and consumers can start on the first line while
+the rest are still being produced.
+"""
+
+from collections.abc import AsyncIterator
+from collections.abc import Callable
+from collections.abc import Iterator
+
+import pydantic
+import structlog
+from asgiref.sync import sync_to_async
+
+from .serialization import dump_json
+from .utils import DocumentKind
+from .utils import get_home
+from .utils import get_results
+from .utils import list_simulation_ids
+from .utils import list_uprns
+
+NDJSON_CONTENT_TYPE = "application/x-ndjson"
+
+logger = structlog.get_logger(__name__)
+
+
+def _iter_keys(
+    list_keys: Callable[[str | None, int], list[str]], batch_size: int = 1000
+) -> Iterator[str]:
+    after = None
+    while True:
+        keys = list_keys(after, batch_size)
+        yield from keys
+        if len(keys) < batch_size:
+            return
+        after = keys[-1]
+
+
+def _iter_ndjson(
+    keys: Iterator[str], get: Callable[[str], pydantic.BaseModel]
+) -> Iterator[bytes]:
+    for key in keys:
+        try:
+            document = get(key)
+        except FileNotFoundError:
+            # Deleted since the keys were listed.
+            continue
+        except pydantic.ValidationError as error:
+            # The response has already started, so it can't fail with an error status.
+            logger.warning("document_not_exported", key=key, error=str(error))
+            continue
+        yield dump_json(document).encode() + b"\n"
+
+
+def iter_homes_ndjson() -> Iterator[bytes]:
+    """
+    All the stored Homes, one JSON document per line, ordered by UPRN as text.
+    """
+    return _iter_ndjson(_iter_keys(list_uprns), lambda uprn: get_home(uprn=uprn))
+
+
+def iter_results_ndjson() -> Iterator[bytes]:
+    """
+    All the stored retrofit plan results, one JSON document per line, ordered by
+    simulation UUID.
+    """
+    return _iter_ndjson(
+        _iter_keys(list_simulation_ids, batch_size=100),
+        lambda uuid: get_results(uuid=uuid),
+    )
+
+
+def iter_ndjson(kind: DocumentKind) -> Iterator[bytes]:
+    if kind == "homes":
+        return iter_homes_ndjson()
+    return iter_results_ndjson()
+
+
+async def aiter_lines(lines: Iterator[bytes]) -> AsyncIterator[bytes]:
+    """
+    Produce the lines in a worker thread, one at a time.
+
+    Django buffers the whole of a synchronous streaming response in memory when serving
+    it over ASGI, so this is needed to keep streaming there.
+    """
+    next_line = sync_to_async(next)
+    while (line := await next_line(lines, None)) is not None:
+        yield line
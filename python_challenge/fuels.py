@@ -0,0 +1,120 @@
+"""
+Fuel classes of energy sources: electric, gas, oil, solid or other.
+
+``EnergySource.is_gas``, ``is_oil`` and ``is_solid`` build a tuple and compare the
+source with each of its members on every call. The class of every member of both
+EnergySource enums (those of the profiles and of the heating systems) is computed once
+here instead, with the same result, and as a table by enum code (see enum_codes), so
+columns of sources are classified, and the consumption of many profiles summed by fuel
+class, in a few vectorized operations.
+"""
+
+import functools
+from collections.abc import Iterable
+from typing import Literal
+
+import numpy as np
+import numpy.typing as npt
+
+from .enum_codes import CodeArray
+from .enum_codes import enum_codes
+from .summaries import Figure
+from .types import enums
+from .types import simulation_enums
+from .types.home import EnergyProfile
+
+FuelClass = Literal["electric", "gas", "oil", "solid", "other"]
+
+FUEL_CLASSES: tuple[FuelClass, ...] = ("electric", "gas", "oil", "solid", "other")
+"""The fuel classes, in the order of their indexes in arrays."""
+NOT_A_SOURCE = -1
+"""Index of the fuel class of a code which isn't an EnergySource's."""
+
+EnergySource = enums.EnergySource | simulation_enums.EnergySource
+ENERGY_SOURCES = (enums.EnergySource, simulation_enums.EnergySource)
+
+FloatArray = npt.NDArray[np.float64]
+ClassArray = npt.NDArray[np.int8]
+
+
+def _classify(source: EnergySource) -> FuelClass:
+    if source.is_gas:
+        return "gas"
+    if source.is_oil:
+        return "oil"
+    if source.is_solid:
+        return "solid"
+    if source.name == "ELECTRIC":
+        return "electric"
+    return "other"
+
+
+# Members of both enums, which are equal (and hash alike) when their values are.
+_FUEL_CLASS: dict[EnergySource, FuelClass] = {
+    source: _classify(source) for cls in ENERGY_SOURCES for source in cls
+}
+
+GAS = frozenset(source for source, fuel in _FUEL_CLASS.items() if fuel == "gas")
+OIL = frozenset(source for source, fuel in _FUEL_CLASS.items() if fuel == "oil")
+SOLID = frozenset(source for source, fuel in _FUEL_CLASS.items() if fuel == "solid")
+
+
+def fuel_class(source: EnergySource) -> FuelClass:
+    return _FUEL_CLASS[source]
+
+
+@functools.cache
+def fuel_class_table() -> ClassArray:
+    """Index in FUEL_CLASSES of the fuel class of each enum code."""
+    registry = enum_codes()
+    table = np.full(len(registry), NOT_A_SOURCE, dtype=np.int8)
+    for cls in ENERGY_SOURCES:
+        for source in cls:
+            table[registry.code(source)] = FUEL_CLASSES.index(_FUEL_CLASS[source])
+    return table
+
+
+def classify(codes: CodeArray) -> ClassArray:
+    """
+    The indexes in FUEL_CLASSES of the fuel classes of an array of enum codes of energy
+    sources, NOT_A_SOURCE for the codes of anything else.
+    """
+    return fuel_class_table()[codes]
+
+
+def fuel_class_totals(
+    profiles: Iterable[EnergyProfile],
+    figure: Figure = "energy",
+    monthly: bool = False,
+) -> FloatArray:
+    """
+    A figure of the ``annual_energy_sources`` of each profile summed by fuel class, by
+    profile then by index in FUEL_CLASSES, or of the ``monthly_energy_sources``, by
+    profile, month (January at 0) then fuel class.
+    """
+    registry = enum_codes()
+    rows: list[int] = []
+    months: list[int] = []
+    sources: list[int] = []
+    values: list[float] = []
+    count = 0
+    for row, profile in enumerate(profiles):
+        count += 1
+        if monthly:
+            by_month = profile.monthly_energy_sources.items()
+        else:
+            by_month = [(1, profile.annual_energy_sources)]
+        for month, summaries in by_month:
+            for source, summary in summaries.items():
+                rows.append(row)
+                months.append(month - 1)
+                sources.append(registry.code(source))
+                values.append(getattr(summary, figure))
+    classes = classify(np.array(sources, dtype=np.uint16))
+    totals = np.zeros((count, 12 if monthly else 1, len(FUEL_CLASSES)))
+    np.add.at(
+        totals,
+        (np.array(rows, dtype=np.intp), np.array(months, dtype=np.intp), classes),
+        values,
+    )
+    return totals if monthly else totals[:, 0]
@@ -0,0 +1,251 @@
+"""
+In-memory spatial index of Home locations.
+
+Locations are bucketed into a regular grid of longitude/latitude cells, so radius and
+bounding-box queries only visit the few cells which overlap the search area instead of
+scanning every Home.
+"""
+
+import functools
+import math
+import threading
+from array import array
+from typing import Any
+from typing import NamedTuple
+
+import pydantic
+import structlog
+from django.dispatch import receiver
+
+from .types.home import Home
+from .utils import get_home
+from .utils import home_saved
+from .utils import iter_uprns
+
+logger = structlog.get_logger(__name__)
+
+EARTH_RADIUS = 6_371_008.8
+"""Mean radius of the Earth (metres)."""
+
+METRES_PER_DEGREE = math.pi * EARTH_RADIUS / 180
+"""Length of one degree of latitude (metres)."""
+
+
+class BoundingBox(NamedTuple):
+    min_longitude: float
+    min_latitude: float
+    max_longitude: float
+    max_latitude: float
+
+
+class IndexedLocation(NamedTuple):
+    key: str
+    longitude: float
+    latitude: float
+    distance: float | None = None
+    """Distance from the search point (metres), for radius queries."""
+
+
+def haversine(
+    longitude_1: float, latitude_1: float, longitude_2: float, latitude_2: float
+) -> float:
+    """
+    Great-circle distance between two points (metres).
+    """
+    phi_1 = math.radians(latitude_1)
+    phi_2 = math.radians(latitude_2)
+    d_phi = phi_2 - phi_1
+    d_lambda = math.radians(longitude_2 - longitude_1)
+    a = (
+        math.sin(d_phi / 2) ** 2
+        + math.cos(phi_1) * math.cos(phi_2) * math.sin(d_lambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS * math.asin(min(1.0, math.sqrt(a)))
+
+
+def radius_bounding_box(
+    longitude: float, latitude: float, radius: float
+) -> BoundingBox:
+    """
+    Smallest longitude/latitude box containing the circle around a point.
+
+    Does not wrap around the antimeridian, the box is clamped to valid coordinates.
+    """
+    d_latitude = radius / METRES_PER_DEGREE
+    cos_latitude = math.cos(math.radians(latitude))
+    if cos_latitude * METRES_PER_DEGREE * 180 <= radius:
+        d_longitude = 360.0
+    else:
+        d_longitude = radius / (METRES_PER_DEGREE * cos_latitude)
+    return BoundingBox(
+        min_longitude=max(-180.0, longitude - d_longitude),
+        min_latitude=max(-90.0, latitude - d_latitude),
+        max_longitude=min(180.0, longitude + d_longitude),
+        max_latitude=min(90.0, latitude + d_latitude),
+    )
+
+
+class _Cell:
+    """
+    Locations within one grid cell, stored as parallel arrays to keep memory compact.
+    """
+
+    __slots__ = ("index", "keys", "longitudes", "latitudes")
+
+    def __init__(self, index: tuple[int, int]) -> None:
+        self.index = index
+        self.keys: list[str] = []
+        self.longitudes = array("d")
+        self.latitudes = array("d")
+
+    def append(self, key: str, longitude: float, latitude: float) -> None:
+        self.keys.append(key)
+        self.longitudes.append(longitude)
+        self.latitudes.append(latitude)
+
+    def remove(self, key: str) -> None:
+        index = self.keys.index(key)
+        del self.keys[index]
+        del self.longitudes[index]
+        del self.latitudes[index]
+
+
+class GridIndex:
+    """
+    Spatial index of keyed points, bucketed into a grid of ``cell_size`` degrees.
+
+    The default cell size (0.01°) is roughly 1.1km of latitude, and 0.6km of longitude
+    at UK latitudes, which suits neighbourhood-scale (hundreds of metres) queries.
+    Inserting an existing key moves it to the new location.
+    """
+
+    def __init__(self, cell_size: float = 0.01) -> None:
+        if cell_size <= 0:
+            raise ValueError(f"cell_size must be greater than zero, got: {cell_size}")
+        self.cell_size = cell_size
+        self._cells: dict[tuple[int, int], _Cell] = {}
+        # Cell of each key, for moving or removing it without storing its location twice.
+        self._key_cells: dict[str, _Cell] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._key_cells)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._key_cells
+
+    def _cell_index(self, longitude: float, latitude: float) -> tuple[int, int]:
+        return (
+            math.floor(longitude / self.cell_size),
+            math.floor(latitude / self.cell_size),
+        )
+
+    def insert(self, key: str, longitude: float, latitude: float) -> None:
+        if not (-180 <= longitude <= 180 and -90 <= latitude <= 90):
+            raise ValueError(f"Invalid coordinates: ({longitude}, {latitude})")
+        with self._lock:
+            if key in self._key_cells:
+                self._remove(key)
+            cell_index = self._cell_index(longitude, latitude)
+            cell = self._cells.get(cell_index)
+            if cell is None:
+                cell = self._cells[cell_index] = _Cell(cell_index)
+            cell.append(key, longitude, latitude)
+            self._key_cells[key] = cell
+
+    def remove(self, key: str) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def _remove(self, key: str) -> None:
+        cell = self._key_cells.pop(key)
+        cell.remove(key)
+        if not cell.keys:
+            del self._cells[cell.index]
+
+    def _cells_overlapping(self, bbox: BoundingBox) -> list[_Cell]:
+        min_x, min_y = self._cell_index(bbox.min_longitude, bbox.min_latitude)
+        max_x, max_y = self._cell_index(bbox.max_longitude, bbox.max_latitude)
+        if (max_x - min_x + 1) * (max_y - min_y + 1) > len(self._cells):
+            # Large areas, cheaper to check the occupied cells than every possible one.
+            return [
+                cell
+                for (x, y), cell in self._cells.items()
+                if min_x <= x <= max_x and min_y <= y <= max_y
+            ]
+        cells = []
+        for x in range(min_x, max_x + 1):
+            for y in range(min_y, max_y + 1):
+                cell = self._cells.get((x, y))
+                if cell is not None:
+                    cells.append(cell)
+        return cells
+
+    def within_bbox(self, bbox: BoundingBox) -> list[IndexedLocation]:
+        """
+        All the locations inside the bounding box (inclusive), in no particular order.
+        """
+        min_lon, min_lat, max_lon, max_lat = bbox
+        found = []
+        with self._lock:
+            for cell in self._cells_overlapping(bbox):
+                for key, longitude, latitude in zip(
+                    cell.keys, cell.longitudes, cell.latitudes
+                ):
+                    if (
+                        min_lon <= longitude <= max_lon
+                        and min_lat <= latitude <= max_lat
+                    ):
+                        found.append(IndexedLocation(key, longitude, latitude))
+        return found
+
+    def within_radius(
+        self, longitude: float, latitude: float, radius: float
+    ) -> list[IndexedLocation]:
+        """
+        All the locations within ``radius`` metres of the point, nearest first.
+        """
+        found = []
+        for location in self.within_bbox(
+            radius_bounding_box(longitude, latitude, radius)
+        ):
+            distance = haversine(
+                longitude, latitude, location.longitude, location.latitude
+            )
+            if distance <= radius:
+                found.append(location._replace(distance=distance))
+        found.sort(key=lambda location: location.distance or 0.0)
+        return found
+
+
+@functools.cache
+def get_home_index() -> GridIndex:
+    """
+    The shared index of stored Homes by UPRN, built on first use.
+
+    Homes which can't be loaded are left out, so one bad document doesn't fail (and
+    repeat) the build on every query.
+    """
+    index = GridIndex()
+    for uprn in iter_uprns():
+        try:
+            home = get_home(uprn=uprn)
+        except (FileNotFoundError, pydantic.ValidationError) as error:
+            logger.warning("home_not_indexed", uprn=uprn, error=str(error))
+            continue
+        _insert_home(index, home)
+    return index
+
+
+def _insert_home(index: GridIndex, home: Home) -> None:
+    if home.uprn:
+        coordinates = home.location.coordinates
+        index.insert(home.uprn, coordinates.longitude, coordinates.latitude)
+
+
+@receiver(home_saved)
+def _index_saved_home(sender: Any, home: Home, **kwargs: Any) -> None:
+    # Only keep the index up to date once it exists, otherwise it will be built with
+    # this Home included when it is first needed.
+    if get_home_index.cache_info().currsize:
+        _insert_home(get_home_index(), home)
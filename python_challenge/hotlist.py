@@ -0,0 +1,127 @@
+"""
+Hot list of the most requested documents, to warm up new workers with (see warmup).
+
+Each process counts the requests of each document, and adds them to the hot list stored
+with the documents every minute or so, and when it exits. Scores decay with a half-life
+of a day, so the list follows what is requested lately.
+"""
+
+import fcntl
+import json
+import os
+import tempfile
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from typing import NamedTuple
+
+import structlog
+
+from . import utils
+from .utils import DocumentKind
+
+logger = structlog.get_logger(__name__)
+
+HALF_LIFE = 24 * 3600
+"""Seconds after which a request counts half as much."""
+FLUSH_INTERVAL = 60
+"""Seconds between adding the counts of a process to the stored hot list."""
+MAX_DOCUMENTS = 10_000
+"""Length of the stored hot list, dropping the documents with the lowest scores."""
+
+
+class HotDocument(NamedTuple):
+    kind: DocumentKind
+    key: str
+    score: float
+
+
+def _path() -> Path:
+    # Not a Home nor results, so not listed with them.
+    return utils.PATH_DATA / "hotlist.json"
+
+
+def _read(path: Path) -> tuple[float, list[HotDocument]]:
+    try:
+        stored = json.loads(path.read_text())
+        return stored["updated"], [HotDocument(*item) for item in stored["documents"]]
+    except FileNotFoundError:
+        return time.time(), []
+    except (ValueError, KeyError, TypeError):
+        logger.warning("hot_list_invalid", path=str(path))
+        return time.time(), []
+
+
+def read_hot_list() -> list[HotDocument]:
+    """The stored hot list, highest score first."""
+    return _read(_path())[1]
+
+
+def add_counts(counts: Counter[tuple[DocumentKind, str]], now: float) -> None:
+    """
+    Add the counts of requests to the scores of the stored hot list, decaying its
+    scores to ``now``.
+    """
+    path = _path()
+    # Serializes the processes adding to the hot list.
+    with open(path.with_suffix(".lock"), "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        updated, documents = _read(path)
+        decay = 0.5 ** (max(0.0, now - updated) / HALF_LIFE)
+        scores: Counter[tuple[DocumentKind, str]] = Counter(
+            {(kind, key): score * decay for kind, key, score in documents}
+        )
+        scores.update(counts)
+        stored = {
+            "updated": now,
+            "documents": [
+                [kind, key, score]
+                for (kind, key), score in scores.most_common(MAX_DOCUMENTS)
+            ],
+        }
+        fd, path_tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        with os.fdopen(fd, "w") as file:
+            json.dump(stored, file)
+        os.replace(path_tmp, path)
+
+
+class AccessCounter:
+    """
+    Counts the requests of each document in this process, until added to the stored
+    hot list.
+    """
+
+    def __init__(self, flush_interval: float = FLUSH_INTERVAL) -> None:
+        self.flush_interval = flush_interval
+        self._counts: Counter[tuple[DocumentKind, str]] = Counter()
+        self._flushed = time.monotonic()
+        self._lock = threading.Lock()
+
+    def record(self, kind: DocumentKind, key: str) -> None:
+        with self._lock:
+            self._counts[kind, key] += 1
+            due = time.monotonic() - self._flushed >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """Add the counts so far to the stored hot list."""
+        with self._lock:
+            counts, self._counts = self._counts, Counter()
+            self._flushed = time.monotonic()
+        if not counts:
+            return
+        try:
+            add_counts(counts, time.time())
+        except OSError as error:
+            # The counts are only a hint, not worth failing a request for.
+            logger.warning("hot_list_not_saved", error=str(error))
+
+
+access_counter = AccessCounter()
+
+
+def record_access(kind: DocumentKind, key: str) -> None:
+    """Count a request of the document, to warm up new workers with the most requested."""
+    access_counter.record(kind, key)
@@ -0,0 +1,86 @@
+"""
+Import-time profile of a worker's startup, from Python's ``-X importtime``.
+
+Workers are recycled after ``max_requests``, so every new worker imports Django, DRF,
+the pydantic types and everything else again before it can serve a request. The startup
+is profiled in a fresh interpreter, as the modules are already imported in this one.
+"""
+
+import os
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from collections.abc import Iterable
+from typing import NamedTuple
+
+STARTUP = """
+import django
+django.setup()
+from django.urls import get_resolver
+get_resolver().url_patterns
+"""
+"""What a worker does before it is ready: set up Django, and import the URLs (views)."""
+
+
+class ImportTime(NamedTuple):
+    module: str
+    self_us: int
+    """Time importing the module itself, excluding the modules it imports."""
+    cumulative_us: int
+    """Time importing the module, including the modules it imports first."""
+    depth: int
+    """Nesting in the tree of imports, 0 for a module imported by the code profiled."""
+
+
+class ImportProfile(NamedTuple):
+    imports: list[ImportTime]
+    """Every module imported, in the order their imports finished."""
+    elapsed: float
+    """Wall time of the whole run in seconds, including the interpreter's startup."""
+
+
+def parse_importtime(lines: Iterable[str]) -> list[ImportTime]:
+    """
+    Parse the output of ``-X importtime``, skipping its header and any other lines.
+    """
+    imports = []
+    for line in lines:
+        if not line.startswith("import time:"):
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|")
+        if not self_us.strip().isdigit():
+            continue
+        module = name.strip()
+        # One space after the separator, then two per level of nesting.
+        depth = (len(name.rstrip()) - len(module) - 1) // 2
+        imports.append(ImportTime(module, int(self_us), int(cumulative_us), depth))
+    return imports
+
+
+def profile_imports(code: str = STARTUP) -> ImportProfile:
+    """
+    Run the code in a new interpreter, with the same Django settings, and profile it.
+    """
+    env = os.environ.copy()
+    env.setdefault("DJANGO_SETTINGS_MODULE", "python_challenge.settings")
+    start = time.perf_counter()
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    elapsed = time.perf_counter() - start
+    return ImportProfile(parse_importtime(process.stderr.splitlines()), elapsed)
+
+
+def by_package(imports: Iterable[ImportTime]) -> list[tuple[str, int]]:
+    """
+    Total self time of the modules of each top-level package, slowest first.
+    """
+    totals: dict[str, int] = defaultdict(int)
+    for item in imports:
+        totals[item.module.partition(".")[0]] += item.self_us
+    return sorted(totals.items(), key=lambda total: total[1], reverse=True)
@@ -0,0 +1,120 @@
+"""
+Bulk ingestion of JSONL (one JSON document per line) files of Homes or results.
+
+Lines are validated in chunks across an executor (normally a process pool, validation
+is CPU bound), and the valid documents of each chunk are stored in one batch.
+Validated documents are sent back to this process already serialized to JSON, which is
+much cheaper than pickling the models.
+"""
+
+import itertools
+from collections import deque
+from collections.abc import Iterable
+from collections.abc import Iterator
+from concurrent.futures import Executor
+from concurrent.futures import Future
+from typing import NamedTuple
+
+import pydantic
+
+from .serialization import dump_json
+from .types.home import Home
+from .types.retrofit_planner import RetrofitPlannerResponsePublic
+from .utils import DocumentKind
+from .utils import save_documents_json
+
+Chunk = list[tuple[int, str]]
+"""Lines of the file, with their (1-based) line numbers."""
+
+
+class Rejected(NamedTuple):
+    line_number: int
+    error: str
+
+
+class ValidatedChunk(NamedTuple):
+    documents: list[tuple[str, str]]
+    """Pairs of key (UPRN or simulation UUID) and JSON."""
+    rejected: list[Rejected]
+
+
+class IngestReport(NamedTuple):
+    stored: int
+    """Number of distinct documents stored, the last line of any key being kept."""
+    rejected: list[Rejected]
+
+
+def _format_validation_error(error: pydantic.ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(loc) for loc in detail['loc']) or '<document>'}: {detail['msg']}"
+        for detail in error.errors(include_url=False)
+    )
+
+
+def _validate_line(kind: DocumentKind, line: str) -> tuple[str, str]:
+    if kind == "homes":
+        home = Home.model_validate_json(line)
+        if not home.uprn:
+            raise ValueError("Home must have a UPRN to be stored")
+        return home.uprn, home.model_dump_json()
+    results = RetrofitPlannerResponsePublic.model_validate_json(line)
+    return str(results.simulation_id), dump_json(results)
+
+
+def validate_chunk(kind: DocumentKind, chunk: Chunk) -> ValidatedChunk:
+    """
+    Validate the lines of a chunk. Runs in the executor's workers.
+    """
+    validated = ValidatedChunk(documents=[], rejected=[])
+    for line_number, line in chunk:
+        try:
+            validated.documents.append(_validate_line(kind, line))
+        except pydantic.ValidationError as error:
+            validated.rejected.append(
+                Rejected(line_number, _format_validation_error(error))
+            )
+        except ValueError as error:
+            validated.rejected.append(Rejected(line_number, str(error)))
+    return validated
+
+
+def iter_chunks(lines: Iterable[str], chunk_size: int) -> Iterator[Chunk]:
+    """
+    Non-blank lines, numbered, in chunks of up to ``chunk_size``.
+    """
+    numbered = ((number, line) for number, line in enumerate(lines, 1) if line.strip())
+    while chunk := list(itertools.islice(numbered, chunk_size)):
+        yield chunk
+
+
+def ingest_jsonl(
+    lines: Iterable[str],
+    kind: DocumentKind,
+    executor: Executor,
+    chunk_size: int = 100,
+    max_pending: int = 8,
+) -> IngestReport:
+    """
+    Validate and store all the documents in the lines of a JSONL file.
+
+    Only ``max_pending`` chunks are read ahead of the ones being stored, so memory use
+    does not depend on the size of the file, apart from the set of the stored keys.
+    """
+    stored: set[str] = set()
+    rejected: list[Rejected] = []
+    pending: deque[Future[ValidatedChunk]] = deque()
+
+    def store_next() -> None:
+        validated = pending.popleft().result()
+        if validated.documents:
+            save_documents_json(kind, validated.documents)
+        stored.update(key for key, _ in validated.documents)
+        rejected.extend(validated.rejected)
+
+    for chunk in iter_chunks(lines, chunk_size):
+        pending.append(executor.submit(validate_chunk, kind, chunk))
+        if len(pending) >= max_pending:
+            store_next()
+    while pending:
+        store_next()
+    return IngestReport(stored=len(stored), rejected=rejected)
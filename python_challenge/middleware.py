@@ -0,0 +1,142 @@
+"""Django middleware of the API."""
+
+import asyncio
+import functools
+from collections.abc import Awaitable
+from collections.abc import Callable
+from typing import Any
+
+import structlog
+from asgiref.sync import markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest
+from django.http import JsonResponse
+from django.http.response import HttpResponseBase
+from django.utils.module_loading import import_string
+
+logger = structlog.get_logger(__name__)
+
+
+def _discard(task: asyncio.Future[HttpResponseBase]) -> None:
+    # Retrieve the exception of a cancelled request, so asyncio doesn't log it.
+    if not task.cancelled():
+        task.exception()
+
+
+class TimeBudgetMiddleware:
+    """
+    Cancel requests taking longer than ``settings.REQUEST_TIME_BUDGET`` seconds, and
+    respond 503 instead, so a slow request can't hold its worker's connections.
+
+    Async only, as Django runs the sync middleware and views after it in a thread,
+    which can't be interrupted. An async view is cancelled, and a sync one runs to
+    completion in its thread but its response is discarded.
+    """
+
+    sync_capable = False
+    async_capable = True
+
+    def __init__(
+        self, get_response: Callable[[HttpRequest], Awaitable[HttpResponseBase]]
+    ) -> None:
+        if not settings.REQUEST_TIME_BUDGET:
+            raise MiddlewareNotUsed()
+        self.get_response = get_response
+        self.budget: float = settings.REQUEST_TIME_BUDGET
+        markcoroutinefunction(self)
+
+    async def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        response = asyncio.ensure_future(self.get_response(request))
+        try:
+            # Shielded, as cancelling a sync view waits for its thread to finish.
+            return await asyncio.wait_for(asyncio.shield(response), self.budget)
+        except TimeoutError:
+            response.cancel()
+            response.add_done_callback(_discard)
+            logger.warning("request_cancelled", path=request.path, budget=self.budget)
+            return JsonResponse(
+                {"detail": f"Request took longer than {self.budget:g}s."},
+                status=503,
+                headers={"Retry-After": str(round(self.budget))},
+            )
+
+
+class SkippedOnLeanPaths:
+    """
+    Wraps another middleware (``wrapped``), skipping it for requests to paths under
+    ``settings.LEAN_PATH_PREFIXES``: the stateless JSON API has no use for sessions,
+    messages, CSRF tokens, static files or the debug toolbar, while the docs keep them.
+
+    Its hooks (``process_view`` and so on) are skipped the same way.
+    """
+
+    wrapped: str
+    """Import path of the middleware."""
+
+    # Only set when the middleware has them, as Django checks for them.
+    process_view: Callable[..., HttpResponseBase | None]
+    process_exception: Callable[..., HttpResponseBase | None]
+    process_template_response: Callable[
+        [HttpRequest, HttpResponseBase], HttpResponseBase
+    ]
+
+    sync_capable = True
+    async_capable = False
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        self.get_response = get_response
+        self.prefixes = tuple(settings.LEAN_PATH_PREFIXES)
+        self.middleware = import_string(self.wrapped)(get_response)
+        for hook in ("process_view", "process_exception"):
+            if method := getattr(self.middleware, hook, None):
+                setattr(self, hook, self._hook(method))
+        if method := getattr(self.middleware, "process_template_response", None):
+            self.process_template_response = self._template_response_hook(method)
+
+    def is_lean(self, request: HttpRequest) -> bool:
+        return request.path_info.startswith(self.prefixes)
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        if self.is_lean(request):
+            return self.get_response(request)
+        return self.middleware(request)
+
+    def _hook(
+        self, method: Callable[..., HttpResponseBase | None]
+    ) -> Callable[..., HttpResponseBase | None]:
+        @functools.wraps(method)
+        def hook(request: HttpRequest, *args: Any) -> HttpResponseBase | None:
+            return None if self.is_lean(request) else method(request, *args)
+
+        return hook
+
+    def _template_response_hook(
+        self, method: Callable[[HttpRequest, HttpResponseBase], HttpResponseBase]
+    ) -> Callable[[HttpRequest, HttpResponseBase], HttpResponseBase]:
+        @functools.wraps(method)
+        def hook(request: HttpRequest, response: HttpResponseBase) -> HttpResponseBase:
+            return response if self.is_lean(request) else method(request, response)
+
+        return hook
+
+
+def _skipped_on_lean_paths(wrapped: str) -> type[SkippedOnLeanPaths]:
+    name = wrapped.rpartition(".")[2]
+    return type(name, (SkippedOnLeanPaths,), {"wrapped": wrapped})
+
+
+# Importable by MIDDLEWARE, imported (and named) after the middleware they wrap.
+WhiteNoiseMiddleware = _skipped_on_lean_paths(
+    "whitenoise.middleware.WhiteNoiseMiddleware"
+)
+DebugToolbarMiddleware = _skipped_on_lean_paths(
+    "debug_toolbar.middleware.DebugToolbarMiddleware"
+)
+SessionMiddleware = _skipped_on_lean_paths(
+    "django.contrib.sessions.middleware.SessionMiddleware"
+)
+CsrfViewMiddleware = _skipped_on_lean_paths("django.middleware.csrf.CsrfViewMiddleware")
+MessageMiddleware = _skipped_on_lean_paths(
+    "django.contrib.messages.middleware.MessageMiddleware"
+)
@@ -0,0 +1,139 @@
+"""
+Float views of the Decimal fields of the types, for bulk analytics.
+
+The types keep U-values, heat pump output powers and peaks as Decimals, which the API
+returns exactly, but which are slow to parse and to compute with. The views here copy
+them into float64 arrays, leaving the models untouched, so e.g. the heat loss of
+thousands of Homes is computed in a few vectorized operations. See peaks for the peaks.
+
+Precision: each Decimal becomes the nearest float64 (``float()`` rounds correctly),
+within a relative error of 2**-53, about 1e-16, in float's range. Values with at most
+15 significant digits, and those which were floats already (e.g.
+"1.7184332484519738"), convert back to an equal Decimal from their ``repr()``. Missing values (None) are NaN, and sums
+with them NaN too. The arithmetic afterwards is binary floating point: fine for
+physical quantities, but the results are not the exact decimal sums the Decimals
+would give.
+"""
+
+from collections.abc import Iterable
+from decimal import Decimal
+
+import numpy as np
+import numpy.typing as npt
+
+from .types.home import Home
+from .types.recommendations import Improvement
+from .types.simulation import HeatPumpProperties
+
+FloatArray = npt.NDArray[np.float64]
+
+
+def to_float(value: Decimal | None) -> float:
+    """The Decimal as the nearest float, NaN for None."""
+    return np.nan if value is None else float(value)
+
+
+def _output_power(home: Home) -> float:
+    outputs = [
+        system.source_properties.output_power
+        for system in home.main_heating_systems
+        if isinstance(system.source_properties, HeatPumpProperties)
+        and system.source_properties.output_power is not None
+    ]
+    return float(sum(outputs)) if outputs else np.nan
+
+
+class FabricTable:
+    """
+    The U-values (W/m2K) of the fabric of many Homes, and what else their heat loss
+    needs, as columns of floats. Row ``i`` is ``uprns[i]``, and unknown values are NaN.
+
+    ``door_u_value`` is the mean U-value of a Home's doors, and ``heat_pump_output``
+    the total heat output power (kW) of its main heat pumps.
+    """
+
+    COLUMNS = (
+        "wall_u_value",
+        "roof_u_value",
+        "floor_u_value",
+        "glazing_u_value",
+        "door_u_value",
+        "wall_area",
+        "roof_area",
+        "heat_pump_output",
+    )
+
+    def __init__(self, uprns: list[str | None], values: FloatArray) -> None:
+        self.uprns = uprns
+        self.values = values
+        """The COLUMNS of each Home, one row per Home."""
+
+    def __len__(self) -> int:
+        return len(self.uprns)
+
+    def __getitem__(self, column: str) -> FloatArray:
+        return self.values[:, self.COLUMNS.index(column)]
+
+    @classmethod
+    def from_homes(cls, homes: Iterable[Home]) -> "FabricTable":
+        uprns: list[str | None] = []
+        rows: list[tuple[float, ...]] = []
+        for home in homes:
+            uprns.append(home.uprn)
+            wall, roof, floor, glazing = home.wall, home.roof, home.floor, home.glazing
+            doors = [
+                to_float(door.average_thermal_transmittance)
+                for door in home.doors or []
+            ]
+            rows.append(
+                (
+                    to_float(wall and wall.average_thermal_transmittance),
+                    to_float(roof and roof.average_thermal_transmittance),
+                    to_float(floor and floor.average_thermal_transmittance),
+                    to_float(glazing and glazing.average_thermal_transmittance),
+                    sum(doors) / len(doors) if doors else np.nan,
+                    (
+                        np.nan
+                        if wall is None or wall.surface_area is None
+                        else wall.surface_area
+                    ),
+                    (
+                        np.nan
+                        if roof is None or roof.surface_area is None
+                        else roof.surface_area
+                    ),
+                    _output_power(home),
+                )
+            )
+        values = np.array(rows, dtype=np.float64).reshape(-1, len(cls.COLUMNS))
+        return cls(uprns, values)
+
+    def opaque_heat_loss(self) -> FloatArray:
+        """
+        Heat loss (W/K) through the walls and roof of each Home, the elements whose
+        areas the Homes have: the sum of U-value times area. A Home without a roof
+        (e.g. a flat below another) counts only its walls.
+        """
+        roof = self["roof_u_value"] * self["roof_area"]
+        return self["wall_u_value"] * self["wall_area"] + np.where(
+            np.isnan(self["roof_u_value"]) & np.isnan(self["roof_area"]), 0, roof
+        )
+
+
+def specification_u_values(improvements: Iterable[Improvement]) -> FloatArray:
+    """
+    The target U-values of the specifications of improvements, NaN for those without.
+    An improvement with several specifications has the U-value of the first with one.
+    """
+    values = []
+    for improvement in improvements:
+        specifications = improvement.specification
+        if not isinstance(specifications, list):
+            specifications = [specifications]
+        u_values = [
+            u_value
+            for specification in specifications
+            if (u_value := getattr(specification, "u_value", None)) is not None
+        ]
+        values.append(to_float(u_values[0]) if u_values else np.nan)
+    return np.array(values, dtype=np.float64)
@@ -0,0 +1,162 @@
+"""
+Peak demand of a portfolio of simulations, for grid planning: how the stages of the
+improvement plans (e.g. air-source heat pumps) change the peaks across many homes.
+
+The peaks of the EnergyProfiles are Decimals in dicts by energy source or end use. They
+are converted to floats once (see numeric for the precision), into an array by home,
+stage and key, so the distributions, totals and changes of the peaks of thousands of
+homes are a few vectorized operations.
+"""
+
+from collections.abc import Iterable
+from collections.abc import Sequence
+from typing import Literal
+
+import numpy as np
+import numpy.typing as npt
+
+from .numeric import to_float
+from .types.basic import StrEnum
+from .types.enums import DomesticEnergyEndUse
+from .types.enums import EnergySource
+from .types.home import EnergyProfile
+from .types.recommendations import T_ImprovementMeasure
+from .types.retrofit_planner import RetrofitPlannerResponsePublic
+
+PeakField = Literal[
+    "peak_daily_energy_sources",
+    "peak_daily_energy_end_use",
+    "peak_hourly_energy_sources",
+    "peak_hourly_energy_end_use",
+]
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+
+NOT_ADOPTED = -1
+"""Stage of a measure a home's plan doesn't have."""
+
+
+def diversity_factor(homes: int, asymptote: float) -> float:
+    """
+    Ratio of the peak of a number of homes together to the sum of their own peaks, as
+    the homes don't all peak at once: 1 for a single home, falling towards the
+    ``asymptote`` for many, e.g. the after diversity maximum demand of a kind of home
+    over its own peak.
+    """
+    if homes < 1 or not 0 < asymptote <= 1:
+        raise ValueError("Expected at least one home, and an asymptote in (0, 1]")
+    return asymptote + (1 - asymptote) / homes
+
+
+class PeakTable:
+    """
+    One kind of peak of the baseline and of each stage of the plans of a portfolio.
+
+    ``peaks[i, k, j]`` is the peak of simulation ``simulation_ids[i]``, for key
+    ``keys[j]`` (an energy source or end use), at stage ``k``: 0 for the baseline, and
+    ``k`` after the ``k``th stage of the plan. A home whose plan has fewer stages keeps
+    the peaks of its last stage, and a key missing from a profile has a peak of 0.
+    """
+
+    def __init__(
+        self,
+        simulation_ids: list[str],
+        keys: tuple[StrEnum, ...],
+        peaks: FloatArray,
+        measure_stages: dict[T_ImprovementMeasure, IntArray],
+    ) -> None:
+        self.simulation_ids = simulation_ids
+        self.keys = keys
+        self.peaks = peaks
+        self.measure_stages = measure_stages
+        """
+        The stage at which each home adopts each measure of the plans, NOT_ADOPTED if
+        its plan doesn't have it.
+        """
+
+    def __len__(self) -> int:
+        return len(self.simulation_ids)
+
+    @property
+    def stages(self) -> int:
+        """Number of stages, including the baseline."""
+        return self.peaks.shape[1]
+
+    @classmethod
+    def from_results(
+        cls,
+        portfolio: Iterable[RetrofitPlannerResponsePublic],
+        field: PeakField = "peak_hourly_energy_sources",
+    ) -> "PeakTable":
+        key_type = EnergySource if field.endswith("_sources") else DomesticEnergyEndUse
+        keys: tuple[StrEnum, ...] = tuple(key_type)
+        columns = {key: index for index, key in enumerate(keys)}
+        simulation_ids: list[str] = []
+        homes: list[list[list[float]]] = []
+        adoptions: dict[T_ImprovementMeasure, list[tuple[int, int]]] = {}
+
+        def row(profile: EnergyProfile) -> list[float]:
+            values = [0.0] * len(keys)
+            for key, peak in getattr(profile, field).items():
+                values[columns[key]] = to_float(peak)
+            return values
+
+        for home, results in enumerate(portfolio):
+            simulation_ids.append(str(results.simulation_id))
+            stages = [row(results.baseline_energy_profile)]
+            for stage, improvements in enumerate(results.improvement_plan, start=1):
+                stages.append(row(improvements.energy_profile))
+                for improvement in improvements.improvements:
+                    adopted = adoptions.setdefault(improvement.measure, [])
+                    # At its first stage, should a plan repeat a measure.
+                    if not adopted or adopted[-1][0] != home:
+                        adopted.append((home, stage))
+            homes.append(stages)
+
+        length = max(map(len, homes), default=1)
+        peaks = np.array(
+            [stages + stages[-1:] * (length - len(stages)) for stages in homes],
+            dtype=np.float64,
+        ).reshape(len(homes), length, len(keys))
+        measure_stages = {}
+        for measure, adopted in adoptions.items():
+            measure_stages[measure] = np.full(len(homes), NOT_ADOPTED, dtype=np.int64)
+            index, stage = np.array(adopted, dtype=np.int64).T
+            measure_stages[measure][index] = stage
+        return cls(simulation_ids, keys, peaks, measure_stages)
+
+    def column(self, key: StrEnum) -> FloatArray:
+        """The peaks of a key, by home then stage."""
+        return self.peaks[:, :, self.keys.index(key)]
+
+    def distribution(
+        self, key: StrEnum, stage: int = 0, percentiles: Sequence[float] = (50, 90, 99)
+    ) -> FloatArray:
+        """Percentiles of the homes' peaks of a key at a stage."""
+        return np.percentile(self.column(key)[:, stage], percentiles)
+
+    def stage_totals(self, key: StrEnum, asymptote: float = 1.0) -> FloatArray:
+        """
+        The peak of the whole portfolio at each stage, the sum of the homes' peaks
+        adjusted by the diversity_factor of the portfolio's size.
+        """
+        return self.column(key).sum(axis=0) * diversity_factor(len(self), asymptote)
+
+    def stage_deltas(self, key: StrEnum, asymptote: float = 1.0) -> FloatArray:
+        """Change in the peak of the portfolio made by each stage, after the baseline."""
+        return np.diff(self.stage_totals(key, asymptote))
+
+    def measure_deltas(self, measure: T_ImprovementMeasure, key: StrEnum) -> FloatArray:
+        """
+        Change in the peak of each home made by the stage adopting a measure, e.g. the
+        air-source heat pump, NaN for the homes whose plan doesn't have it.
+        """
+        deltas = np.full(len(self), np.nan)
+        stages = self.measure_stages.get(measure)
+        if stages is None:
+            return deltas
+        homes = np.flatnonzero(stages != NOT_ADOPTED)
+        column = self.column(key)
+        deltas[homes] = column[homes, stages[homes]] - column[homes, stages[homes] - 1]
+        return deltas
@@ -0,0 +1,137 @@
+"""
+Cost-effectiveness ranking of improvement options (IOE) across many results.
+
+The options are loaded once into columns of numpy arrays, so the metrics and rankings
+of millions of options are computed with a few vectorized operations, rather than a
+Python loop over the pydantic models.
+"""
+
+from collections.abc import Iterable
+from typing import Literal
+
+import numpy as np
+import numpy.typing as npt
+
+from .types.recommendations import ImprovementEnergyProfile
+from .types.retrofit_planner import RetrofitPlannerResponsePublic
+
+Metric = Literal["cost_per_kwh", "cost_per_co2e", "payback_years"]
+"""
+- ``cost_per_kwh``: capital cost (£) per kWh of energy saved each year.
+- ``cost_per_co2e``: capital cost (£) per kg CO2e saved each year.
+- ``payback_years``: capital cost over the operating cost saved each year.
+"""
+
+CostBound = Literal["low", "high"]
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+
+
+def _capital_cost(option: ImprovementEnergyProfile) -> tuple[float, float]:
+    low = high = 0.0
+    for improvement in option.improvements:
+        if improvement.capital_cost is None:
+            return np.nan, np.nan
+        low += improvement.capital_cost[0]
+        high += improvement.capital_cost[1]
+    return low, high
+
+
+class OptionTable:
+    """
+    The improvement options of a portfolio of results, as columns.
+
+    Row ``i`` is option ``option_index[i]`` of the results of
+    ``simulation_ids[simulation_index[i]]``. Savings are annual and positive for
+    reductions (the negated ``relative_energy_change``). The capital cost of an option
+    is the sum of the cost ranges of its improvements, and unknown (NaN) if any of
+    them has no cost.
+    """
+
+    def __init__(
+        self,
+        simulation_ids: list[str],
+        simulation_index: IntArray,
+        option_index: IntArray,
+        cost_low: FloatArray,
+        cost_high: FloatArray,
+        energy_saved: FloatArray,
+        co2e_saved: FloatArray,
+        operating_cost_saved: FloatArray,
+    ) -> None:
+        self.simulation_ids = simulation_ids
+        self.simulation_index = simulation_index
+        self.option_index = option_index
+        self.cost_low = cost_low
+        self.cost_high = cost_high
+        self.energy_saved = energy_saved
+        self.co2e_saved = co2e_saved
+        self.operating_cost_saved = operating_cost_saved
+
+    def __len__(self) -> int:
+        return len(self.option_index)
+
+    @classmethod
+    def from_results(
+        cls, portfolio: Iterable[RetrofitPlannerResponsePublic]
+    ) -> "OptionTable":
+        simulation_ids: list[str] = []
+        simulation_index: list[int] = []
+        option_index: list[int] = []
+        costs: list[tuple[float, float]] = []
+        savings: list[tuple[float, float, float]] = []
+        for results in portfolio:
+            for index, option in enumerate(results.improvement_option_evaluation):
+                simulation_index.append(len(simulation_ids))
+                option_index.append(index)
+                costs.append(_capital_cost(option))
+                change = option.relative_energy_change.annual_energy_total
+                savings.append((change.energy, change.co2e, change.operating_cost))
+            simulation_ids.append(str(results.simulation_id))
+
+        cost_array = np.array(costs, dtype=np.float64).reshape(-1, 2)
+        savings_array = -np.array(savings, dtype=np.float64).reshape(-1, 3)
+        return cls(
+            simulation_ids=simulation_ids,
+            simulation_index=np.array(simulation_index, dtype=np.int64),
+            option_index=np.array(option_index, dtype=np.int64),
+            cost_low=cost_array[:, 0],
+            cost_high=cost_array[:, 1],
+            energy_saved=savings_array[:, 0],
+            co2e_saved=savings_array[:, 1],
+            operating_cost_saved=savings_array[:, 2],
+        )
+
+    def metric(self, metric: Metric, bound: CostBound = "low") -> FloatArray:
+        """
+        The metric for every option, lower is better.
+
+        NaN where it is not meaningful: the cost is unknown or nothing is saved.
+        """
+        cost = self.cost_low if bound == "low" else self.cost_high
+        saved = {
+            "cost_per_kwh": self.energy_saved,
+            "cost_per_co2e": self.co2e_saved,
+            "payback_years": self.operating_cost_saved,
+        }[metric]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            values = cost / saved
+        values[~(saved > 0)] = np.nan
+        return values
+
+    def rank(
+        self, metric: Metric, bound: CostBound = "low", limit: int | None = None
+    ) -> IntArray:
+        """
+        Rows of the options, most cost-effective first, and those without a value last.
+
+        With a ``limit``, only the best ``limit`` rows are selected and sorted, which
+        is much faster than sorting every option.
+        """
+        values = self.metric(metric, bound)
+        if limit is not None and limit < len(values):
+            # NaNs sort after any number, in partitions too.
+            best = np.argpartition(values, limit)[:limit]
+            return best[np.argsort(values[best], kind="stable")]
+        return np.argsort(values, kind="stable")
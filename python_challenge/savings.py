@@ -0,0 +1,146 @@
+"""
+Cumulative energy changes over the stages of an improvement plan.
+
+Each stage's ``relative_energy_change`` is relative to the previous stage, so the
+change from the baseline after stage k is the sum of the first k+1 stages. Prefix sums
+of every energy, carbon and cost figure are computed once per plan, after which the
+change over any range of stages is one subtraction per figure, however many stages
+there are.
+"""
+
+import functools
+from array import array
+from collections.abc import Sequence
+
+import pydantic
+
+from .summaries import FIGURES
+from .summaries import SummarySlot
+from .summaries import iter_summaries
+from .summaries import summary_fields
+from .types.basic import MonthNumber
+from .types.enums import DomesticEnergyEndUse
+from .types.enums import EnergySource
+from .types.home import EnergyConsumptionSummary
+from .types.home import EnergyProfile
+from .types.retrofit_planner import RetrofitPlannerResponsePublic
+from .utils import get_results
+from .utils import get_results_version
+
+
+class CumulativeEnergyChange(pydantic.BaseModel):
+    """
+    The consumption figures of an EnergyProfile, summed over a range of plan stages.
+
+    Values are relative, and negative for reductions, like ``relative_energy_change``.
+    """
+
+    annual_energy_total: EnergyConsumptionSummary
+    annual_energy_sources: dict[EnergySource, EnergyConsumptionSummary]
+    annual_energy_end_use: dict[DomesticEnergyEndUse, EnergyConsumptionSummary]
+    monthly_energy_total: dict[MonthNumber, EnergyConsumptionSummary]
+    monthly_energy_sources: dict[
+        MonthNumber, dict[EnergySource, EnergyConsumptionSummary]
+    ]
+    monthly_energy_end_use: dict[
+        MonthNumber, dict[DomesticEnergyEndUse, EnergyConsumptionSummary]
+    ]
+
+
+class PlanPrefixSums:
+    """
+    Prefix sums of the consumption figures of a sequence of relative EnergyProfiles.
+
+    A source or end use missing from some stages counts as no change for those stages.
+    """
+
+    def __init__(self, changes: Sequence[EnergyProfile]) -> None:
+        self._slots: dict[SummarySlot, int] = {}
+        stages = []
+        for profile in changes:
+            stage = []
+            for slot, summary in iter_summaries(profile):
+                index = self._slots.setdefault(slot, len(self._slots))
+                stage.append((index * len(FIGURES), summary))
+            stages.append(stage)
+
+        # Row k holds the sums over the first k stages, row 0 is all zeros.
+        self._sums = [array("d", bytes(8 * len(self._slots) * len(FIGURES)))]
+        for stage in stages:
+            sums = array("d", self._sums[-1])
+            for offset, summary in stage:
+                sums[offset] += summary.energy
+                sums[offset + 1] += summary.co2e
+                sums[offset + 2] += summary.operating_cost
+            self._sums.append(sums)
+
+    @classmethod
+    def from_plan(cls, results: RetrofitPlannerResponsePublic) -> "PlanPrefixSums":
+        return cls([stage.relative_energy_change for stage in results.improvement_plan])
+
+    def __len__(self) -> int:
+        return len(self._sums) - 1
+
+    def _check_range(self, start: int, stop: int) -> None:
+        if not 0 <= start <= stop <= len(self):
+            raise ValueError(f"Invalid range of stages: {start} to {stop}")
+
+    def summary(
+        self,
+        start: int,
+        stop: int,
+        field: str,
+        month: MonthNumber | None = None,
+        key: EnergySource | DomesticEnergyEndUse | None = None,
+    ) -> EnergyConsumptionSummary:
+        """
+        Sum of one summary (e.g. ``annual_energy_total``) over stages [start, stop).
+        """
+        self._check_range(start, stop)
+        index = self._slots.get(SummarySlot(field, month, key))
+        if index is None:
+            return EnergyConsumptionSummary(energy=0, co2e=0, operating_cost=0)
+        return self._summary(start, stop, index * len(FIGURES))
+
+    def _summary(self, start: int, stop: int, offset: int) -> EnergyConsumptionSummary:
+        first, last = self._sums[start], self._sums[stop]
+        return EnergyConsumptionSummary(
+            energy=last[offset] - first[offset],
+            co2e=last[offset + 1] - first[offset + 1],
+            operating_cost=last[offset + 2] - first[offset + 2],
+        )
+
+    def change(self, start: int, stop: int) -> CumulativeEnergyChange:
+        """
+        Sum of all the consumption figures over stages [start, stop).
+        """
+        self._check_range(start, stop)
+        return CumulativeEnergyChange(
+            **summary_fields(
+                (slot, self._summary(start, stop, index * len(FIGURES)))
+                for slot, index in self._slots.items()
+            )
+        )
+
+    def cumulative(self) -> list[CumulativeEnergyChange]:
+        """
+        Change from the baseline after each stage, i.e. if the plan stopped there.
+        """
+        return [self.change(0, stop) for stop in range(1, len(self) + 1)]
+
+
+@functools.lru_cache(maxsize=1024)
+def _get_cumulative_energy_change(
+    uuid: str, version: tuple[int, int]
+) -> list[CumulativeEnergyChange]:
+    return PlanPrefixSums.from_plan(get_results(uuid=uuid)).cumulative()
+
+
+def get_cumulative_energy_change(uuid: str) -> list[CumulativeEnergyChange]:
+    """
+    Change from the baseline after each stage of the stored plan of a simulation.
+
+    Memoized per simulation, until its results are stored again.
+    The returned list is shared, and must not be modified.
+    """
+    return _get_cumulative_energy_change(uuid, get_results_version(uuid))
@@ -0,0 +1,258 @@
+"""
+Fast JSON serialization of documents holding EnergyProfiles.
+
+Every figure of an EnergyConsumptionSummary or EnergyGenerationSummary is a
+FloatJSONRound, rounded by a Python function which pydantic-core calls back for each
+of the hundreds of figures of every EnergyProfile. ``dump_json`` instead gathers all
+the figures of a profile, rounds them at once with numpy, and fills them into a JSON
+template of the profile, cached per shape (the months, sources and end uses present).
+Everything else is serialized by pydantic, and the output is identical to
+``model_dump_json()``.
+"""
+
+import functools
+import operator
+import types
+import typing
+from collections.abc import Callable
+from typing import TYPE_CHECKING
+from typing import Any
+from typing import NamedTuple
+
+import pydantic
+from pydantic_core import to_json
+
+from .types.home import EnergyConsumptionSummary
+from .types.home import EnergyGenerationSummary
+from .types.home import EnergyProfile
+
+if TYPE_CHECKING:
+    import numpy as np
+    import numpy.typing as npt
+
+ROUNDED_MODELS = (EnergyConsumptionSummary, EnergyGenerationSummary)
+"""Models whose fields are all FloatJSONRound."""
+
+# np.round scales by 10 and rounds to the nearest integer, which can differ from the
+# correctly rounded round(x, 1) when the scaled value is within its rounding error of
+# halfway, or too large to be exact. Those few figures are rounded with round().
+_HALFWAY_TOLERANCE = 1e-5
+_EXACT_LIMIT = 1e9
+
+
+def round_figures(values: list[float]) -> "npt.NDArray[np.float64]":
+    """
+    ``round(value, 1)`` of every value, as FloatJSONRound does, but vectorized.
+    """
+    # Imported on first use, as most workers never store or export documents.
+    import numpy as np
+
+    array = np.array(values, dtype=np.float64)
+    rounded = np.round(array, 1)
+    scaled = array * 10
+    # Negated comparisons, so NaNs are rounded by round() too.
+    inexact = ~(np.abs(scaled - np.floor(scaled) - 0.5) > _HALFWAY_TOLERANCE) | ~(
+        np.abs(array) < _EXACT_LIMIT
+    )
+    for index in np.flatnonzero(inexact):
+        rounded[index] = round(values[index], 1)
+    return rounded
+
+
+def _to_json(value: Any) -> str:
+    # Infinities and NaNs as null, like models do by default (ser_json_inf_nan).
+    return to_json(value, inf_nan_mode="null").decode()
+
+
+@functools.cache
+def _json_key(key: Any) -> str:
+    # As pydantic encodes dict keys, e.g. enums by value and ints as strings.
+    return to_json({key: 0}).decode()[1:-3]
+
+
+def _template_key(key: Any) -> str:
+    return _json_key(key).replace("%", "%%")
+
+
+class _RoundedField(NamedTuple):
+    """A field of EnergyProfile made of rounded models, possibly in (nested) dicts."""
+
+    name: str
+    depth: int
+    """Number of dicts around the rounded models."""
+    figures: Callable[[Any], tuple[float, ...]]
+    template: str
+    """JSON of one rounded model, with a %s for each figure."""
+
+    def gather(self, value: Any, values: list[float]) -> Any:
+        """
+        Add the figures of the field to ``values``, and return its shape: the keys of
+        its dicts.
+        """
+        figures = self.figures
+        if self.depth == 0:
+            values.extend(figures(value))
+            return None
+        if self.depth == 1:
+            for item in value.values():
+                values.extend(figures(item))
+            return tuple(value)
+        shape = []
+        for key, items in value.items():
+            for item in items.values():
+                values.extend(figures(item))
+            shape.append((key, tuple(items)))
+        return tuple(shape)
+
+    def format(self, shape: Any) -> tuple[str, int]:
+        """
+        JSON template of the field for a shape, and its number of figures.
+        """
+        count = self.template.count("%s")
+        if self.depth == 0:
+            return self.template, count
+        if self.depth == 1:
+            return self._format_dict(shape), count * len(shape)
+        parts = [
+            f"{_template_key(key)}:{self._format_dict(keys)}" for key, keys in shape
+        ]
+        return "{" + ",".join(parts) + "}", count * sum(len(keys) for _, keys in shape)
+
+    def _format_dict(self, keys: tuple[Any, ...]) -> str:
+        return (
+            "{"
+            + ",".join(f"{_template_key(key)}:{self.template}" for key in keys)
+            + "}"
+        )
+
+
+def _rounded_field(name: str, annotation: Any) -> _RoundedField | None:
+    depth = 0
+    while typing.get_origin(annotation) is dict and depth < 2:
+        annotation = typing.get_args(annotation)[1]
+        depth += 1
+    if annotation not in ROUNDED_MODELS:
+        return None
+    template = ",".join(
+        f"{_template_key(figure)}:%s" for figure in annotation.model_fields
+    )
+    return _RoundedField(
+        name=name,
+        depth=depth,
+        figures=operator.attrgetter(*annotation.model_fields),
+        template="{" + template + "}",
+    )
+
+
+_PROFILE_FIELDS = {
+    name: _rounded_field(name, field.annotation)
+    for name, field in EnergyProfile.model_fields.items()
+}
+_OTHER_PROFILE_FIELDS = {
+    name for name, field in _PROFILE_FIELDS.items() if field is None
+}
+
+
+class _Template(NamedTuple):
+    format: str
+    """JSON of the profile, with a %s for each figure and each other field."""
+    figure_counts: tuple[int, ...]
+    """Number of figures of each field of the profile, 0 for the other fields."""
+
+
+@functools.lru_cache(maxsize=256)
+def _profile_template(shapes: tuple[Any, ...]) -> _Template:
+    parts = []
+    counts = []
+    for (name, field), shape in zip(_PROFILE_FIELDS.items(), shapes):
+        if field is None:
+            parts.append(f"{_template_key(name)}:%s")
+            counts.append(0)
+        else:
+            template, count = field.format(shape)
+            parts.append(f"{_template_key(name)}:{template}")
+            counts.append(count)
+    return _Template("{" + ",".join(parts) + "}", tuple(counts))
+
+
+def _dump_profile(profile: EnergyProfile) -> str:
+    shapes = []
+    values: list[float] = []
+    for name, field in _PROFILE_FIELDS.items():
+        shapes.append(
+            None if field is None else field.gather(profile.__dict__[name], values)
+        )
+    template = _profile_template(tuple(shapes))
+
+    # The figures, formatted as pydantic formats floats.
+    figures = _to_json(round_figures(values).tolist())[1:-1].split(",")
+    others = profile.model_dump(mode="json", include=_OTHER_PROFILE_FIELDS)
+    args: list[str] = []
+    position = 0
+    for (name, field), count in zip(_PROFILE_FIELDS.items(), template.figure_counts):
+        if field is None:
+            args.append(_to_json(others[name]))
+        else:
+            # Possibly none, for an empty dict of figures.
+            args.extend(figures[position : position + count])
+            position += count
+    return template.format % tuple(args)
+
+
+def _holds_profiles(annotation: Any) -> bool:
+    if isinstance(annotation, type) and issubclass(annotation, pydantic.BaseModel):
+        return annotation is EnergyProfile or any(
+            isinstance(segment, str) for segment in _segments(annotation)
+        )
+    if typing.get_origin(annotation) in (list, typing.Union, types.UnionType):
+        return any(_holds_profiles(arg) for arg in typing.get_args(annotation))
+    return False
+
+
+@functools.cache
+def _segments(model: type[pydantic.BaseModel]) -> tuple[str | frozenset[str], ...]:
+    """
+    The fields of a model in order: the name of each field holding EnergyProfiles, and
+    the names of each run of other fields between them.
+    """
+    segments: list[str | list[str]] = []
+    for name, field in model.model_fields.items():
+        if not field.exclude and _holds_profiles(field.annotation):
+            segments.append(name)
+        elif segments and isinstance(segments[-1], list):
+            segments[-1].append(name)
+        else:
+            segments.append([name])
+    return tuple(
+        segment if isinstance(segment, str) else frozenset(segment)
+        for segment in segments
+    )
+
+
+def _dump_value(value: Any) -> str:
+    if isinstance(value, list):
+        return "[" + ",".join(_dump_value(item) for item in value) + "]"
+    if isinstance(value, pydantic.BaseModel):
+        return dump_json(value)
+    return _to_json(value)
+
+
+def dump_json(model: pydantic.BaseModel) -> str:
+    """
+    ``model.model_dump_json()``, faster for EnergyProfiles and the models holding them.
+    """
+    if type(model) is EnergyProfile:
+        return _dump_profile(model)
+    segments = _segments(type(model))
+    if not any(isinstance(segment, str) for segment in segments):
+        return model.model_dump_json()
+    parts = []
+    for segment in segments:
+        if isinstance(segment, str):
+            parts.append(f"{_json_key(segment)}:{_dump_value(getattr(model, segment))}")
+        else:
+            # Drop the braces, and the whole run if all of its fields are excluded.
+            text = model.model_dump_json(include=set(segment))[1:-1]
+            if text:
+                parts.append(text)
+    return "{" + ",".join(parts) + "}"
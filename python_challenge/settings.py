@@ -7,6 +7,8 @@ import structlog
 from corsheaders.defaults import default_headers
 from dotenv import load_dotenv
 
+from .tuning import DEFAULT_TIME_BUDGET
+
 load_dotenv()
 load_dotenv("/app/secrets/.env")
 
@@ -78,7 +80,7 @@ REST_FRAMEWORK = {
     "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
     "PAGE_SIZE": 10,
     "DEFAULT_PARSER_CLASSES": ["rest_framework.parsers.JSONParser"],
-    "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
+    "DEFAULT_SCHEMA_CLASS": "python_challenge.docs.schema.AutoSchema",
     "DEFAULT_AUTHENTICATION_CLASSES": [
         "rest_framework.authentication.BasicAuthentication",
         "rest_framework.authentication.SessionAuthentication",
@@ -91,6 +93,9 @@ SPECTACULAR_SETTINGS = {
     "SERVE_PERMISSIONS": ["rest_framework.permissions.AllowAny"],
     "VERSION": importlib.metadata.version("python-challenge"),
     "TAGS": [],
+    # Tag and name operations by their full path (api_...), rather than guessing a
+    # common prefix from the views, which the docs views are not part of.
+    "SCHEMA_PATH_PREFIX": "",
     "POSTPROCESSING_HOOKS": [
         # Use DRF-spectacular's default enum processing hook.
         "drf_spectacular.hooks.postprocess_schema_enums",
@@ -118,22 +123,29 @@ INSTALLED_APPS = [
     "django.contrib.staticfiles",
 ]
 
+# Paths whose requests skip the middleware wrapped by SkippedOnLeanPaths.
+LEAN_PATH_PREFIXES = ["/api/"]
+
 MIDDLEWARE = [
+    "python_challenge.middleware.TimeBudgetMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django_permissions_policy.PermissionsPolicyMiddleware",
     "csp.middleware.CSPMiddleware",
     "corsheaders.middleware.CorsMiddleware",
-    "whitenoise.middleware.WhiteNoiseMiddleware",
+    "python_challenge.middleware.WhiteNoiseMiddleware",
     "django.middleware.gzip.GZipMiddleware",
-    "debug_toolbar.middleware.DebugToolbarMiddleware",
-    "django.contrib.sessions.middleware.SessionMiddleware",
+    "python_challenge.middleware.DebugToolbarMiddleware",
+    "python_challenge.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
-    "django.middleware.csrf.CsrfViewMiddleware",
-    "django.contrib.messages.middleware.MessageMiddleware",
+    "python_challenge.middleware.CsrfViewMiddleware",
+    "python_challenge.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
     "django_structlog.middlewares.RequestMiddleware",
 ]
 
+# Seconds a request may take before it is cancelled with a 503, or 0 for no limit.
+REQUEST_TIME_BUDGET = float(os.environ.get("REQUEST_TIME_BUDGET", DEFAULT_TIME_BUDGET))
+
 
 ROOT_URLCONF = "python_challenge.urls"
 
@@ -188,6 +200,8 @@ SILENCED_SYSTEM_CHECKS = [
     "auth.E003",
     # SECURE_SSL_REDIRECT -- seems to break Cloud Run and is handled there.
     "security.W008",
+    # DebugToolbarMiddleware missing -- wrapped by python_challenge.middleware.
+    "debug_toolbar.W001",
 ]
 
 
@@ -0,0 +1,594 @@
+"""
+Compact binary snapshots of documents, e.g. Homes and retrofit plan results.
+
+Loading a document from JSON is mostly spent validating it, not parsing it. A snapshot
+is laid out by the model's schema instead: fields by position rather than by name,
+the StrEnums of the types by their codes (see enum_codes), other enums and literals by
+their index, and each kind of value in an array of its own (small codes, enum codes,
+integers, floats and strings). Loading a snapshot rebuilds the models without
+validating them again, as they were valid when dumped. The header guards that: it holds
+the format's version and a fingerprint of the model's JSON schema, so a snapshot of
+another version of the models is rejected rather than misread.
+
+A snapshot holds the same values as the model it was dumped from, including which
+fields were set, so it loads back to an equal model with the same JSON, but for the
+order of the members of sets, which sets don't keep.
+"""
+
+import datetime
+import enum
+import hashlib
+import json
+import struct
+import sys
+import types
+import typing
+from array import array
+from collections.abc import Callable
+from collections.abc import Sequence
+from decimal import Decimal
+from typing import Any
+from typing import NamedTuple
+from typing import TypeVar
+from uuid import UUID
+
+import pydantic
+
+from .enum_codes import NONE
+from .enum_codes import enum_codes
+from .types.basic import StrEnum
+
+M = TypeVar("M", bound=pydantic.BaseModel)
+
+MAGIC = b"PCSN"
+FORMAT_VERSION = 2
+"""Version of the layout, to change with any change of the encoding of a type."""
+
+_HEADER = struct.Struct("<4sH8s")
+_STREAM = struct.Struct("<cI")
+_UNSIGNED = "BHIQ"
+_SIGNED = "bhiq"
+
+
+class _Writer:
+    def __init__(self) -> None:
+        self.codes: list[int] = []
+        """Lengths, indexes of enums, literals and union members, and booleans."""
+        self.enums: list[int] = []
+        """Codes of the StrEnums of the types."""
+        self.ints: list[int] = []
+        self.floats: list[float] = []
+        self.strings: list[str] = []
+
+
+class _Reader:
+    __slots__ = (
+        "_iterators",
+        "next_code",
+        "next_enum",
+        "next_int",
+        "next_float",
+        "next_str",
+    )
+
+    def __init__(
+        self,
+        codes: list[int],
+        enums: list[int],
+        ints: list[int],
+        floats: list[float],
+        strings: list[str],
+    ) -> None:
+        self._iterators = [
+            iter(values) for values in (codes, enums, ints, floats, strings)
+        ]
+        (
+            self.next_code,
+            self.next_enum,
+            self.next_int,
+            self.next_float,
+            self.next_str,
+        ) = (iterator.__next__ for iterator in self._iterators)
+
+    def exhausted(self) -> bool:
+        return all(next(iterator, None) is None for iterator in self._iterators)
+
+
+Decode = Callable[[_Reader], Any]
+
+
+class _Codec(NamedTuple):
+    encode: Callable[[Any, _Writer], None]
+    decode: Decode
+    matches: Callable[[Any], bool]
+    """Whether a value is of this type, to tell the members of a union apart."""
+    inline: str = "{c}(reader)"
+    """
+    Expression decoding the value, inlined in the decoders of the types holding it, from
+    the functions reading the next ``code``, ``enum``, ``int_``, ``float_`` and
+    ``str_``, and
+    ``{c}``, the constant.
+    """
+    constant: Any = None
+    """Object used by the inlined expression, the decode function if None."""
+
+    def inlined(self) -> tuple[str, Any]:
+        return self.inline, self.decode if self.constant is None else self.constant
+
+
+_DECODER = """
+def decode(reader):
+    code = reader.next_code
+    enum = reader.next_enum
+    int_ = reader.next_int
+    float_ = reader.next_float
+    str_ = reader.next_str
+%s
+"""
+
+
+def _generate(
+    name: str, body: str, codecs: Sequence[_Codec], **namespace: Any
+) -> Decode:
+    """
+    A decode function, generated as dataclasses generates __init__, so the values of a
+    model or collection are read inline rather than by calling a function for each.
+    ``body`` has a ``{0}``, ``{1}``... for the expression decoding each codec's value.
+    """
+    expressions = []
+    for index, codec in enumerate(codecs):
+        inline, namespace[f"constant_{index}"] = codec.inlined()
+        expressions.append(inline.format(c=f"constant_{index}"))
+    lines = body.format(*expressions).splitlines()
+    source = _DECODER % "\n".join(f"    {line}" for line in lines)
+    # Named after the decoded type, for tracebacks and profiles.
+    exec(compile(source, f"<snapshot {name}>", "exec"), namespace)
+    return namespace["decode"]
+
+
+def _is(type_: type) -> Callable[[Any], bool]:
+    return lambda value: type(value) is type_
+
+
+def _scalar_codec(annotation: type) -> _Codec | None:
+    if annotation is bool:
+        return _Codec(
+            lambda value, out: out.codes.append(1 if value else 0),
+            lambda reader: reader.next_code() == 1,
+            _is(bool),
+            "code() == 1",
+        )
+    if annotation is int:
+        return _Codec(
+            lambda value, out: out.ints.append(value),
+            lambda reader: reader.next_int(),
+            _is(int),
+            "int_()",
+        )
+    if annotation is float:
+        return _Codec(
+            lambda value, out: out.floats.append(value),
+            lambda reader: reader.next_float(),
+            _is(float),
+            "float_()",
+        )
+    if annotation is str:
+        return _Codec(
+            lambda value, out: out.strings.append(value),
+            lambda reader: reader.next_str(),
+            _is(str),
+            "str_()",
+        )
+    parsers: dict[type, Callable[[str], Any]] = {
+        Decimal: Decimal,
+        UUID: UUID,
+        datetime.datetime: datetime.datetime.fromisoformat,
+        datetime.date: datetime.date.fromisoformat,
+    }
+    if parse := parsers.get(annotation):
+        # Exactly, e.g. a Decimal with its exponent, as its string.
+        return _Codec(
+            lambda value, out: out.strings.append(str(value)),
+            lambda reader: parse(reader.next_str()),
+            _is(annotation),
+            "{c}(str_())",
+            parse,
+        )
+    return None
+
+
+def _none_codec() -> _Codec:
+    return _Codec(
+        lambda value, out: None,
+        lambda reader: None,
+        lambda value: value is None,
+        "None",
+        (),
+    )
+
+
+def _enum_codec(cls: type[enum.Enum]) -> _Codec:
+    members = tuple(cls)
+    indexes = {member: index for index, member in enumerate(members)}
+    return _Codec(
+        lambda value, out: out.codes.append(indexes[value]),
+        lambda reader: members[reader.next_code()],
+        _is(cls),
+        "{c}[code()]",
+        members,
+    )
+
+
+def _str_enum_codec(classes: Sequence[type[StrEnum]], optional: bool) -> _Codec:
+    """
+    Members of the StrEnums of the types by their codes, which tell the enums apart, so
+    a union of them, or with None as NONE, needs no index of its member.
+
+    Codes are decoded by the members of the field's enums only, so the code of a member
+    of another enum (as snapshots aren't validated) is an invalid snapshot.
+    """
+    registry = enum_codes()
+    codes = registry.codes(classes[0]) if len(classes) == 1 else None
+    members: dict[int, StrEnum | None] = {
+        code: member for cls in classes for member, code in registry.codes(cls).items()
+    }
+    if optional:
+        members[NONE] = None
+
+    def encode(value: Any, out: _Writer) -> None:
+        if value is None:
+            out.enums.append(NONE)
+        elif codes is not None:
+            out.enums.append(codes[value])
+        else:
+            out.enums.append(registry.code(value))
+
+    return _Codec(
+        encode,
+        lambda reader: members[reader.next_enum()],
+        lambda value: type(value) in classes or (optional and value is None),
+        "{c}[enum()]",
+        members,
+    )
+
+
+def _literal_codec(values: tuple[Any, ...]) -> _Codec:
+    def matches(value: Any) -> bool:
+        return any(
+            type(value) is type(literal) and value == literal for literal in values
+        )
+
+    if len(values) == 1:
+        [literal] = values
+        return _Codec(
+            lambda value, out: None, lambda reader: literal, matches, "{c}[0]", values
+        )
+    indexes = {value: index for index, value in enumerate(values)}
+    return _Codec(
+        lambda value, out: out.codes.append(indexes[value]),
+        lambda reader: values[reader.next_code()],
+        matches,
+        "{c}[code()]",
+        values,
+    )
+
+
+def _union_codec(members: tuple[Any, ...]) -> _Codec:
+    classes = [member for member in members if member is not type(None)]
+    if all(isinstance(cls, type) and cls in enum_codes() for cls in classes):
+        return _str_enum_codec(classes, len(classes) < len(members))
+    codecs = [_codec(member) for member in members]
+    if len(members) == 2 and type(None) in members:
+        # Optional, the most common union.
+        inner = codecs[members.index(type(None)) - 1]
+        inner_encode = inner.encode
+
+        def encode_optional(value: Any, out: _Writer) -> None:
+            if value is None:
+                out.codes.append(0)
+            else:
+                out.codes.append(1)
+                inner_encode(value, out)
+
+        inline, constant = inner.inlined()
+        return _Codec(
+            encode_optional,
+            _generate("optional", "return {0} if code() else None", [inner]),
+            lambda value: value is None or inner.matches(value),
+            f"({inline} if code() else None)",
+            constant,
+        )
+
+    def encode(value: Any, out: _Writer) -> None:
+        for index, codec in enumerate(codecs):
+            if codec.matches(value):
+                out.codes.append(index)
+                codec.encode(value, out)
+                return
+        raise TypeError(f"{value!r} is none of {members}")
+
+    return _Codec(
+        encode,
+        lambda reader: codecs[reader.next_code()].decode(reader),
+        lambda value: any(codec.matches(value) for codec in codecs),
+    )
+
+
+def _collection_codec(collection: type, item: Any) -> _Codec:
+    item_codec = _codec(item)
+    encode_item = item_codec.encode
+
+    def encode(values: Any, out: _Writer) -> None:
+        out.codes.append(len(values))
+        for value in values:
+            encode_item(value, out)
+
+    if collection is list:
+        decode = _generate("list", "return [{0} for _ in range(code())]", [item_codec])
+    else:
+        decode = _generate(
+            collection.__name__,
+            "return collection([{0} for _ in range(code())])",
+            [item_codec],
+            collection=collection,
+        )
+    return _Codec(encode, decode, _is(collection))
+
+
+def _tuple_codec(items: tuple[Any, ...], cls: type = tuple) -> _Codec:
+    """A tuple of fixed length, or a NamedTuple."""
+    codecs = [_codec(item) for item in items]
+
+    def encode(values: Any, out: _Writer) -> None:
+        for codec, value in zip(codecs, values, strict=True):
+            codec.encode(value, out)
+
+    values = ", ".join(f"{{{index}}}" for index in range(len(codecs)))
+    if cls is tuple:
+        return _Codec(
+            encode,
+            _generate("tuple", f"return ({values},)", codecs),
+            lambda value: type(value) is tuple and len(value) == len(codecs),
+        )
+    return _Codec(
+        encode,
+        _generate(cls.__qualname__, f"return cls({values})", codecs, cls=cls),
+        _is(cls),
+    )
+
+
+def _dict_codec(key: Any, value: Any) -> _Codec:
+    key_codec = _codec(key)
+    value_codec = _codec(value)
+    encode_key = key_codec.encode
+    encode_value = value_codec.encode
+
+    def encode(values: dict[Any, Any], out: _Writer) -> None:
+        out.codes.append(len(values))
+        for key, value in values.items():
+            encode_key(key, out)
+            encode_value(value, out)
+
+    return _Codec(
+        encode,
+        _generate(
+            "dict",
+            "return {{{0}: {1} for _ in range(code())}}",
+            [key_codec, value_codec],
+        ),
+        _is(dict),
+    )
+
+
+_models: dict[type[pydantic.BaseModel], _Codec] = {}
+
+# Setters of the attributes of a model instance, as model_construct() sets them.
+_set_dict, _set_fields_set, _set_extra, _set_private = (
+    vars(pydantic.BaseModel)[name].__set__
+    for name in (
+        "__dict__",
+        "__pydantic_fields_set__",
+        "__pydantic_extra__",
+        "__pydantic_private__",
+    )
+)
+
+_MODEL_DECODER = """\
+unset = code()
+fields_set = all_set.copy() if not unset else set_fields(names, unset, code)
+model = new(cls)
+set_dict(model, {{%s}})
+set_fields_set(model, fields_set)
+set_extra(model, None)
+set_private(model, None)
+return model"""
+
+
+def _set_fields(
+    names: tuple[str, ...], unset: int, code: Callable[[], int]
+) -> set[str]:
+    return set(names).difference([names[code()] for _ in range(unset)])
+
+
+def _model_codec(cls: type[pydantic.BaseModel]) -> _Codec:
+    if codec := _models.get(cls):
+        return codec
+    if cls.model_config.get("extra") == "allow" or cls.__private_attributes__:
+        raise TypeError(f"Can't snapshot {cls}, with extra or private attributes")
+    names = tuple(cls.model_fields)
+    encoders: list[Callable[[Any, _Writer], None]] = []
+    decoders: list[Decode] = []
+
+    def encode(model: pydantic.BaseModel, out: _Writer) -> None:
+        # The fields not set, usually none of them.
+        fields_set = model.model_fields_set
+        unset = [index for index, name in enumerate(names) if name not in fields_set]
+        out.codes.append(len(unset))
+        out.codes.extend(unset)
+        values = model.__dict__
+        for name, encode_field in zip(names, encoders):
+            encode_field(values[name], out)
+
+    # Registered while compiling the fields, for models which hold themselves.
+    _models[cls] = _Codec(encode, lambda reader: decoders[0](reader), _is(cls))
+    try:
+        codecs = [_codec(field.annotation) for field in cls.model_fields.values()]
+    finally:
+        del _models[cls]
+    encoders.extend(codec.encode for codec in codecs)
+    fields = ", ".join(f"{name!r}: {{{index}}}" for index, name in enumerate(names))
+    decoders.append(
+        _generate(
+            cls.__qualname__,
+            _MODEL_DECODER % fields,
+            codecs,
+            names=names,
+            all_set=set(names),
+            cls=cls,
+            new=object.__new__,
+            set_fields=_set_fields,
+            set_dict=_set_dict,
+            set_fields_set=_set_fields_set,
+            set_extra=_set_extra,
+            set_private=_set_private,
+        )
+    )
+    _models[cls] = codec = _Codec(encode, decoders[0], _is(cls))
+    return codec
+
+
+def _codec(annotation: Any) -> _Codec:
+    origin = typing.get_origin(annotation)
+    args = typing.get_args(annotation)
+    if origin is typing.Annotated:
+        return _codec(args[0])
+    if origin in (typing.Union, types.UnionType):
+        return _union_codec(args)
+    if origin is typing.Literal:
+        return _literal_codec(args)
+    if origin in (list, set, frozenset):
+        return _collection_codec(origin, args[0])
+    if origin is tuple:
+        if len(args) == 2 and args[1] is Ellipsis:
+            return _collection_codec(tuple, args[0])
+        return _tuple_codec(args)
+    if origin is dict:
+        return _dict_codec(*args)
+    if annotation is None or annotation is type(None):
+        return _none_codec()
+    if isinstance(annotation, type) and origin is None:
+        if issubclass(annotation, pydantic.BaseModel):
+            return _model_codec(annotation)
+        if annotation in enum_codes():
+            return _str_enum_codec([annotation], False)
+        if issubclass(annotation, enum.Enum):
+            return _enum_codec(annotation)
+        if issubclass(annotation, tuple) and (
+            fields := getattr(annotation, "_fields", None)
+        ):
+            hints = typing.get_type_hints(annotation)
+            return _tuple_codec(tuple(hints[field] for field in fields), annotation)
+        if codec := _scalar_codec(annotation):
+            return codec
+    raise TypeError(f"Can't snapshot {annotation!r}")
+
+
+_fingerprints: dict[type[pydantic.BaseModel], bytes] = {}
+
+
+def fingerprint(model: type[pydantic.BaseModel]) -> bytes:
+    """
+    Changes with the model's schema, e.g. the order of its fields or of an enum's
+    members.
+    """
+    if (digest := _fingerprints.get(model)) is None:
+        schema = json.dumps(model.model_json_schema())
+        digest = _fingerprints[model] = hashlib.sha256(schema.encode()).digest()[:8]
+    return digest
+
+
+def _pack(values: list[Any], typecodes: str) -> array:
+    for typecode in typecodes:
+        try:
+            packed = array(typecode, values)
+        except OverflowError:
+            continue
+        if sys.byteorder == "big":  # pragma: no cover
+            packed.byteswap()
+        return packed
+    raise ValueError("Can't snapshot an integer beyond 64 bits")
+
+
+def dump_snapshot(model: pydantic.BaseModel) -> bytes:
+    """The model as a snapshot, to load with load_snapshot."""
+    out = _Writer()
+    _model_codec(type(model)).encode(model, out)
+    streams = [
+        _pack(out.codes, _UNSIGNED),
+        _pack(out.enums, _UNSIGNED),
+        _pack(out.ints, _SIGNED),
+        _pack(out.floats, "d"),
+        _pack([len(string) for string in out.strings], _UNSIGNED),
+        array("B", "".join(out.strings).encode()),
+    ]
+    parts = [_HEADER.pack(MAGIC, FORMAT_VERSION, fingerprint(type(model)))]
+    for stream in streams:
+        parts.append(_STREAM.pack(stream.typecode.encode(), len(stream)))
+        parts.append(stream.tobytes())
+    return b"".join(parts)
+
+
+def _unpack(data: memoryview, offset: int) -> tuple[array, int]:
+    typecode, length = _STREAM.unpack_from(data, offset)
+    offset += _STREAM.size
+    stream = array(typecode.decode())
+    end = offset + length * stream.itemsize
+    if end > len(data):
+        raise ValueError("Invalid snapshot, truncated")
+    stream.frombytes(data[offset:end])
+    if sys.byteorder == "big":  # pragma: no cover
+        stream.byteswap()
+    return stream, end
+
+
+def load_snapshot(data: bytes, model: type[M]) -> M:
+    """
+    Load a snapshot of the model dumped by dump_snapshot. Raises ValueError for a
+    snapshot of another format or version of the model.
+    """
+    view = memoryview(data)
+    try:
+        magic, version, digest = _HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError("Not a snapshot")
+        if version != FORMAT_VERSION or digest != fingerprint(model):
+            raise ValueError(
+                f"Snapshot of another version of the format or of {model.__name__}"
+            )
+        offset = _HEADER.size
+        streams = []
+        for _ in range(6):
+            stream, offset = _unpack(view, offset)
+            streams.append(stream)
+        codes, enums, ints, floats, lengths = (
+            stream.tolist() for stream in streams[:5]
+        )
+        text = streams[5].tobytes().decode()
+        strings = []
+        position = 0
+        for length in lengths:
+            strings.append(text[position : position + length])
+            position += length
+        reader = _Reader(codes, enums, ints, floats, strings)
+        result = _model_codec(model).decode(reader)
+        if not reader.exhausted():
+            raise ValueError("Invalid snapshot, with values left over")
+    except (
+        struct.error,
+        StopIteration,
+        IndexError,
+        KeyError,
+        UnicodeDecodeError,
+    ) as error:
+        raise ValueError(f"Invalid snapshot: {error!r}") from error
+    return typing.cast(M, result)
@@ -0,0 +1,367 @@
+"""
+Vectorized Solar PV calculations, for assessing every array of a portfolio at once.
+
+The capacities match the per-array properties of SolarPVModelSettings exactly: the
+same floating point operations are applied in the same order, to whole numpy arrays.
+
+Generation is estimated offline, for clear-sky conditions (no weather data), so it is
+an upper bound of what the arrays can generate rather than a forecast.
+"""
+
+from collections.abc import Iterable
+from collections.abc import Iterator
+from typing import Any
+from typing import NamedTuple
+
+import numpy as np
+import numpy.typing as npt
+
+from .types.home import Home
+from .types.simulation import SolarPVModelSettings
+from .types.simulation_enums import SolarPVTracking
+
+FloatArray = npt.NDArray[np.float64]
+IntArray = npt.NDArray[np.int64]
+BoolArray = npt.NDArray[np.bool_]
+
+_SETTINGS = SolarPVModelSettings.model_fields
+DEGRADATION_INITIAL: float = _SETTINGS["degradation_initial"].default
+DEGRADATION_RATE: float = _SETTINGS["degradation_rate"].default
+SYSTEM_LOSSES: float = _SETTINGS["system_losses"].default
+
+HOURS_PER_YEAR = 8760
+"""Hours of a non-leap year, the length of hourly generation profiles."""
+
+SOLAR_CONSTANT = 1367.0
+"""Extraterrestrial solar irradiance (W/m2), at the mean Earth-Sun distance."""
+
+GROUND_ALBEDO = 0.2
+
+TRACKING_FIXED = 0
+"""Tracking code for fixed arrays, the others are SolarPVTracking.gsee_value."""
+
+_MONTH_START_HOURS = np.cumsum([0, 31, 28, 31, 30, 31, 30, 31, 31, 30, 31, 30]) * 24
+
+
+class SolarPVCapacity(NamedTuple):
+    degradation_for_age: FloatArray
+    peak_power_adjusted: FloatArray
+    """Peak power (kWp), degraded by age."""
+    peak_power_watts: FloatArray
+    inverter_power_watts: FloatArray
+
+
+def solar_pv_capacity(
+    peak_power: npt.ArrayLike,
+    inverter_power: npt.ArrayLike,
+    age: npt.ArrayLike,
+    degrade_performance_by_age: bool | npt.ArrayLike = True,
+    degradation_initial: float | npt.ArrayLike = DEGRADATION_INITIAL,
+    degradation_rate: float | npt.ArrayLike = DEGRADATION_RATE,
+) -> SolarPVCapacity:
+    """
+    Derived capacities of many Solar PV arrays, as SolarPVModelSettings computes them.
+
+    ``inverter_power`` is NaN for arrays without an inverter capacity. The degradation
+    settings are either one value for every array, or one value per array.
+    """
+    peak_power = np.asarray(peak_power, dtype=np.float64)
+    inverter_power = np.asarray(inverter_power, dtype=np.float64)
+    age = np.asarray(age, dtype=np.int64)
+
+    degradation_for_age = np.where(
+        age == 0,
+        0.0,
+        np.asarray(degradation_initial) + ((age - 1) * np.asarray(degradation_rate)),
+    )
+    peak_power_adjusted = np.where(
+        degrade_performance_by_age,
+        peak_power * (1 - degradation_for_age),
+        peak_power,
+    )
+    # Uses the non-degraded peak power when there is no inverter capacity.
+    inverter_power_watts = np.where(
+        np.isnan(inverter_power), peak_power, inverter_power
+    )
+    return SolarPVCapacity(
+        degradation_for_age=degradation_for_age,
+        peak_power_adjusted=peak_power_adjusted,
+        peak_power_watts=peak_power_adjusted * 1000,
+        inverter_power_watts=inverter_power_watts * 1000,
+    )
+
+
+class _SunPosition(NamedTuple):
+    """Hourly terms of the sun's position which do not depend on the location."""
+
+    sin_declination: FloatArray
+    cos_declination: FloatArray
+    sin_hour_angle: FloatArray
+    """Sine of the hour angle at longitude 0."""
+    cos_hour_angle: FloatArray
+    extraterrestrial: FloatArray
+    """Extraterrestrial normal irradiance (W/m2)."""
+
+
+def _sun_position() -> _SunPosition:
+    # Middle of each hour (UTC) of a non-leap year.
+    hours = np.arange(HOURS_PER_YEAR) + 0.5
+    day = hours // 24 + 1
+    day_angle = 2 * np.pi * day / 365
+    # Cooper's declination, and Spencer's equation of time (minutes).
+    declination = np.radians(23.45) * np.sin(2 * np.pi * (284 + day) / 365)
+    b = 2 * np.pi * (day - 81) / 364
+    equation_of_time = 9.87 * np.sin(2 * b) - 7.53 * np.cos(b) - 1.5 * np.sin(b)
+    hour_angle = np.radians(15 * (hours % 24 + equation_of_time / 60 - 12))
+    return _SunPosition(
+        sin_declination=np.sin(declination),
+        cos_declination=np.cos(declination),
+        sin_hour_angle=np.sin(hour_angle),
+        cos_hour_angle=np.cos(hour_angle),
+        extraterrestrial=SOLAR_CONSTANT * (1 + 0.033 * np.cos(day_angle)),
+    )
+
+
+_SUN = _sun_position()
+
+
+_BEAM_TABLE_SIZE = 1 << 14
+
+
+def _beam_transmittance_table() -> FloatArray:
+    """
+    Clear-sky beam transmittance by the sine of the sun's elevation, from 0 to 1.
+
+    Depends only on the elevation, so it is tabulated once instead of evaluating the
+    air mass and Meinel's formula (several powers) for every hour of every array.
+    """
+    sin_elevation = np.linspace(0, 1, _BEAM_TABLE_SIZE + 1)
+    zenith = np.degrees(np.arccos(sin_elevation))
+    air_mass = 1 / (sin_elevation + 0.50572 * (96.07995 - zenith) ** -1.6364)
+    transmittance = 0.7 ** (air_mass**0.678)
+    transmittance[0] = 0.0  # Sun on or below the horizon.
+    return transmittance
+
+
+_BEAM_TRANSMITTANCE = _beam_transmittance_table()
+
+
+def _column(values: npt.ArrayLike) -> FloatArray:
+    return np.asarray(values, dtype=np.float64).reshape(-1, 1)
+
+
+def _plane_of_array_irradiance(
+    longitude: FloatArray,
+    latitude: FloatArray,
+    tilt: FloatArray,
+    azimuth: FloatArray,
+    tracking: int,
+) -> FloatArray:
+    """
+    Clear-sky irradiance (W/m2) on the panels, for arrays with the same tracking.
+    Angles are in radians, and columns of one row per array.
+    """
+    # Hour angle at the longitude, from the angle sum identities rather than more trig.
+    sin_longitude, cos_longitude = np.sin(longitude), np.cos(longitude)
+    cos_hour_angle = _SUN.cos_hour_angle * cos_longitude - (
+        _SUN.sin_hour_angle * sin_longitude
+    )
+    sin_hour_angle = _SUN.sin_hour_angle * cos_longitude + (
+        _SUN.cos_hour_angle * sin_longitude
+    )
+    # Unit vector towards the sun: east, north, up.
+    sin_latitude, cos_latitude = np.sin(latitude), np.cos(latitude)
+    declination_cos_hour = _SUN.cos_declination * cos_hour_angle
+    sun_east = -_SUN.cos_declination * sin_hour_angle
+    sun_north = cos_latitude * _SUN.sin_declination - (
+        sin_latitude * declination_cos_hour
+    )
+    sun_up = sin_latitude * _SUN.sin_declination + cos_latitude * declination_cos_hour
+    np.maximum(sun_up, 0, out=sun_up)
+
+    table_index = (sun_up * _BEAM_TABLE_SIZE).astype(np.intp)
+    # Direct normal irradiance, zero at night; diffuse irradiance is 10% of it.
+    beam = _SUN.extraterrestrial * _BEAM_TRANSMITTANCE[table_index]
+
+    # Cosines of the beam's angle of incidence, and of the tilt for diffuse irradiance.
+    cos_incidence: FloatArray | float
+    if tracking == TRACKING_FIXED:
+        sin_tilt, cos_tilt = np.sin(tilt), np.cos(tilt)
+        cos_incidence = (
+            sun_east * (sin_tilt * np.sin(azimuth))
+            + sun_north * (sin_tilt * np.cos(azimuth))
+            + sun_up * cos_tilt
+        )
+        np.maximum(cos_incidence, 0, out=cos_incidence)
+    elif tracking == SolarPVTracking.DUAL_AXIS.gsee_value:
+        cos_incidence = 1.0
+        cos_tilt = sun_up
+    else:
+        # A horizontal north-south axis, turning the panel from east to west.
+        cos_incidence = np.sqrt(sun_east**2 + sun_up**2)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cos_tilt = np.where(sun_up > 0, sun_up / cos_incidence, 1.0)
+
+    sky_view = (1 + cos_tilt) / 2
+    ground_view = (1 - cos_tilt) / 2
+    # Beam, isotropic sky diffuse, and ground reflected global horizontal irradiance.
+    return beam * (
+        cos_incidence + 0.1 * sky_view + GROUND_ALBEDO * ground_view * (sun_up + 0.1)
+    )
+
+
+def hourly_generation(
+    longitude: npt.ArrayLike,
+    latitude: npt.ArrayLike,
+    peak_power: npt.ArrayLike,
+    tilt: npt.ArrayLike,
+    azimuth: npt.ArrayLike,
+    tracking: npt.ArrayLike = TRACKING_FIXED,
+    inverter_power: npt.ArrayLike = np.inf,
+    system_losses: float | npt.ArrayLike = SYSTEM_LOSSES,
+) -> FloatArray:
+    """
+    Clear-sky hourly AC generation (kWh) of Solar PV arrays, one row of 8760 per array.
+
+    Hours are UTC, of a non-leap year. Peak and inverter power are in kW, and should
+    already be degraded (see ``solar_pv_capacity``); ``tracking`` is TRACKING_FIXED or
+    a SolarPVTracking.gsee_value.
+
+    The sun's position and clear-sky beam irradiance follow standard approximations
+    (Cooper, Spencer, Kasten-Young air mass, Meinel), with diffuse irradiance as 10% of
+    the beam. Irradiance on the panels is the beam at the angle of incidence, plus
+    isotropic sky and ground diffuse. Panel temperature is not modelled.
+    """
+    longitude, latitude, tilt, azimuth, tracking = np.broadcast_arrays(
+        np.radians(_column(longitude)),
+        np.radians(_column(latitude)),
+        np.radians(_column(tilt)),
+        np.radians(_column(azimuth)),
+        np.asarray(tracking, dtype=np.int64).reshape(-1, 1),
+    )
+    irradiance = np.empty((len(longitude), HOURS_PER_YEAR))
+    for code in np.unique(tracking):
+        rows = tracking[:, 0] == code
+        irradiance[rows] = _plane_of_array_irradiance(
+            longitude[rows], latitude[rows], tilt[rows], azimuth[rows], int(code)
+        )
+    power = (_column(peak_power) * (1 - _column(system_losses)) / 1000) * irradiance
+    return np.minimum(power, _column(inverter_power), out=power)
+
+
+def monthly_totals(hourly: FloatArray) -> FloatArray:
+    """
+    Sums of hourly profiles (one row of 8760 per array) by month, one row of 12.
+    """
+    return np.add.reduceat(hourly, _MONTH_START_HOURS, axis=1)
+
+
+class SolarPVColumns(NamedTuple):
+    """
+    The Solar PV arrays of many Homes, as columns.
+
+    Array ``i`` belongs to the Home at position ``home_index[i]``.
+    """
+
+    home_index: IntArray
+    longitude: FloatArray
+    latitude: FloatArray
+    peak_power: FloatArray
+    inverter_power: FloatArray
+    """NaN where the array has no inverter capacity."""
+    age: IntArray
+    tilt: IntArray
+    azimuth: IntArray
+    tracking: IntArray
+    """TRACKING_FIXED or a SolarPVTracking.gsee_value."""
+
+    @classmethod
+    def from_homes(cls, homes: Iterable[Home]) -> "SolarPVColumns":
+        rows = [
+            (
+                index,
+                home.location.coordinates.longitude,
+                home.location.coordinates.latitude,
+                array.peak_power,
+                array.inverter_power or np.nan,
+                array.age,
+                array.tilt,
+                array.azimuth,
+                array.tracking.gsee_value if array.tracking else TRACKING_FIXED,
+            )
+            for index, home in enumerate(homes)
+            for array in home.solar_pv or []
+        ]
+        (
+            home_index,
+            longitude,
+            latitude,
+            peak_power,
+            inverter_power,
+            age,
+            tilt,
+            azimuth,
+            tracking,
+        ) = (
+            zip(*rows) if rows else [()] * len(cls._fields)
+        )
+        return cls(
+            home_index=np.array(home_index, dtype=np.int64),
+            longitude=np.array(longitude, dtype=np.float64),
+            latitude=np.array(latitude, dtype=np.float64),
+            peak_power=np.array(peak_power, dtype=np.float64),
+            inverter_power=np.array(inverter_power, dtype=np.float64),
+            age=np.array(age, dtype=np.int64),
+            tilt=np.array(tilt, dtype=np.int64),
+            azimuth=np.array(azimuth, dtype=np.int64),
+            tracking=np.array(tracking, dtype=np.int64),
+        )
+
+    def capacity(
+        self,
+        degrade_performance_by_age: bool = True,
+        degradation_initial: float = DEGRADATION_INITIAL,
+        degradation_rate: float = DEGRADATION_RATE,
+    ) -> SolarPVCapacity:
+        return solar_pv_capacity(
+            self.peak_power,
+            self.inverter_power,
+            self.age,
+            degrade_performance_by_age=degrade_performance_by_age,
+            degradation_initial=degradation_initial,
+            degradation_rate=degradation_rate,
+        )
+
+    def hourly_generation(
+        self,
+        system_losses: float = SYSTEM_LOSSES,
+        chunk_size: int = 100,
+        **degradation: Any,
+    ) -> Iterator[FloatArray]:
+        """
+        Clear-sky hourly generation (kWh) of the arrays, degraded by age, in chunks of
+        ``chunk_size`` rows to limit memory use. ``degradation`` is passed on to
+        ``capacity``.
+        """
+        capacity = self.capacity(**degradation)
+        for start in range(0, len(self.home_index), chunk_size):
+            chunk = slice(start, start + chunk_size)
+            yield hourly_generation(
+                longitude=self.longitude[chunk],
+                latitude=self.latitude[chunk],
+                peak_power=capacity.peak_power_adjusted[chunk],
+                tilt=self.tilt[chunk],
+                azimuth=self.azimuth[chunk],
+                tracking=self.tracking[chunk],
+                inverter_power=capacity.inverter_power_watts[chunk] / 1000,
+                system_losses=system_losses,
+            )
+
+    def monthly_generation(self, **settings: Any) -> FloatArray:
+        """
+        Clear-sky monthly generation (kWh) of the arrays, one row of 12 per array.
+        """
+        return np.concatenate(
+            [monthly_totals(hourly) for hourly in self.hourly_generation(**settings)]
+            or [np.zeros((0, 12))]
+        )
@@ -0,0 +1,160 @@
+"""
+Compact, read-only storage of the EnergyConsumptionSummary figures of EnergyProfiles.
+
+An EnergyProfile holds over a hundred EnergyConsumptionSummary models (annual and
+monthly totals, by source and by end use), each a pydantic model with its own dict of
+three floats. EnergySummaries stores the same figures in one array of floats, with the
+positions of the summaries (the layout) shared by every profile with the same sources
+and end uses.
+"""
+
+import functools
+from array import array
+from collections.abc import Iterable
+from collections.abc import Iterator
+from typing import Any
+from typing import Literal
+from typing import NamedTuple
+
+from .types.basic import MonthNumber
+from .types.enums import DomesticEnergyEndUse
+from .types.enums import EnergySource
+from .types.home import EnergyConsumptionSummary
+from .types.home import EnergyProfile
+
+Figure = Literal["energy", "co2e", "operating_cost"]
+
+FIGURES: tuple[Figure, ...] = ("energy", "co2e", "operating_cost")
+"""The figures of each EnergyConsumptionSummary, in storage order."""
+
+
+class SummarySlot(NamedTuple):
+    """Position of one EnergyConsumptionSummary in an EnergyProfile."""
+
+    field: str
+    month: MonthNumber | None
+    key: EnergySource | DomesticEnergyEndUse | None
+
+
+class Summary(NamedTuple):
+    """Lightweight EnergyConsumptionSummary."""
+
+    energy: float
+    co2e: float
+    operating_cost: float
+
+
+def iter_summaries(
+    profile: EnergyProfile,
+) -> Iterator[tuple[SummarySlot, EnergyConsumptionSummary]]:
+    yield SummarySlot("annual_energy_total", None, None), profile.annual_energy_total
+    for field in ("annual_energy_sources", "annual_energy_end_use"):
+        for key, summary in getattr(profile, field).items():
+            yield SummarySlot(field, None, key), summary
+    for month, summary in profile.monthly_energy_total.items():
+        yield SummarySlot("monthly_energy_total", month, None), summary
+    for field in ("monthly_energy_sources", "monthly_energy_end_use"):
+        for month, summaries in getattr(profile, field).items():
+            for key, summary in summaries.items():
+                yield SummarySlot(field, month, key), summary
+
+
+def summary_fields(
+    summaries: Iterable[tuple[SummarySlot, EnergyConsumptionSummary]],
+) -> dict[str, Any]:
+    """
+    The consumption fields of an EnergyProfile, nested as in the model, from summaries.
+
+    A missing annual_energy_total is all zeros.
+    """
+    fields: dict[str, Any] = {
+        "annual_energy_total": EnergyConsumptionSummary(
+            energy=0, co2e=0, operating_cost=0
+        ),
+        "annual_energy_sources": {},
+        "annual_energy_end_use": {},
+        "monthly_energy_total": {},
+        "monthly_energy_sources": {},
+        "monthly_energy_end_use": {},
+    }
+    for slot, summary in summaries:
+        if slot.month is None and slot.key is None:
+            fields[slot.field] = summary
+        elif slot.month is None:
+            fields[slot.field][slot.key] = summary
+        elif slot.key is None:
+            fields[slot.field][slot.month] = summary
+        else:
+            fields[slot.field].setdefault(slot.month, {})[slot.key] = summary
+    return fields
+
+
+class SummaryLayout:
+    """
+    The slots of the summaries stored in EnergySummaries, and their indexes.
+    """
+
+    __slots__ = ("slots", "index")
+
+    def __init__(self, slots: tuple[SummarySlot, ...]) -> None:
+        self.slots = slots
+        self.index = {slot: index for index, slot in enumerate(slots)}
+
+
+@functools.lru_cache(maxsize=256)
+def _shared_layout(slots: tuple[SummarySlot, ...]) -> SummaryLayout:
+    return SummaryLayout(slots)
+
+
+class EnergySummaries:
+    """
+    The EnergyConsumptionSummary figures of an EnergyProfile, in one array of floats.
+    """
+
+    __slots__ = ("layout", "values")
+
+    def __init__(self, layout: SummaryLayout, values: array) -> None:
+        self.layout = layout
+        self.values = values
+        """The figures (FIGURES) of each slot of the layout, one after the other."""
+
+    @classmethod
+    def from_profile(cls, profile: EnergyProfile) -> "EnergySummaries":
+        slots = []
+        values = array("d")
+        for slot, summary in iter_summaries(profile):
+            slots.append(slot)
+            values.extend((summary.energy, summary.co2e, summary.operating_cost))
+        return cls(_shared_layout(tuple(slots)), values)
+
+    def __len__(self) -> int:
+        return len(self.layout.slots)
+
+    def get(
+        self,
+        field: str,
+        month: MonthNumber | None = None,
+        key: EnergySource | DomesticEnergyEndUse | None = None,
+    ) -> Summary | None:
+        index = self.layout.index.get(SummarySlot(field, month, key))
+        if index is None:
+            return None
+        offset = index * len(FIGURES)
+        return Summary._make(self.values[offset : offset + len(FIGURES)])
+
+    def __iter__(self) -> Iterator[tuple[SummarySlot, Summary]]:
+        values = iter(self.values)
+        for slot in self.layout.slots:
+            yield slot, Summary(next(values), next(values), next(values))
+
+    def to_fields(self) -> dict[str, Any]:
+        """
+        The consumption fields of the EnergyProfile, as pydantic models.
+
+        Combine with the other fields of the profile to rebuild it, e.g.
+        ``EnergyProfile(**other_fields, **summaries.to_fields())``.
+        """
+        return summary_fields(
+            (slot, EnergyConsumptionSummary(**summary._asdict()))
+            for slot, summary in self
+        )
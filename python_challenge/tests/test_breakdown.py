@@ -0,0 +1,106 @@
+from pathlib import Path
+
+import pytest
+
+from python_challenge import utils
+from python_challenge.breakdown import BASELINE
+from python_challenge.breakdown import EnergyColumns
+from python_challenge.breakdown import get_energy_columns
+from python_challenge.fuels import fuel_class
+from python_challenge.types.retrofit_planner import RetrofitPlannerResponsePublic
+
+
+def test_total(plan: RetrofitPlannerResponsePublic):
+    columns = EnergyColumns.from_results(plan)
+
+    assert columns.stages == 3
+    [cell] = columns.breakdown([], "co2e")
+    assert cell.key == ()
+    assert cell.value == pytest.approx(
+        plan.baseline_energy_profile.annual_energy_total.co2e
+    )
+
+
+def test_by_stage(plan: RetrofitPlannerResponsePublic):
+    cells = EnergyColumns.from_results(plan).breakdown(["stage"])
+
+    assert [cell.key for cell in cells] == [("baseline",), (0,), (1,), (2,)]
+    assert cells[0].value == pytest.approx(
+        plan.baseline_energy_profile.annual_energy_total.energy
+    )
+    assert cells[3].value == pytest.approx(
+        plan.improvement_plan[2].energy_profile.annual_energy_total.energy
+    )
+
+
+def test_by_month_and_end_use(plan: RetrofitPlannerResponsePublic):
+    columns = EnergyColumns.from_results(plan)
+
+    cells = columns.breakdown(["month", "end_use"], "operating_cost", stages=[1])
+
+    profile = plan.improvement_plan[1].energy_profile
+    expected = [
+        ((month, end_use), summary.operating_cost)
+        for month, summaries in profile.monthly_energy_end_use.items()
+        for end_use, summary in summaries.items()
+    ]
+    assert sorted(cell.key for cell in cells) == sorted(key for key, _ in expected)
+    values = {cell.key: cell.value for cell in cells}
+    for key, value in expected:
+        assert values[key] == pytest.approx(value)
+
+
+def test_by_source_and_fuel_class(plan: RetrofitPlannerResponsePublic):
+    columns = EnergyColumns.from_results(plan)
+
+    by_source = columns.breakdown(["source"])
+    by_fuel_class = columns.breakdown(["stage", "fuel_class"], stages=[BASELINE, 0])
+
+    sources = plan.baseline_energy_profile.annual_energy_sources
+    assert {cell.key[0]: cell.value for cell in by_source} == {
+        source: pytest.approx(summary.energy) for source, summary in sources.items()
+    }
+    baseline = {
+        cell.key[1]: cell.value for cell in by_fuel_class if cell.key[0] == "baseline"
+    }
+    for fuel in baseline:
+        assert baseline[fuel] == pytest.approx(
+            sum(
+                summary.energy
+                for source, summary in sources.items()
+                if fuel_class(source) == fuel
+            )
+        )
+    assert {cell.key[0] for cell in by_fuel_class} == {"baseline", 0}
+
+
+@pytest.mark.parametrize(
+    "group_by,stages",
+    [
+        (["month", "month"], None),
+        (["source", "end_use"], None),
+        (["fuel_class", "end_use"], None),
+        (["month"], [BASELINE, 0]),
+    ],
+    ids=["twice", "source by end use", "fuel class by end use", "stages not grouped"],
+)
+def test_invalid(plan: RetrofitPlannerResponsePublic, group_by, stages):
+    with pytest.raises(ValueError):
+        EnergyColumns.from_results(plan).breakdown(group_by, stages=stages)
+
+
+@pytest.mark.parametrize("stage", [3, -2])
+def test_unknown_stage(plan: RetrofitPlannerResponsePublic, stage: int):
+    with pytest.raises(IndexError):
+        EnergyColumns.from_results(plan).breakdown(["stage"], stages=[stage])
+
+
+def test_get_energy_columns(
+    path_data: Path, run_id: str, results: RetrofitPlannerResponsePublic
+):
+    utils.save_results(results)
+
+    columns = get_energy_columns(run_id)
+
+    assert get_energy_columns(run_id) is columns
+    assert len(columns) == len(EnergyColumns.from_results(results))
@@ -0,0 +1,108 @@
+import json
+
+import pytest
+
+from python_challenge.compact import CompactImprovementEnergyProfile
+from python_challenge.compact import CompactRetrofitPlannerResponse
+from python_challenge.compact import PatchOperation
+from python_challenge.compact import json_diff
+from python_challenge.compact import json_patch
+from python_challenge.types.retrofit_planner import RetrofitPlannerResponsePublic
+
+
+@pytest.mark.parametrize(
+    "source,target",
+    [
+        ({"a": 1, "b": [1, 2]}, {"a": 1, "b": [1, 2]}),
+        ({"a": 1, "b": 2}, {"a": 1, "c": 3}),
+        ({"a": [1, {"b": 2}]}, {"a": [1, {"b": 3}]}),
+        ({"a": [1, 2]}, {"a": [1, 2, 3]}),
+        ({"a": 1}, {"a": 1.0}),
+        ({"a": 1}, {"a": True}),
+        ({"a/b": 1, "c~d": 2}, {"a/b": 3, "c~d": 4}),
+        ([1], {"a": 1}),
+        ({"a": None}, {"a": {"b": None}}),
+    ],
+)
+def test_json_diff_round_trip(source, target):
+    patched = json_patch(source, json_diff(source, target))
+    # Compare as JSON, in python 1 == 1.0 == True.
+    assert json.dumps(patched, sort_keys=True) == json.dumps(target, sort_keys=True)
+
+
+def test_json_diff_minimal():
+    assert json_diff({"a": {"b": 1, "c": 2}}, {"a": {"b": 1, "c": 3}}) == [
+        PatchOperation(op="replace", path="/a/c", value=3)
+    ]
+    assert json_diff({"a": 1}, {"a": 1}) == []
+
+
+def test_json_patch_does_not_change_document():
+    document = {"a": [1, 2]}
+    patched = json_patch(
+        document,
+        [
+            PatchOperation(op="add", path="/a/-", value=3),
+            PatchOperation(op="add", path="/a/0", value=0),
+            PatchOperation(op="remove", path="/a/1"),
+        ],
+    )
+    assert patched == {"a": [0, 2, 3]}
+    assert document == {"a": [1, 2]}
+
+
+@pytest.mark.parametrize(
+    "operation",
+    [
+        PatchOperation(op="replace", path="/b", value=1),
+        PatchOperation(op="remove", path="/b"),
+        PatchOperation(op="replace", path="/a/x", value=1),
+        PatchOperation(op="replace", path="/a/5", value=1),
+        PatchOperation(op="add", path="/a/0/b", value=1),
+        PatchOperation(op="remove", path=""),
+    ],
+)
+def test_json_patch_invalid(operation: PatchOperation):
+    with pytest.raises(ValueError):
+        json_patch({"a": [1]}, [operation])
+
+
+class TestCompactRetrofitPlannerResponse:
+
+    def test_round_trip(self, results: RetrofitPlannerResponsePublic):
+        compact = CompactRetrofitPlannerResponse.from_results(results)
+        assert compact.to_results() == results
+
+    def test_round_trip_json(self, results: RetrofitPlannerResponsePublic):
+        compact = CompactRetrofitPlannerResponse.from_results(results)
+        loaded = CompactRetrofitPlannerResponse.model_validate_json(
+            compact.model_dump_json()
+        )
+        assert loaded.to_results() == results
+        assert len(loaded.model_dump_json()) < len(results.model_dump_json())
+
+    def test_improved_home_is_lazy(self, results: RetrofitPlannerResponsePublic):
+        compact = CompactRetrofitPlannerResponse.from_results(results)
+        stage = compact.improvement_plan[0]
+        assert "improved_home" not in stage.__dict__
+        assert stage.improved_home == results.improvement_plan[0].improved_home
+        assert stage.improved_home is stage.improved_home
+
+    def test_improved_home_without_baseline(
+        self, results: RetrofitPlannerResponsePublic
+    ):
+        stage = CompactImprovementEnergyProfile.from_profile(
+            results.improvement_plan[0],
+            results.baseline_home.model_dump(mode="json"),
+        )
+        with pytest.raises(ValueError):
+            stage.improved_home
+
+
+def test_patch_operation_json():
+    assert PatchOperation(op="remove", path="/a").model_dump_json() == (
+        '{"op":"remove","path":"/a"}'
+    )
+    assert PatchOperation(op="replace", path="/a").model_dump_json() == (
+        '{"op":"replace","path":"/a","value":null}'
+    )
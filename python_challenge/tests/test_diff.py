@@ -0,0 +1,80 @@
+from decimal import Decimal
+from pathlib import Path
+
+import pydantic
+
+from python_challenge import utils
+from python_challenge.diff import FieldChange
+from python_challenge.diff import diff_models
+from python_challenge.diff import diff_plan
+from python_challenge.diff import get_plan_changes
+from python_challenge.types.home import Home
+from python_challenge.types.retrofit_planner import RetrofitPlannerResponsePublic
+
+
+def test_diff_same_home(home: Home):
+    assert diff_models(home, home) == []
+    assert diff_models(home, home.model_copy(deep=True)) == []
+
+
+def test_diff_fields(home: Home):
+    improved = home.model_copy(deep=True)
+    improved.wall.has_insulation = not home.wall.has_insulation
+    improved.doors[0].average_thermal_transmittance = Decimal("1.4")
+    improved.levels = [*home.levels, *home.levels]
+
+    assert diff_models(home, improved) == [
+        FieldChange("levels", home.levels, improved.levels),
+        FieldChange(
+            "wall.has_insulation",
+            home.wall.has_insulation,
+            not home.wall.has_insulation,
+        ),
+        FieldChange(
+            "doors.0.average_thermal_transmittance",
+            home.doors[0].average_thermal_transmittance,
+            Decimal("1.4"),
+        ),
+    ]
+
+
+def test_diff_dicts(results: RetrofitPlannerResponsePublic):
+    changes = diff_models(
+        results.baseline_home, results.improvement_plan[0].improved_home
+    )
+    paths = {change.path: change for change in changes}
+    # A key only in the improved Home.
+    assert paths["main_heating_systems.0.efficiency.Hot water"].old is None
+    # A model of a different type.
+    assert paths["main_heating_systems.0.source_properties"].new.system_type == (
+        "heat_pump"
+    )
+
+
+class Model(pydantic.BaseModel):
+    values: dict[str, int] | None
+
+
+def test_diff_dict_with_none():
+    assert diff_models(Model(values={"a": 1}), Model(values=None)) == [
+        FieldChange("values", {"a": 1}, None)
+    ]
+
+
+def test_diff_plan(results: RetrofitPlannerResponsePublic):
+    stages = diff_plan(results)
+    assert len(stages) == len(results.improvement_plan)
+    assert "wall.has_insulation" in {change.path for change in stages[0]}
+
+
+def test_get_plan_changes(
+    path_data: Path, results: RetrofitPlannerResponsePublic, run_id: str
+):
+    utils.save_results(results)
+    stages = get_plan_changes(uuid=run_id)
+    assert stages == diff_plan(results)
+    assert get_plan_changes(uuid=run_id) is stages
+
+    results.improvement_plan = []
+    utils.save_results(results)
+    assert get_plan_changes(uuid=run_id) == []
@@ -0,0 +1,98 @@
+import pytest
+
+from python_challenge import enum_codes as enum_codes_module
+from python_challenge.enum_codes import NONE
+from python_challenge.enum_codes import EnumCodes
+from python_challenge.enum_codes import assign_codes
+from python_challenge.enum_codes import enum_codes
+from python_challenge.enum_codes import enum_name
+from python_challenge.enum_codes import read_table
+from python_challenge.enum_codes import str_enums
+from python_challenge.types import enums
+from python_challenge.types import epc_enums
+from python_challenge.types.enums import DomesticEnergyEndUse
+from python_challenge.types.enums import EnergySource
+
+
+def test_table_complete():
+    table = read_table()
+
+    # Run the update_enum_codes command when this fails.
+    assert assign_codes(table, str_enums()) == table
+    codes = [code for codes in table.values() for code in codes.values()]
+    assert len(set(codes)) == len(codes)
+    assert NONE not in codes
+
+
+def test_str_enums():
+    classes = str_enums()
+
+    assert EnergySource in classes
+    assert enums.WindowGlazingType in classes
+    assert epc_enums.WindowGlazingType in classes
+    assert len(set(map(enum_name, classes))) == len(classes)
+
+
+def test_assign_codes():
+    table = {enum_name(DomesticEnergyEndUse): {"SPACE_HEATING": 3, "REMOVED": 9}}
+
+    assigned = assign_codes(table, [DomesticEnergyEndUse])
+
+    codes = assigned[enum_name(DomesticEnergyEndUse)]
+    assert codes["SPACE_HEATING"] == 3
+    assert codes["REMOVED"] == 9
+    assert codes["HOT_WATER"] == 10
+    assert sorted(codes.values()) == [3, *range(9, 9 + len(DomesticEnergyEndUse))]
+    # Unchanged.
+    assert len(table[enum_name(DomesticEnergyEndUse)]) == 2
+
+
+def test_lookup():
+    registry = enum_codes()
+
+    for cls in str_enums():
+        assert cls in registry
+        for member in cls:
+            assert registry.member(registry.code(member)) is member
+            assert (
+                registry.value_codes(cls)[member.value] == registry.codes(cls)[member]
+            )
+    assert len(registry) == 1 + max(
+        code for cls in str_enums() for code in registry.codes(cls).values()
+    )
+    assert int not in registry
+    with pytest.raises(KeyError):
+        registry.member(NONE)
+
+
+def test_equal_members_of_different_enums():
+    registry = enum_codes()
+    ours = enums.WindowGlazingType.DOUBLE_GLAZING
+    theirs = epc_enums.WindowGlazingType.DOUBLE_GLAZING
+    assert ours == theirs
+
+    assert registry.code(ours) != registry.code(theirs)
+    assert registry.member(registry.code(theirs)) is theirs
+
+
+def test_encode_decode():
+    registry = enum_codes()
+    members = [EnergySource.ELECTRIC, None, DomesticEnergyEndUse.LIGHTING]
+
+    codes = registry.encode(members)
+
+    assert codes.dtype == "uint16"
+    assert codes[1] == NONE
+    assert registry.decode(codes.tolist()) == members
+
+
+def test_missing_codes(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(enum_codes_module, "read_table", lambda: {})
+    enum_codes.cache_clear()
+    try:
+        registry = enum_codes()
+    finally:
+        enum_codes.cache_clear()
+
+    # As update_enum_codes would assign them.
+    assert registry.members == EnumCodes(read_table(), str_enums()).members
@@ -0,0 +1,67 @@
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from python_challenge import export
+from python_challenge import utils
+from python_challenge.types.home import Home
+from python_challenge.types.retrofit_planner import RetrofitPlannerResponsePublic
+
+
+def test_iter_keys_batches():
+    keys = [str(i) for i in range(10, 15)]
+    calls = []
+
+    def list_keys(after: str | None, limit: int) -> list[str]:
+        calls.append(after)
+        return [key for key in keys if after is None or key > after][:limit]
+
+    assert list(export._iter_keys(list_keys, batch_size=2)) == keys
+    assert calls == [None, "11", "13"]
+
+
+def test_iter_homes_ndjson(path_data: Path, home: Home):
+    for uprn in ["2", "1"]:
+        home.uprn = uprn
+        utils.save_home(home)
+
+    lines = list(export.iter_ndjson("homes"))
+
+    assert [Home.model_validate_json(line).uprn for line in lines] == ["1", "2"]
+    assert all(line.endswith(b"}\n") for line in lines)
+
+
+def test_iter_results_ndjson(
+    path_data: Path, results: RetrofitPlannerResponsePublic, run_id: str
+):
+    (path_data / f"{run_id}.json").write_text(results.model_dump_json())
+
+    lines = list(export.iter_ndjson("results"))
+
+    assert len(lines) == 1
+    assert RetrofitPlannerResponsePublic.model_validate_json(lines[0]) == results
+
+
+def test_iter_ndjson_skips_deleted(path_data: Path, home: Home, mocker: MockerFixture):
+    utils.save_home(home)
+    mocker.patch(
+        "python_challenge.export.get_home", side_effect=FileNotFoundError("deleted")
+    )
+
+    assert list(export.iter_homes_ndjson()) == []
+
+
+def test_iter_ndjson_skips_invalid(path_data: Path, home: Home):
+    utils.save_home(home)
+    (path_data / "123.json").write_text("{}")
+
+    lines = list(export.iter_homes_ndjson())
+
+    assert [Home.model_validate_json(line) for line in lines] == [home]
+
+
+@pytest.mark.asyncio
+async def test_aiter_lines():
+    lines = [line async for line in export.aiter_lines(iter([b"a\n", b"b\n"]))]
+    assert lines == [b"a\n", b"b\n"]
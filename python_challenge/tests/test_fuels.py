@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from python_challenge import fuels
+from python_challenge.enum_codes import enum_codes
+from python_challenge.fuels import FUEL_CLASSES
+from python_challenge.fuels import NOT_A_SOURCE
+from python_challenge.types import enums
+from python_challenge.types import simulation_enums
+from python_challenge.types.enums import DomesticEnergyEndUse
+from python_challenge.types.retrofit_planner import RetrofitPlannerResponsePublic
+
+
+@pytest.mark.parametrize("cls", [enums.EnergySource, simulation_enums.EnergySource])
+def test_fuel_class(cls: type[enums.EnergySource]):
+    for source in cls:
+        fuel = fuels.fuel_class(source)
+        assert (fuel == "gas") is source.is_gas is (source in fuels.GAS)
+        assert (fuel == "oil") is source.is_oil is (source in fuels.OIL)
+        assert (fuel == "solid") is source.is_solid is (source in fuels.SOLID)
+    assert fuels.fuel_class(cls.ELECTRIC) == "electric"
+    assert fuels.fuel_class(cls.BIOGAS) == "other"
+
+
+def test_classify():
+    codes = enum_codes().encode(
+        [
+            enums.EnergySource.MAINS_GAS,
+            simulation_enums.EnergySource.COAL,
+            enums.EnergySource.ELECTRIC,
+            DomesticEnergyEndUse.LIGHTING,
+            None,
+        ]
+    )
+
+    classes = fuels.classify(codes)
+
+    assert [FUEL_CLASSES[index] for index in classes[:3]] == [
+        "gas",
+        "solid",
+        "electric",
+    ]
+    assert classes[3:].tolist() == [NOT_A_SOURCE, NOT_A_SOURCE]
+
+
+def test_fuel_class_totals(results: RetrofitPlannerResponsePublic):
+    profiles = [
+        results.baseline_energy_profile,
+        results.improvement_plan[-1].energy_profile,
+    ]
+
+    annual = fuels.fuel_class_totals(profiles, "co2e")
+    monthly = fuels.fuel_class_totals(profiles, monthly=True)
+
+    assert annual.shape == (2, len(FUEL_CLASSES))
+    assert monthly.shape == (2, 12, len(FUEL_CLASSES))
+    for row, profile in enumerate(profiles):
+        for index, fuel in enumerate(FUEL_CLASSES):
+            assert annual[row, index] == pytest.approx(
+                sum(
+                    summary.co2e
+                    for source, summary in profile.annual_energy_sources.items()
+                    if fuels.fuel_class(source) == fuel
+                )
+            )
+            assert monthly[row, 0, index] == pytest.approx(
+                sum(
+                    summary.energy
+                    for source, summary in profile.monthly_energy_sources[1].items()
+                    if fuels.fuel_class(source) == fuel
+                )
+            )
+    assert np.sum(annual[0]) == pytest.approx(
+        results.baseline_energy_profile.annual_energy_total.co2e
+    )
+
+
+def test_fuel_class_totals_empty(results: RetrofitPlannerResponsePublic):
+    assert fuels.fuel_class_totals([]).shape == (0, len(FUEL_CLASSES))
+    assert fuels.fuel_class_totals([], monthly=True).shape == (0, 12, len(FUEL_CLASSES))
+
+    no_sources = results.baseline_energy_profile.model_copy(
+        update={"annual_energy_sources": {}, "monthly_energy_sources": {}}
+    )
+
+    assert fuels.fuel_class_totals([no_sources]).tolist() == [[0] * len(FUEL_CLASSES)]
+    assert not fuels.fuel_class_totals([no_sources], monthly=True).any()
@@ -0,0 +1,167 @@
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+from python_challenge import geo
+from python_challenge import utils
+from python_challenge.types.home import Home
+
+
+@pytest.fixture
+def home_index(path_data: Path) -> Iterator[None]:
+    geo.get_home_index.cache_clear()
+    yield
+    geo.get_home_index.cache_clear()
+
+
+def test_haversine():
+    # Edinburgh to London, roughly 534km.
+    distance = geo.haversine(-3.1883, 55.9533, -0.1276, 51.5072)
+    assert distance == pytest.approx(534_000, rel=0.01)
+    assert geo.haversine(1.0, 2.0, 1.0, 2.0) == 0
+
+
+def test_radius_bounding_box():
+    bbox = geo.radius_bounding_box(-3.2, 55.9, 1000)
+    assert bbox.min_latitude == pytest.approx(55.9 - 1000 / geo.METRES_PER_DEGREE)
+    assert (
+        bbox.max_longitude - bbox.min_longitude > bbox.max_latitude - bbox.min_latitude
+    )
+
+
+def test_radius_bounding_box_clamped():
+    bbox = geo.radius_bounding_box(179.9, 89.99, 5000)
+    assert bbox == geo.BoundingBox(-180.0, bbox.min_latitude, 180.0, 90.0)
+
+
+class TestGridIndex:
+
+    def test_invalid_cell_size(self):
+        with pytest.raises(ValueError):
+            geo.GridIndex(cell_size=0)
+
+    def test_invalid_coordinates(self):
+        with pytest.raises(ValueError):
+            geo.GridIndex().insert("1", 55.9, -181)
+
+    def test_within_radius(self):
+        index = geo.GridIndex()
+        index.insert("1", -3.2119865, 55.9593075)
+        index.insert("2", -3.2119865, 55.9620000)  # ~300m north.
+        index.insert("3", -3.2119865, 55.9700000)  # ~1.2km north.
+        index.insert("4", -3.2200000, 55.9593075)  # ~500m west.
+
+        found = index.within_radius(-3.2119865, 55.9593075, 600)
+
+        assert [location.key for location in found] == ["1", "2", "4"]
+        assert found[0].distance == 0
+        assert found[1].distance == pytest.approx(300, abs=5)
+
+    def test_within_radius_dense(self):
+        index = geo.GridIndex()
+        for x in range(20):
+            for y in range(20):
+                index.insert(f"{x}-{y}", x * 0.01 + 0.005, y * 0.01 + 0.005)
+
+        # The bounding box of the circle includes the corners of the 3x3 square, which
+        # are outside the radius. The surrounding cells are partly inside the box.
+        radius = 0.012 * geo.METRES_PER_DEGREE
+        found = index.within_radius(0.105, 0.105, radius)
+
+        assert sorted(location.key for location in found) == [
+            "10-10",
+            "10-11",
+            "10-9",
+            "11-10",
+            "9-10",
+        ]
+
+    def test_within_bbox(self):
+        index = geo.GridIndex()
+        index.insert("1", 0.5, 0.5)
+        index.insert("2", 1.5, 1.5)
+        index.insert("3", -0.5, 0.5)
+
+        found = index.within_bbox(geo.BoundingBox(0, 0, 2, 2))
+
+        assert sorted(location.key for location in found) == ["1", "2"]
+
+    def test_within_bbox_dense(self):
+        index = geo.GridIndex()
+        for x in range(20):
+            for y in range(20):
+                index.insert(f"{x}-{y}", x * 0.01 + 0.005, y * 0.01 + 0.005)
+        index.remove("10-11")
+
+        found = index.within_bbox(geo.BoundingBox(0.1, 0.1, 0.113, 0.113))
+
+        assert [location.key for location in found] == ["10-10"]
+
+    def test_within_large_bbox(self):
+        index = geo.GridIndex(cell_size=0.001)
+        index.insert("1", 0.5, 0.5)
+        index.insert("2", 10, 10)
+
+        found = index.within_bbox(geo.BoundingBox(0, 0, 5, 5))
+
+        assert [location.key for location in found] == ["1"]
+
+    def test_insert_moves_existing(self):
+        index = geo.GridIndex()
+        index.insert("1", 0.5, 0.5)
+        index.insert("1", 1.5, 1.5)
+
+        assert len(index) == 1
+        assert index.within_bbox(geo.BoundingBox(0, 0, 1, 1)) == []
+        assert index.within_radius(1.5, 1.5, 1)[0].key == "1"
+
+    def test_remove(self):
+        index = geo.GridIndex()
+        index.insert("1", 0.5, 0.5)
+        index.insert("2", 0.5, 0.5)
+
+        index.remove("1")
+
+        assert "1" not in index
+        assert "2" in index
+        index.remove("2")
+        assert len(index) == 0
+        with pytest.raises(KeyError):
+            index.remove("2")
+
+
+class TestHomeIndex:
+
+    def test_built_from_store(self, home_index: None, home: Home, uprn: str):
+        utils.save_home(home)
+
+        index = geo.get_home_index()
+
+        assert uprn in index
+        assert geo.get_home_index() is index
+
+    def test_invalid_home_skipped(
+        self, home_index: None, path_data: Path, home: Home, uprn: str
+    ):
+        utils.save_home(home)
+        (path_data / "123.json").write_text("{}")
+
+        index = geo.get_home_index()
+
+        assert uprn in index
+        assert "123" not in index
+
+    def test_updated_on_save(self, home_index: None, home: Home, uprn: str):
+        index = geo.get_home_index()
+        assert uprn not in index
+
+        utils.save_home(home)
+
+        assert uprn in index
+
+    def test_home_without_uprn_not_indexed(self, home: Home):
+        index = geo.GridIndex()
+        home.uprn = None
+        geo._insert_home(index, home)
+        assert len(index) == 0
@@ -0,0 +1,80 @@
+import json
+from collections import Counter
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from python_challenge import hotlist
+from python_challenge.hotlist import AccessCounter
+from python_challenge.hotlist import HotDocument
+
+
+def test_add_counts(path_data: Path, uprn: str, run_id: str):
+    assert hotlist.read_hot_list() == []
+
+    hotlist.add_counts(Counter({("homes", uprn): 1, ("results", run_id): 2}), 1000.0)
+    hotlist.add_counts(Counter({("homes", uprn): 2}), 1000.0 + hotlist.HALF_LIFE)
+
+    assert hotlist.read_hot_list() == [
+        HotDocument("homes", uprn, 2.5),
+        HotDocument("results", run_id, 1.0),
+    ]
+
+
+def test_add_counts_keeps_the_highest(path_data: Path, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr("python_challenge.hotlist.MAX_DOCUMENTS", 2)
+
+    hotlist.add_counts(Counter({("homes", "1"): 1, ("homes", "2"): 3}), 0.0)
+    hotlist.add_counts(Counter({("homes", "3"): 2}), 0.0)
+
+    assert [document.key for document in hotlist.read_hot_list()] == ["2", "3"]
+
+
+@pytest.mark.parametrize("content", ["{", "{}", '{"updated": 0, "documents": [1]}'])
+def test_read_invalid(path_data: Path, content: str):
+    (path_data / "hotlist.json").write_text(content)
+
+    assert hotlist.read_hot_list() == []
+
+
+class TestAccessCounter:
+
+    def test_record(self, path_data: Path, uprn: str):
+        counter = AccessCounter(flush_interval=60)
+
+        counter.record("homes", uprn)
+        counter.record("homes", uprn)
+
+        assert hotlist.read_hot_list() == []
+        counter.flush()
+        assert hotlist.read_hot_list() == [HotDocument("homes", uprn, 2.0)]
+
+    def test_record_flushes_after_interval(self, path_data: Path, uprn: str):
+        counter = AccessCounter(flush_interval=0)
+
+        counter.record("homes", uprn)
+
+        assert hotlist.read_hot_list() == [HotDocument("homes", uprn, 1.0)]
+
+    def test_flush_nothing(self, path_data: Path):
+        AccessCounter().flush()
+
+        assert not (path_data / "hotlist.json").exists()
+
+    def test_flush_fails(self, path_data: Path, uprn: str, mocker: MockerFixture):
+        mocker.patch("python_challenge.hotlist.add_counts", side_effect=PermissionError)
+        counter = AccessCounter()
+        counter.record("homes", uprn)
+
+        counter.flush()
+
+        assert not (path_data / "hotlist.json").exists()
+
+
+def test_record_access(access_counter: AccessCounter, path_data: Path, uprn: str):
+    hotlist.record_access("homes", uprn)
+    access_counter.flush()
+
+    stored = json.loads((path_data / "hotlist.json").read_text())
+    assert stored["documents"] == [["homes", uprn, 1.0]]
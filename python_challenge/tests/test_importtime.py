@@ -0,0 +1,37 @@
+from python_challenge.importtime import ImportTime
+from python_challenge.importtime import by_package
+from python_challenge.importtime import parse_importtime
+from python_challenge.importtime import profile_imports
+
+OUTPUT = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     json.scanner
+import time:       300 |        420 |   json.decoder
+import time:       200 |        620 | json
+some other output
+"""
+
+
+def test_parse_importtime():
+    assert parse_importtime(OUTPUT.splitlines()) == [
+        ImportTime("json.scanner", 120, 120, 2),
+        ImportTime("json.decoder", 300, 420, 1),
+        ImportTime("json", 200, 620, 0),
+    ]
+
+
+def test_by_package():
+    imports = [
+        ImportTime("json.decoder", 300, 420, 1),
+        ImportTime("csv", 250, 250, 0),
+        ImportTime("json", 200, 620, 0),
+    ]
+    assert by_package(imports) == [("json", 500), ("csv", 250)]
+
+
+def test_profile_imports():
+    profile = profile_imports("import python_challenge.types.enums")
+
+    modules = [item.module for item in profile.imports]
+    assert "python_challenge.types.enums" in modules
+    assert profile.elapsed > 0
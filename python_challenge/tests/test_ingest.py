@@ -0,0 +1,90 @@
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from python_challenge import ingest
+from python_challenge import utils
+from python_challenge.types.home import Home
+from python_challenge.types.retrofit_planner import RetrofitPlannerResponsePublic
+
+
+def test_iter_chunks():
+    lines = ["a\n", "\n", "b\n", "c\n", "  \n", "d\n"]
+
+    chunks = list(ingest.iter_chunks(lines, chunk_size=2))
+
+    assert chunks == [[(1, "a\n"), (3, "b\n")], [(4, "c\n"), (6, "d\n")]]
+
+
+def test_validate_chunk(home: Home):
+    original = home.model_copy()
+    valid = home.model_dump_json()
+    home.uprn = None
+
+    validated = ingest.validate_chunk(
+        "homes",
+        [
+            (1, valid),
+            (2, "{not json"),
+            (3, '{"uprn": "1"}'),
+            (4, home.model_dump_json()),
+        ],
+    )
+
+    assert len(validated.documents) == 1
+    key, document = validated.documents[0]
+    assert key == "906205784"
+    assert Home.model_validate_json(document) == original
+    assert [rejected.line_number for rejected in validated.rejected] == [2, 3, 4]
+    assert validated.rejected[0].error.startswith("<document>: Invalid JSON")
+    assert "location: Field required" in validated.rejected[1].error
+    assert validated.rejected[2].error == "Home must have a UPRN to be stored"
+
+
+def test_ingest_homes(path_data: Path, home: Home):
+    lines = []
+    for uprn in range(1, 6):
+        home.uprn = str(uprn)
+        lines.append(home.model_dump_json() + "\n")
+    lines.insert(2, "{}\n")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        report = ingest.ingest_jsonl(
+            lines, "homes", executor, chunk_size=2, max_pending=2
+        )
+
+    assert report.stored == 5
+    assert [rejected.line_number for rejected in report.rejected] == [3]
+    assert utils.list_uprns() == ["1", "2", "3", "4", "5"]
+    assert utils.get_home(uprn="5") == home
+
+
+@pytest.mark.parametrize("chunk_size", [1, 10])
+def test_ingest_duplicates(path_data: Path, home: Home, chunk_size: int):
+    lines = []
+    for floor_area in (50, 75, 99):
+        home.total_floor_area = floor_area
+        lines.append(home.model_dump_json() + "\n")
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        report = ingest.ingest_jsonl(lines, "homes", executor, chunk_size=chunk_size)
+
+    # The last line wins, whether the duplicates share a chunk or not.
+    assert report.stored == 1
+    assert utils.list_uprns() == ["906205784"]
+    assert utils.get_home(uprn="906205784").total_floor_area == 99
+
+
+def test_ingest_results(
+    path_data: Path, results: RetrofitPlannerResponsePublic, run_id: str
+):
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        report = ingest.ingest_jsonl(
+            ["[]", results.model_dump_json()], "results", executor, chunk_size=1
+        )
+
+    assert report.stored == 1
+    assert [rejected.line_number for rejected in report.rejected] == [1]
+    assert utils.list_simulation_ids() == [run_id]
+    assert utils.get_results(uuid=run_id) == results
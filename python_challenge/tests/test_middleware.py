@@ -0,0 +1,181 @@
+import asyncio
+import http
+import json
+import threading
+from collections.abc import Callable
+from pathlib import Path
+from typing import Any
+
+import pytest
+from asgiref.sync import iscoroutinefunction
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpRequest
+from django.http import HttpResponse
+from django.http import JsonResponse
+from django.http.response import HttpResponseBase
+from django.test import Client
+from django.test import RequestFactory
+from django.test.client import AsyncClient
+from django.urls import reverse
+from pytest_django.fixtures import Settings
+from pytest_mock import MockerFixture
+
+from python_challenge.middleware import SkippedOnLeanPaths
+from python_challenge.middleware import TimeBudgetMiddleware
+from python_challenge.types.home import Home
+
+
+@pytest.fixture
+def request_() -> HttpRequest:
+    return RequestFactory().get("/api/homes")
+
+
+@pytest.fixture
+def budget(settings: Settings) -> float:
+    settings.REQUEST_TIME_BUDGET = 0.05
+    return settings.REQUEST_TIME_BUDGET
+
+
+def test_disabled(settings: Settings):
+    settings.REQUEST_TIME_BUDGET = 0
+
+    with pytest.raises(MiddlewareNotUsed):
+        TimeBudgetMiddleware(lambda request: asyncio.sleep(0, HttpResponse()))
+
+
+@pytest.mark.asyncio
+async def test_within_budget(budget: float, request_: HttpRequest):
+    response = HttpResponse()
+
+    async def get_response(request: HttpRequest) -> HttpResponse:
+        return response
+
+    middleware = TimeBudgetMiddleware(get_response)
+
+    assert iscoroutinefunction(middleware)
+    assert await middleware(request_) is response
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("error", [asyncio.CancelledError, ValueError])
+async def test_over_budget(
+    budget: float, request_: HttpRequest, error: type[BaseException]
+):
+    cancelled = asyncio.Event()
+    discarded = asyncio.Event()
+
+    async def get_response(request: HttpRequest) -> HttpResponse:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            asyncio.get_running_loop().call_soon(discarded.set)
+        raise error
+
+    response = await TimeBudgetMiddleware(get_response)(request_)
+
+    assert isinstance(response, JsonResponse)
+    assert response.status_code == http.HTTPStatus.SERVICE_UNAVAILABLE
+    assert response["Retry-After"] == "0"
+    assert json.loads(response.content) == {"detail": "Request took longer than 0.05s."}
+    await discarded.wait()
+    assert cancelled.is_set()
+
+
+@pytest.mark.asyncio
+async def test_sync_view(budget: float, uprn: str, home: Home, mocker: MockerFixture):
+    release = threading.Event()
+    finished = threading.Event()
+
+    def get_home(uprn: str) -> Home:
+        release.wait(5)
+        finished.set()
+        return home
+
+    mocker.patch("python_challenge.api.views.get_home", side_effect=get_home)
+
+    response = await AsyncClient().get(reverse("get-home", kwargs={"uprn": uprn}))
+
+    # Responded while the view is still running.
+    assert response.status_code == http.HTTPStatus.SERVICE_UNAVAILABLE
+    assert not finished.is_set()
+    release.set()
+    assert await asyncio.to_thread(finished.wait, 5)
+
+
+class Recording:
+    """Middleware recording which of its methods are called."""
+
+    calls: list[str] = []
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]):
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        self.calls.append("__call__")
+        return self.get_response(request)
+
+    def process_view(self, request: HttpRequest, *args: Any) -> None:
+        self.calls.append("process_view")
+
+    def process_exception(self, request: HttpRequest, exception: Exception) -> None:
+        self.calls.append("process_exception")
+
+    def process_template_response(
+        self, request: HttpRequest, response: HttpResponseBase
+    ) -> HttpResponseBase:
+        self.calls.append("process_template_response")
+        return response
+
+
+class RecordingSkippedOnLeanPaths(SkippedOnLeanPaths):
+    wrapped = f"{__name__}.Recording"
+
+
+@pytest.mark.parametrize(
+    ("path", "expected"),
+    [
+        ("/api/homes", []),
+        (
+            "/docs/",
+            [
+                "process_view",
+                "process_exception",
+                "process_template_response",
+                "__call__",
+            ],
+        ),
+    ],
+)
+def test_skipped_on_lean_paths(
+    settings: Settings, monkeypatch: pytest.MonkeyPatch, path: str, expected: list[str]
+):
+    settings.LEAN_PATH_PREFIXES = ["/api/"]
+    monkeypatch.setattr(Recording, "calls", [])
+    request = RequestFactory().get(path)
+    response = HttpResponse()
+    middleware = RecordingSkippedOnLeanPaths(lambda request: response)
+
+    assert middleware.process_view(request, None, (), {}) is None
+    assert middleware.process_exception(request, ValueError()) is None
+    assert middleware.process_template_response(request, response) is response
+    assert middleware(request) is response
+    assert Recording.calls == expected
+
+
+def test_skipped_on_lean_paths_hooks(settings: Settings):
+    class NoHooks(SkippedOnLeanPaths):
+        wrapped = "django.middleware.common.CommonMiddleware"
+
+    middleware = NoHooks(lambda request: HttpResponse())
+
+    assert not hasattr(middleware, "process_view")
+    assert not hasattr(middleware, "process_template_response")
+
+
+@pytest.mark.parametrize(("path", "lean"), [("/api/homes", True), ("/docs/", False)])
+def test_settings(client: Client, path_data: Path, path: str, lean: bool):
+    request = client.get(path).wsgi_request
+
+    assert hasattr(request, "session") is not lean
+    assert hasattr(request, "_messages") is not lean
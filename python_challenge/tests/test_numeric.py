@@ -0,0 +1,72 @@
+import math
+from decimal import Decimal
+
+import pytest
+
+from python_challenge.numeric import FabricTable
+from python_challenge.numeric import specification_u_values
+from python_challenge.numeric import to_float
+from python_challenge.types.home import Home
+from python_challenge.types.recommendations import Improvement
+from python_challenge.types.retrofit_planner import RetrofitPlannerResponsePublic
+
+
+def test_to_float():
+    assert to_float(Decimal("0.16")) == 0.16
+    assert math.isnan(to_float(None))
+    # Which was a float, so converts back exactly.
+    value = Decimal("1.7184332484519738")
+    assert Decimal(repr(to_float(value))) == value
+
+
+def test_fabric_table(home: Home, results: RetrofitPlannerResponsePublic):
+    improved = results.improvement_plan[0].improved_home
+    no_roof = home.model_copy(update={"roof": None, "doors": None})
+    assert home.wall and home.roof and home.glazing and home.doors
+
+    table = FabricTable.from_homes([home, improved, no_roof])
+
+    assert len(table) == 3
+    assert table.uprns == [home.uprn, improved.uprn, home.uprn]
+    assert table["wall_u_value"][0] == float(
+        home.wall.average_thermal_transmittance or 0
+    )
+    assert table["glazing_u_value"][0] == float(
+        home.glazing.average_thermal_transmittance or 0
+    )
+    assert table["door_u_value"][0] == float(
+        home.doors[0].average_thermal_transmittance or 0
+    )
+    assert math.isnan(table["door_u_value"][2])
+    # A boiler, then a heat pump.
+    assert math.isnan(table["heat_pump_output"][0])
+    assert table["heat_pump_output"][1] == 7.0
+
+    heat_loss = table.opaque_heat_loss()
+
+    assert heat_loss[0] == pytest.approx(
+        float(home.wall.average_thermal_transmittance or 0)
+        * (home.wall.surface_area or 0)
+        + float(home.roof.average_thermal_transmittance or 0)
+        * (home.roof.surface_area or 0)
+    )
+    assert heat_loss[1] < heat_loss[0]
+    assert heat_loss[2] == pytest.approx(
+        float(home.wall.average_thermal_transmittance or 0)
+        * (home.wall.surface_area or 0)
+    )
+
+
+def test_specification_u_values(results: RetrofitPlannerResponsePublic):
+    improvements: list[Improvement] = list(results.improvement_plan[0].improvements)
+    first = improvements[0]
+    several = first.model_copy(
+        update={"specification": [improvements[-1].specification, first.specification]}
+    )
+
+    u_values = specification_u_values([*improvements, several])
+
+    assert u_values[:5].tolist() == [0.16, 0.25, 0.30, 1.1, 1.4]
+    # Solar PV and the heat pump have none.
+    assert math.isnan(u_values[5]) and math.isnan(u_values[6])
+    assert u_values[7] == 0.16
@@ -0,0 +1,118 @@
+import math
+import uuid
+
+import numpy as np
+import pytest
+
+from python_challenge.peaks import PeakTable
+from python_challenge.peaks import diversity_factor
+from python_challenge.types.enums import DomesticEnergyEndUse
+from python_challenge.types.enums import EnergySource
+from python_challenge.types.pas2035 import PAS2035ImprovementMeasure
+from python_challenge.types.retrofit_planner import RetrofitPlannerResponsePublic
+
+
+@pytest.fixture
+def portfolio(
+    results: RetrofitPlannerResponsePublic,
+) -> list[RetrofitPlannerResponsePublic]:
+    """The results, with a plan of 2 stages, and with no plan."""
+    return [
+        results,
+        results.model_copy(
+            update={
+                "simulation_id": uuid.uuid4(),
+                "improvement_plan": results.improvement_plan * 2,
+            }
+        ),
+        results.model_copy(
+            update={"simulation_id": uuid.uuid4(), "improvement_plan": []}
+        ),
+    ]
+
+
+def test_from_results(
+    portfolio: list[RetrofitPlannerResponsePublic],
+    results: RetrofitPlannerResponsePublic,
+):
+    table = PeakTable.from_results(portfolio)
+
+    assert len(table) == 3
+    assert table.stages == 3
+    baseline = results.baseline_energy_profile.peak_hourly_energy_sources
+    after = results.improvement_plan[0].energy_profile.peak_hourly_energy_sources
+    electric = table.column(EnergySource.ELECTRIC)
+    assert (
+        electric[0].tolist()
+        == [float(baseline[EnergySource.ELECTRIC])]
+        + [float(after[EnergySource.ELECTRIC])] * 2
+    )
+    # No plan, so the baseline's peaks throughout.
+    assert electric[2].tolist() == [float(baseline[EnergySource.ELECTRIC])] * 3
+    # Not in the improved profile.
+    assert table.column(EnergySource.MAINS_GAS)[0, 1] == 0
+    assert table.column(EnergySource.OIL).sum() == 0
+
+
+def test_end_use(portfolio: list[RetrofitPlannerResponsePublic]):
+    table = PeakTable.from_results(portfolio, "peak_daily_energy_end_use")
+
+    assert DomesticEnergyEndUse.SPACE_HEATING in table.keys
+    assert table.column(DomesticEnergyEndUse.SPACE_HEATING)[0, 0] == float(
+        portfolio[0].baseline_energy_profile.peak_daily_energy_end_use[
+            DomesticEnergyEndUse.SPACE_HEATING
+        ]
+    )
+
+
+def test_distribution(portfolio: list[RetrofitPlannerResponsePublic]):
+    table = PeakTable.from_results(portfolio)
+    electric = table.column(EnergySource.ELECTRIC)
+
+    assert table.distribution(EnergySource.ELECTRIC, 1, [0, 100]).tolist() == [
+        electric[:, 1].min(),
+        electric[:, 1].max(),
+    ]
+
+
+def test_diversity_factor():
+    assert diversity_factor(1, 0.4) == 1
+    assert diversity_factor(1000, 0.4) == pytest.approx(0.4006)
+    with pytest.raises(ValueError):
+        diversity_factor(0, 0.4)
+    with pytest.raises(ValueError):
+        diversity_factor(10, 0)
+
+
+def test_stage_totals_and_deltas(portfolio: list[RetrofitPlannerResponsePublic]):
+    table = PeakTable.from_results(portfolio)
+    electric = table.column(EnergySource.ELECTRIC)
+
+    totals = table.stage_totals(EnergySource.ELECTRIC, 0.5)
+
+    factor = diversity_factor(3, 0.5)
+    assert totals == pytest.approx(electric.sum(axis=0) * factor)
+    assert table.stage_deltas(EnergySource.ELECTRIC, 0.5) == pytest.approx(
+        np.diff(totals)
+    )
+    assert table.stage_deltas(EnergySource.ELECTRIC)[0] == pytest.approx(
+        electric[:2, 1].sum() - electric[:2, 0].sum()
+    )
+
+
+def test_measure_deltas(portfolio: list[RetrofitPlannerResponsePublic]):
+    table = PeakTable.from_results(portfolio)
+    electric = table.column(EnergySource.ELECTRIC)
+
+    deltas = table.measure_deltas(
+        PAS2035ImprovementMeasure.AIR_SOURCE_HEAT_PUMP, EnergySource.ELECTRIC
+    )
+
+    # Adopted at the first stage of both plans.
+    assert deltas[:2] == pytest.approx(electric[:2, 1] - electric[:2, 0])
+    assert math.isnan(deltas[2])
+    assert np.isnan(
+        table.measure_deltas(
+            PAS2035ImprovementMeasure.GROUND_SOURCE_HEAT_PUMP, EnergySource.ELECTRIC
+        )
+    ).all()
@@ -0,0 +1,127 @@
+import uuid
+
+import numpy as np
+import pytest
+
+from python_challenge.ranking import OptionTable
+from python_challenge.types.home import EnergyConsumptionSummary
+from python_challenge.types.recommendations import ImprovementEnergyProfile
+from python_challenge.types.retrofit_planner import RetrofitPlannerResponsePublic
+
+
+def make_option(
+    stage: ImprovementEnergyProfile,
+    costs: list[tuple[int, int] | None],
+    energy: float,
+    co2e: float,
+    operating_cost: float,
+) -> ImprovementEnergyProfile:
+    improvements = [
+        improvement.model_copy(update={"capital_cost": cost})
+        for improvement, cost in zip(stage.improvements, costs)
+    ]
+    relative_energy_change = stage.relative_energy_change.model_copy(
+        update={
+            "annual_energy_total": EnergyConsumptionSummary(
+                energy=energy, co2e=co2e, operating_cost=operating_cost
+            )
+        }
+    )
+    return stage.model_copy(
+        update={
+            "improvements": improvements,
+            "relative_energy_change": relative_energy_change,
+        }
+    )
+
+
+@pytest.fixture
+def portfolio(
+    results: RetrofitPlannerResponsePublic,
+) -> list[RetrofitPlannerResponsePublic]:
+    stage = results.improvement_plan[0]
+    first = results.model_copy(
+        update={
+            "improvement_option_evaluation": [
+                make_option(stage, [(1000, 2000)], -100, -10, -100),
+                make_option(stage, [(1000, 1000), (500, 3000)], -3000, -10, -300),
+                # Unknown cost.
+                make_option(stage, [(1000, 1000), None], -3000, -10, -300),
+            ]
+        }
+    )
+    second = results.model_copy(
+        update={
+            "simulation_id": uuid.uuid4(),
+            "improvement_option_evaluation": [
+                # Increases energy use.
+                make_option(stage, [(100, 100)], 50, 5, 10),
+                make_option(stage, [(200, 400)], -1000, -50, -100),
+            ],
+        }
+    )
+    return [first, results.model_copy(), second]
+
+
+def test_from_results(portfolio: list[RetrofitPlannerResponsePublic]):
+    table = OptionTable.from_results(portfolio)
+
+    assert len(table) == 5
+    assert table.simulation_ids == [str(results.simulation_id) for results in portfolio]
+    assert table.simulation_index.tolist() == [0, 0, 0, 2, 2]
+    assert table.option_index.tolist() == [0, 1, 2, 0, 1]
+    np.testing.assert_array_equal(table.cost_low, [1000, 1500, np.nan, 100, 200])
+    np.testing.assert_array_equal(table.cost_high, [2000, 4000, np.nan, 100, 400])
+    np.testing.assert_array_equal(table.energy_saved, [100, 3000, 3000, -50, 1000])
+    np.testing.assert_array_equal(table.co2e_saved, [10, 10, 10, -5, 50])
+    np.testing.assert_array_equal(table.operating_cost_saved, [100, 300, 300, -10, 100])
+
+
+def test_empty():
+    table = OptionTable.from_results([])
+    assert len(table) == 0
+    assert table.rank("cost_per_kwh").tolist() == []
+
+
+def test_metric(portfolio: list[RetrofitPlannerResponsePublic]):
+    table = OptionTable.from_results(portfolio)
+
+    np.testing.assert_allclose(
+        table.metric("cost_per_kwh"), [10, 0.5, np.nan, np.nan, 0.2]
+    )
+    np.testing.assert_allclose(
+        table.metric("cost_per_co2e", "high"), [200, 400, np.nan, np.nan, 8]
+    )
+    np.testing.assert_allclose(
+        table.metric("payback_years"), [10, 5, np.nan, np.nan, 2]
+    )
+
+
+def test_rank(portfolio: list[RetrofitPlannerResponsePublic]):
+    table = OptionTable.from_results(portfolio)
+
+    assert table.rank("cost_per_kwh").tolist() == [4, 1, 0, 2, 3]
+    assert table.rank("cost_per_co2e", "high").tolist() == [4, 0, 1, 2, 3]
+    assert table.rank("cost_per_kwh", limit=2).tolist() == [4, 1]
+    assert table.rank("cost_per_kwh", limit=10).tolist() == [4, 1, 0, 2, 3]
+
+
+def test_rank_large():
+    rng = np.random.default_rng(0)
+    size = 100_000
+    cost = rng.uniform(100, 10_000, size)
+    saved = rng.uniform(-100, 5000, size)
+    table = OptionTable(
+        simulation_ids=[],
+        simulation_index=np.zeros(size, dtype=np.int64),
+        option_index=np.arange(size),
+        cost_low=cost,
+        cost_high=cost,
+        energy_saved=saved,
+        co2e_saved=saved,
+        operating_cost_saved=saved,
+    )
+
+    values = table.metric("cost_per_kwh")
+    best = table.rank("cost_per_kwh", limit=100)
+    np.testing.assert_array_equal(values[best], np.sort(values)[:100])
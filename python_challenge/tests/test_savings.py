@@ -0,0 +1,97 @@
+from pathlib import Path
+
+import pytest
+
+from python_challenge import utils
+from python_challenge.savings import PlanPrefixSums
+from python_challenge.savings import get_cumulative_energy_change
+from python_challenge.types.enums import EnergySource
+from python_challenge.types.home import EnergyConsumptionSummary
+from python_challenge.types.retrofit_planner import RetrofitPlannerResponsePublic
+
+
+def assert_summary_equal(
+    actual: EnergyConsumptionSummary, expected: EnergyConsumptionSummary, times: int
+):
+    assert actual.energy == pytest.approx(expected.energy * times)
+    assert actual.co2e == pytest.approx(expected.co2e * times)
+    assert actual.operating_cost == pytest.approx(expected.operating_cost * times)
+
+
+def test_cumulative(plan: RetrofitPlannerResponsePublic):
+    stage = plan.improvement_plan[0].relative_energy_change
+    cumulative = PlanPrefixSums.from_plan(plan).cumulative()
+
+    assert len(cumulative) == 3
+    for times, change in enumerate(cumulative, 1):
+        assert_summary_equal(
+            change.annual_energy_total, stage.annual_energy_total, times
+        )
+        assert change.annual_energy_sources.keys() == stage.annual_energy_sources.keys()
+        for source, summary in stage.annual_energy_sources.items():
+            assert_summary_equal(change.annual_energy_sources[source], summary, times)
+        for end_use, summary in stage.annual_energy_end_use.items():
+            assert_summary_equal(change.annual_energy_end_use[end_use], summary, times)
+        for month, summary in stage.monthly_energy_total.items():
+            assert_summary_equal(change.monthly_energy_total[month], summary, times)
+        for month, summaries in stage.monthly_energy_sources.items():
+            for source, summary in summaries.items():
+                assert_summary_equal(
+                    change.monthly_energy_sources[month][source], summary, times
+                )
+        for month, summaries in stage.monthly_energy_end_use.items():
+            for end_use, summary in summaries.items():
+                assert_summary_equal(
+                    change.monthly_energy_end_use[month][end_use], summary, times
+                )
+
+
+def test_summary(plan: RetrofitPlannerResponsePublic):
+    stage = plan.improvement_plan[0].relative_energy_change
+    sums = PlanPrefixSums.from_plan(plan)
+
+    assert_summary_equal(
+        sums.summary(1, 3, "annual_energy_total"), stage.annual_energy_total, 2
+    )
+    assert_summary_equal(
+        sums.summary(0, 1, "monthly_energy_total", month=1),
+        stage.monthly_energy_total[1],
+        1,
+    )
+    assert sums.summary(2, 2, "annual_energy_total").energy == 0
+
+
+def test_summary_missing_source(plan: RetrofitPlannerResponsePublic):
+    sums = PlanPrefixSums.from_plan(plan)
+    assert sums.summary(0, 3, "annual_energy_sources", key=EnergySource.COAL) == (
+        EnergyConsumptionSummary(energy=0, co2e=0, operating_cost=0)
+    )
+
+
+@pytest.mark.parametrize("start,stop", [(-1, 1), (2, 1), (0, 4)])
+def test_invalid_range(plan: RetrofitPlannerResponsePublic, start: int, stop: int):
+    sums = PlanPrefixSums.from_plan(plan)
+    with pytest.raises(ValueError):
+        sums.change(start, stop)
+    with pytest.raises(ValueError):
+        sums.summary(start, stop, "annual_energy_total")
+
+
+def test_empty_plan():
+    sums = PlanPrefixSums([])
+    assert len(sums) == 0
+    assert sums.cumulative() == []
+    assert sums.change(0, 0).annual_energy_sources == {}
+
+
+def test_get_cumulative_energy_change(
+    path_data: Path, plan: RetrofitPlannerResponsePublic, run_id: str
+):
+    utils.save_results(plan)
+    cumulative = get_cumulative_energy_change(uuid=run_id)
+    assert cumulative == PlanPrefixSums.from_plan(plan).cumulative()
+    assert get_cumulative_energy_change(uuid=run_id) is cumulative
+
+    plan.improvement_plan = []
+    utils.save_results(plan)
+    assert get_cumulative_energy_change(uuid=run_id) == []
@@ -0,0 +1,120 @@
+import math
+import random
+import typing
+
+import pydantic
+import pytest
+
+from python_challenge.serialization import ROUNDED_MODELS
+from python_challenge.serialization import dump_json
+from python_challenge.serialization import round_figures
+from python_challenge.types.home import EnergyProfile
+from python_challenge.types.pydantic.fields import FloatJSONRound
+from python_challenge.types.retrofit_planner import RetrofitPlannerResponsePublic
+
+AWKWARD = [
+    0.05,
+    0.15,
+    0.25,
+    2.675,
+    -0.04,
+    -0.05,
+    0.0,
+    -0.0,
+    1e9 + 0.05,
+    1e16,
+    1e300,
+    math.inf,
+    -math.inf,
+    math.nan,
+]
+
+
+def _unround(profile: EnergyProfile, seed: int) -> EnergyProfile:
+    """A copy of the profile with figures which need rounding."""
+    profile = profile.model_copy(deep=True)
+    rng = random.Random(seed)
+    models = [profile.annual_energy_total, profile.annual_energy_generation]
+    for field in ("annual_energy_end_use", "monthly_energy_generation"):
+        models.extend(getattr(profile, field).values())
+    for summaries in profile.monthly_energy_sources.values():
+        models.extend(summaries.values())
+    for model in models:
+        for name in type(model).model_fields:
+            value = (
+                rng.choice(AWKWARD) if rng.random() < 0.2 else rng.uniform(-1e4, 1e4)
+            )
+            setattr(model, name, value)
+    return profile
+
+
+def test_rounded_models():
+    for model in ROUNDED_MODELS:
+        for field in model.model_fields.values():
+            assert field.metadata == list(typing.get_args(FloatJSONRound)[1:])
+
+
+def test_round_figures():
+    rng = random.Random(0)
+    values = AWKWARD + [rng.uniform(-1e6, 1e6) for _ in range(10000)]
+    values += [round(value, 2) + 0.05 for value in values[len(AWKWARD) :]]
+
+    rounded = round_figures(values)
+
+    expected = [round(value, 1) for value in values]
+    assert [str(value) for value in rounded.tolist()] == [str(v) for v in expected]
+
+
+def test_dump_json(results: RetrofitPlannerResponsePublic):
+    assert dump_json(results) == results.model_dump_json()
+    assert dump_json(results.baseline_home) == results.baseline_home.model_dump_json()
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_dump_json_rounding(results: RetrofitPlannerResponsePublic, seed: int):
+    stage = results.improvement_plan[0]
+    results = results.model_copy(
+        update={
+            "baseline_energy_profile": _unround(results.baseline_energy_profile, seed),
+            "improvement_plan": [
+                stage.model_copy(
+                    update={
+                        "relative_energy_change": _unround(
+                            stage.relative_energy_change, seed + 100
+                        )
+                    }
+                )
+            ],
+        }
+    )
+    assert dump_json(results) == results.model_dump_json()
+
+
+def test_dump_json_nested(results: RetrofitPlannerResponsePublic):
+    class Portfolio(pydantic.BaseModel):
+        hidden: int = pydantic.Field(default=0, exclude=True)
+        profile: EnergyProfile | None = None
+        name: str = "portfolio"
+        results: list[RetrofitPlannerResponsePublic]
+
+    portfolio = Portfolio(results=[results, results])
+    assert dump_json(portfolio) == portfolio.model_dump_json()
+
+    portfolio.profile = _unround(results.baseline_energy_profile, 0)
+    assert dump_json(portfolio) == portfolio.model_dump_json()
+
+
+@pytest.mark.parametrize(
+    "update",
+    [
+        {"annual_energy_sources": {}},
+        {"annual_energy_end_use": {}},
+        {"monthly_energy_generation": {}},
+        {"monthly_energy_sources": {1: {}}},
+        {"monthly_energy_sources": {}, "monthly_energy_end_use": {}},
+    ],
+    ids=["sources", "end uses", "monthly", "empty month", "no months"],
+)
+def test_dump_json_empty(results: RetrofitPlannerResponsePublic, update: dict):
+    profile = results.baseline_energy_profile.model_copy(update=update)
+    assert dump_json(profile) == profile.model_dump_json()
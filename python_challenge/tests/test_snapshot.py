@@ -0,0 +1,215 @@
+import datetime
+import enum
+from collections.abc import Callable
+from decimal import Decimal
+from typing import Any
+from typing import Literal
+from typing import NamedTuple
+from uuid import UUID
+
+import pydantic
+import pytest
+
+from python_challenge import snapshot
+from python_challenge.snapshot import dump_snapshot
+from python_challenge.snapshot import load_snapshot
+from python_challenge.types import enums
+from python_challenge.types import epc_enums
+from python_challenge.types.enums import EnergySource
+from python_challenge.types.home import Home
+from python_challenge.types.retrofit_planner import RetrofitPlannerResponsePublic
+
+
+class Colour(enum.Enum):
+    RED = "red"
+    BLUE = "blue"
+
+
+class Pair(NamedTuple):
+    left: int
+    right: str | None
+
+
+class Exotic(pydantic.BaseModel):
+    flag: bool
+    number: int
+    text: str
+    colour: Colour
+    colours: dict[Colour, float]
+    source: EnergySource
+    sources: dict[EnergySource, float]
+    fuel: EnergySource | None = None
+    glazing: enums.WindowGlazingType | epc_enums.WindowGlazingType
+    decimal: Decimal
+    uuid: UUID
+    moment: datetime.datetime
+    day: datetime.date
+    kind: Literal["a", "b"]
+    constant: Literal["c"] = "c"
+    either: int | str | Pair
+    level: Literal[1, 2] | str = "high"
+    pair: Pair
+    fixed: tuple[int, str]
+    numbers: tuple[int, ...]
+    tags: set[str]
+    frozen: frozenset[int]
+    nothing: None = None
+    maybe: float | None = None
+    child: "Exotic | None" = None
+
+
+class Short(pydantic.BaseModel):
+    number: int
+
+
+class Long(pydantic.BaseModel):
+    number: int
+    other: int
+
+
+class Source(pydantic.BaseModel):
+    value: EnergySource | None
+
+
+class EndUse(pydantic.BaseModel):
+    value: enums.DomesticEnergyEndUse
+
+
+def _exotic(**values: Any) -> Exotic:
+    return Exotic(
+        **{
+            "flag": True,
+            "number": -(2**40),
+            "text": "naïve ✓",
+            "colour": Colour.BLUE,
+            "colours": {Colour.RED: 0.1, Colour.BLUE: float("inf")},
+            "source": EnergySource.ELECTRIC,
+            "sources": {EnergySource.ELECTRIC: 1.5, EnergySource.MAINS_GAS: 2.5},
+            "glazing": epc_enums.WindowGlazingType.DOUBLE_GLAZING,
+            "decimal": Decimal("1.50E+3"),
+            "uuid": UUID("1e0e7511-9e40-4b13-8c52-4f9c26c41c55"),
+            "moment": datetime.datetime(2026, 10, 19, 12, 30, tzinfo=datetime.UTC),
+            "day": datetime.date(2026, 10, 19),
+            "kind": "b",
+            "either": Pair(1, None),
+            "pair": Pair(2, "two"),
+            "fixed": (3, "three"),
+            "numbers": (4, 5),
+            "tags": {"x", "y"},
+            "frozen": frozenset({6}),
+            **values,
+        }
+    )
+
+
+def _round_trip(model: pydantic.BaseModel) -> pydantic.BaseModel:
+    loaded = load_snapshot(dump_snapshot(model), type(model))
+    assert loaded == model
+    # Equal values of each field, rather than equal JSON, as sets may list their
+    # members in another order.
+    assert loaded.model_dump() == model.model_dump()
+    assert loaded.model_fields_set == model.model_fields_set
+    return loaded
+
+
+def test_round_trip_documents(home: Home, results: RetrofitPlannerResponsePublic):
+    _round_trip(home)
+    _round_trip(results)
+    assert len(dump_snapshot(results)) < len(results.model_dump_json()) / 3
+
+
+def test_round_trip_types():
+    model = _exotic(
+        either="text",
+        maybe=0.5,
+        child=_exotic(
+            either=7,
+            level=2,
+            fuel=EnergySource.MAINS_GAS,
+            glazing=enums.WindowGlazingType.DOUBLE_GLAZING,
+        ),
+    )
+
+    loaded = _round_trip(model)
+
+    assert isinstance(loaded, Exotic)
+    assert isinstance(loaded.child, Exotic) and model.child is not None
+    assert type(loaded.child.pair) is Pair
+    # Equal as strings, but of different enums.
+    assert type(loaded.glazing) is epc_enums.WindowGlazingType
+    assert type(loaded.child.glazing) is enums.WindowGlazingType
+    assert loaded.child.model_fields_set == model.child.model_fields_set
+    assert "maybe" not in loaded.child.model_fields_set
+
+
+def test_unsupported():
+    class Untyped(pydantic.BaseModel):
+        value: Callable[[], int]
+
+    class Binary(pydantic.BaseModel):
+        value: bytes
+
+    class Extra(pydantic.BaseModel):
+        model_config = pydantic.ConfigDict(extra="allow")
+
+    # Twice, as a model which failed isn't left half compiled.
+    for model in (Untyped(value=int), Untyped(value=int), Binary(value=b""), Extra()):
+        with pytest.raises(TypeError):
+            dump_snapshot(model)
+
+
+def test_union_mismatch():
+    model = _exotic().model_copy(update={"either": 1.5})
+
+    with pytest.raises(TypeError):
+        dump_snapshot(model)
+
+
+def test_integer_too_large():
+    with pytest.raises(ValueError):
+        dump_snapshot(Short(number=2**64))
+
+
+def test_not_a_snapshot():
+    with pytest.raises(ValueError, match="Not a snapshot"):
+        load_snapshot(b"\0" * 64, Short)
+
+
+def test_other_version(monkeypatch: pytest.MonkeyPatch):
+    data = dump_snapshot(Short(number=1))
+    monkeypatch.setattr(snapshot, "FORMAT_VERSION", snapshot.FORMAT_VERSION + 1)
+
+    with pytest.raises(ValueError, match="another version"):
+        load_snapshot(data, Short)
+
+
+def test_other_model():
+    with pytest.raises(ValueError, match="another version"):
+        load_snapshot(dump_snapshot(Short(number=1)), Long)
+
+
+@pytest.mark.parametrize("end", [4, 20, -1], ids=["header", "stream header", "stream"])
+def test_truncated(end: int):
+    with pytest.raises(ValueError, match="Invalid snapshot"):
+        load_snapshot(dump_snapshot(_exotic())[:end], Exotic)
+
+
+@pytest.mark.parametrize(
+    "dumped,loaded",
+    [
+        (Short(number=1), Long),
+        (Long(number=1, other=2), Short),
+        (Source(value=EnergySource.ELECTRIC), EndUse),
+        (Source(value=None), EndUse),
+    ],
+    ids=["missing", "left over", "member of another enum", "none"],
+)
+def test_misread(
+    dumped: pydantic.BaseModel,
+    loaded: type[pydantic.BaseModel],
+    monkeypatch: pytest.MonkeyPatch,
+):
+    monkeypatch.setattr(snapshot, "fingerprint", lambda model: b"\0" * 8)
+
+    with pytest.raises(ValueError, match="Invalid snapshot"):
+        load_snapshot(dump_snapshot(dumped), loaded)
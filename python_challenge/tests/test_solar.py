@@ -0,0 +1,178 @@
+import numpy as np
+import pytest
+
+from python_challenge.solar import HOURS_PER_YEAR
+from python_challenge.solar import TRACKING_FIXED
+from python_challenge.solar import SolarPVColumns
+from python_challenge.solar import hourly_generation
+from python_challenge.solar import monthly_totals
+from python_challenge.solar import solar_pv_capacity
+from python_challenge.types.home import Home
+from python_challenge.types.simulation import SolarPVArray
+from python_challenge.types.simulation import SolarPVModelSettings
+from python_challenge.types.simulation_enums import SolarPVTracking
+
+EDINBURGH = (-3.2, 55.95)
+
+
+@pytest.fixture
+def settings(home: Home) -> list[SolarPVModelSettings]:
+    rng = np.random.default_rng(0)
+    return [
+        SolarPVModelSettings(
+            location=home.location,
+            peak_power=float(rng.uniform(0.1, 10)),
+            inverter_power=float(rng.uniform(0.1, 10)) if index % 3 else None,
+            age=int(rng.integers(0, 40)) if index % 5 else 0,
+            degrade_performance_by_age=bool(index % 7),
+            degradation_initial=float(rng.uniform(0, 0.1)),
+            degradation_rate=float(rng.uniform(0, 0.02)),
+        )
+        for index in range(500)
+    ]
+
+
+def test_matches_settings(settings: list[SolarPVModelSettings]):
+    capacity = solar_pv_capacity(
+        peak_power=[pv.peak_power for pv in settings],
+        inverter_power=[pv.inverter_power or np.nan for pv in settings],
+        age=[pv.age for pv in settings],
+        degrade_performance_by_age=[pv.degrade_performance_by_age for pv in settings],
+        degradation_initial=[pv.degradation_initial for pv in settings],
+        degradation_rate=[pv.degradation_rate for pv in settings],
+    )
+
+    # Exactly equal, not approximately.
+    assert capacity.degradation_for_age.tolist() == [
+        pv.degradation_for_age for pv in settings
+    ]
+    assert capacity.peak_power_adjusted.tolist() == [
+        pv.peak_power_adjusted for pv in settings
+    ]
+    assert capacity.peak_power_watts.tolist() == [
+        pv.peak_power_watts for pv in settings
+    ]
+    assert capacity.inverter_power_watts.tolist() == [
+        pv.inverter_power_watts for pv in settings
+    ]
+
+
+def test_default_settings(home: Home):
+    arrays = [
+        SolarPVArray(peak_power=3.6, age=0),
+        SolarPVArray(peak_power=4.2, inverter_power=3.0, age=12),
+    ]
+    homes = [
+        home.model_copy(update={"solar_pv": arrays}),
+        home,
+        home.model_copy(update={"solar_pv": arrays[1:]}),
+    ]
+    columns = SolarPVColumns.from_homes(homes)
+    assert columns.home_index.tolist() == [0, 0, 2]
+
+    capacity = columns.capacity()
+    expected = [
+        SolarPVModelSettings(location=home.location, **array.model_dump())
+        for array in [*arrays, arrays[1]]
+    ]
+    assert capacity.peak_power_watts.tolist() == [
+        pv.peak_power_watts for pv in expected
+    ]
+    assert capacity.inverter_power_watts.tolist() == [
+        pv.inverter_power_watts for pv in expected
+    ]
+
+
+def test_no_arrays(home: Home):
+    columns = SolarPVColumns.from_homes([home])
+    assert len(columns.home_index) == 0
+    assert columns.capacity().peak_power_watts.tolist() == []
+    assert columns.monthly_generation().shape == (0, 12)
+
+
+class TestHourlyGeneration:
+
+    def test_fixed(self):
+        [hourly] = hourly_generation(*EDINBURGH, peak_power=1, tilt=35, azimuth=180)
+
+        assert hourly.shape == (HOURS_PER_YEAR,)
+        # Clear-sky, so well above typical UK yields of ~900 kWh/kWp.
+        assert 1200 < hourly.sum() < 2200
+        # Night time.
+        assert hourly[::24].tolist() == [0.0] * 365
+        # Midsummer noon, less system losses.
+        assert 0.7 < hourly[171 * 24 + 12] < 0.9
+
+    def test_monthly_totals(self):
+        hourly = hourly_generation(
+            [-3.2, -0.1], [55.95, 51.5], peak_power=[1, 4], tilt=35, azimuth=180
+        )
+        monthly = monthly_totals(hourly)
+
+        assert monthly.shape == (2, 12)
+        np.testing.assert_allclose(monthly.sum(axis=1), hourly.sum(axis=1))
+        assert (monthly[:, 5] > monthly[:, 11]).all()
+
+    def test_scales_with_peak_power(self):
+        hourly = hourly_generation(*EDINBURGH, peak_power=[1, 3], tilt=35, azimuth=180)
+        np.testing.assert_allclose(hourly[1], hourly[0] * 3)
+
+    def test_orientation(self):
+        east, west, south, north = hourly_generation(
+            0, 52, peak_power=1, tilt=35, azimuth=[90, 270, 180, 0]
+        )
+        assert east.sum() == pytest.approx(west.sum(), rel=0.01)
+        assert east[: 24 * 7].argmax() % 24 < 12 < west[: 24 * 7].argmax() % 24
+        assert south.sum() > east.sum() > north.sum()
+
+    def test_tracking(self):
+        fixed, horizontal, dual = hourly_generation(
+            *EDINBURGH,
+            peak_power=1,
+            tilt=35,
+            azimuth=180,
+            tracking=[
+                TRACKING_FIXED,
+                SolarPVTracking.HORIZONTAL.gsee_value,
+                SolarPVTracking.DUAL_AXIS.gsee_value,
+            ],
+        )
+        assert dual.sum() > horizontal.sum() > fixed.sum()
+        assert horizontal[::24].tolist() == dual[::24].tolist() == [0.0] * 365
+
+    def test_inverter_power(self):
+        [hourly] = hourly_generation(
+            *EDINBURGH, peak_power=4, tilt=35, azimuth=180, inverter_power=2.5
+        )
+        assert hourly.max() == 2.5
+
+
+def test_columns_generation(home: Home):
+    arrays = [
+        SolarPVArray(peak_power=3.6, age=0),
+        SolarPVArray(
+            peak_power=4.2,
+            inverter_power=3.0,
+            age=12,
+            tracking=SolarPVTracking.DUAL_AXIS,
+        ),
+    ]
+    columns = SolarPVColumns.from_homes([home.model_copy(update={"solar_pv": arrays})])
+    coordinates = home.location.coordinates
+
+    monthly = columns.monthly_generation(chunk_size=1)
+
+    capacity = columns.capacity()
+    expected = monthly_totals(
+        hourly_generation(
+            longitude=coordinates.longitude,
+            latitude=coordinates.latitude,
+            peak_power=capacity.peak_power_adjusted,
+            tilt=[35, 35],
+            azimuth=[180, 180],
+            tracking=[TRACKING_FIXED, SolarPVTracking.DUAL_AXIS.gsee_value],
+            inverter_power=[np.inf, 3.0],
+        )
+    )
+    np.testing.assert_array_equal(monthly, expected)
+    assert columns.monthly_generation(system_losses=0.2)[0].sum() < monthly[0].sum()
@@ -0,0 +1,50 @@
+from python_challenge.summaries import EnergySummaries
+from python_challenge.summaries import Summary
+from python_challenge.types.enums import EnergySource
+from python_challenge.types.home import EnergyProfile
+from python_challenge.types.retrofit_planner import RetrofitPlannerResponsePublic
+
+
+def test_round_trip(results: RetrofitPlannerResponsePublic):
+    profile = results.baseline_energy_profile
+    summaries = EnergySummaries.from_profile(profile)
+
+    rebuilt = EnergyProfile(
+        **profile.model_dump(
+            include={
+                "annual_energy_generation",
+                "monthly_energy_generation",
+                "peak_daily_energy_sources",
+                "peak_daily_energy_end_use",
+                "peak_hourly_energy_sources",
+                "peak_hourly_energy_end_use",
+                "predicted_epc_rating",
+                "predicted_epc_score",
+            }
+        ),
+        **summaries.to_fields(),
+    )
+    assert rebuilt == profile
+
+
+def test_get(results: RetrofitPlannerResponsePublic):
+    profile = results.baseline_energy_profile
+    summaries = EnergySummaries.from_profile(profile)
+    source, summary = next(iter(profile.monthly_energy_sources[1].items()))
+
+    assert summaries.get("annual_energy_total") == Summary(
+        **profile.annual_energy_total.model_dump()
+    )
+    assert summaries.get("monthly_energy_sources", 1, source) == Summary(
+        **summary.model_dump()
+    )
+    assert summaries.get("annual_energy_sources", key=EnergySource.COAL) is None
+    assert len(summaries) == len(list(summaries))
+
+
+def test_shared_layout(results: RetrofitPlannerResponsePublic):
+    baseline = EnergySummaries.from_profile(results.baseline_energy_profile)
+    improved = EnergySummaries.from_profile(
+        results.baseline_energy_profile.model_copy(deep=True)
+    )
+    assert improved.layout is baseline.layout
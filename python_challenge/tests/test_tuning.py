@@ -0,0 +1,93 @@
+from pathlib import Path
+
+import pytest
+
+from python_challenge import tuning
+from python_challenge.tuning import Resources
+from python_challenge.tuning import Tuning
+
+GIB = 1024**3
+
+
+def test_measure_resources(tmp_path: Path):
+    unlimited = tuning.measure_resources(tmp_path)
+    (tmp_path / "cpu.max").write_text("50000 100000\n")
+    (tmp_path / "memory.max").write_text(f"{GIB}\n")
+
+    limited = tuning.measure_resources(tmp_path)
+
+    assert unlimited.cpus >= 1
+    assert unlimited.memory > 0
+    assert limited == Resources(0.5, min(GIB, unlimited.memory))
+
+
+def test_measure_resources_no_limits(tmp_path: Path):
+    (tmp_path / "cpu.max").write_text("max 100000\n")
+    (tmp_path / "memory.max").write_text("max\n")
+
+    assert tuning.measure_resources(tmp_path) == tuning.measure_resources(
+        tmp_path / "missing"
+    )
+
+
+@pytest.mark.parametrize("process_cpu_count", [True, False])
+def test_cpu_count_without_affinity(
+    monkeypatch: pytest.MonkeyPatch, process_cpu_count: bool
+):
+    monkeypatch.delattr("os.sched_getaffinity")
+    monkeypatch.setattr("os.cpu_count", lambda: None)
+    if process_cpu_count:
+        monkeypatch.setattr("os.process_cpu_count", lambda: 3, raising=False)
+    else:
+        monkeypatch.delattr("os.process_cpu_count", raising=False)
+
+    assert tuning._cpu_count() == (3 if process_cpu_count else 1)
+
+
+def test_max_backlog(tmp_path: Path):
+    somaxconn = tmp_path / "somaxconn"
+    somaxconn.write_text("128\n")
+
+    assert tuning.max_backlog(somaxconn) == 128
+    assert tuning.max_backlog(tmp_path / "missing") == tuning.DEFAULT_SOMAXCONN
+
+
+@pytest.mark.parametrize(
+    ("resources", "io_ratio", "request_seconds", "expected"),
+    [
+        # One worker per CPU, rounding fractions of a CPU up.
+        (Resources(4, 16 * GIB), 0.0, 0.1, Tuning(4, 100, 400)),
+        (Resources(0.5, 16 * GIB), 0.0, 0.1, Tuning(1, 100, 100)),
+        # Fewer workers when memory is short, but always one.
+        (Resources(8, 512 * 1024**2), 0.0, 0.1, Tuning(4, 100, 400)),
+        (Resources(8, 128 * 1024**2), 0.0, 0.1, Tuning(1, 100, 100)),
+        # More requests in flight when they spend time waiting on I/O.
+        (Resources(1, 16 * GIB), 0.5, 0.1, Tuning(1, 200, 200)),
+        # Within limits.
+        (Resources(1, 16 * GIB), 0.0, 1e-6, Tuning(1, 1000, 1000)),
+        (Resources(1, 16 * GIB), 0.0, 60, Tuning(1, 16, 64)),
+    ],
+)
+def test_tune(
+    resources: Resources, io_ratio: float, request_seconds: float, expected: Tuning
+):
+    assert (
+        tuning.tune(
+            resources, io_ratio, request_seconds, time_budget=10, backlog_limit=4096
+        )
+        == expected
+    )
+
+
+def test_tune_backlog_limit():
+    tuned = tuning.tune(Resources(4, 16 * GIB), backlog_limit=128)
+
+    assert tuned.backlog == 128
+
+
+@pytest.mark.parametrize(
+    ("io_ratio", "request_seconds"), [(-0.1, 0.1), (1, 0.1), (0.5, 0)]
+)
+def test_tune_invalid(io_ratio: float, request_seconds: float):
+    with pytest.raises(ValueError):
+        tuning.tune(Resources(1, GIB), io_ratio, request_seconds)
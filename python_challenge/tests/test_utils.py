@@ -0,0 +1,294 @@
+import asyncio
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+from pytest_mock import MockerFixture
+
+from python_challenge import utils
+from python_challenge.types.home import Home
+from python_challenge.types.retrofit_planner import RetrofitPlannerResponsePublic
+
+
+class TestHomeStore:
+
+    def test_save_and_get_home(self, path_data: Path, home: Home, uprn: str):
+        utils.save_home(home)
+
+        assert (path_data / f"{uprn}.json").exists()
+        assert utils.get_home(uprn=uprn) == home
+        assert list(utils.iter_uprns()) == [uprn]
+        assert list(utils.iter_homes()) == [home]
+
+    def test_get_missing_home(self, path_data: Path):
+        with pytest.raises(FileNotFoundError):
+            utils.get_home(uprn="123")
+
+    def test_get_non_numeric_uprn(self, path_data: Path):
+        with pytest.raises(FileNotFoundError):
+            utils.get_home(uprn="../secrets")
+
+    def test_iter_uprns_ignores_results(self, path_data: Path, uprn: str):
+        (path_data / f"{uprn}.json").write_text("{}")
+        (path_data / "1e0e7511-9e40-4b13-8c52-4f9c26c41c55.json").write_text("{}")
+
+        assert list(utils.iter_uprns()) == [uprn]
+
+    def test_save_home_without_uprn(self, path_data: Path, home: Home):
+        home.uprn = None
+        with pytest.raises(ValueError):
+            utils.save_home(home)
+        assert list(path_data.iterdir()) == []
+
+    def test_save_home_sends_signal(
+        self, path_data: Path, home: Home, mocker: MockerFixture
+    ):
+        receiver = mocker.Mock()
+        utils.home_saved.connect(receiver, weak=False)
+        try:
+            utils.save_home(home)
+        finally:
+            utils.home_saved.disconnect(receiver)
+        receiver.assert_called_once_with(
+            signal=utils.home_saved, sender=Home, home=home
+        )
+
+    def test_list_uprns(self, path_data: Path, home: Home):
+        for uprn in ["3", "1", "2"]:
+            (path_data / f"{uprn}.json").write_text("{}")
+
+        assert utils.list_uprns() == ["1", "2", "3"]
+        assert utils.list_uprns(after="1", limit=1) == ["2"]
+
+        home.uprn = "15"
+        utils.save_home(home)
+        utils.save_home(home)
+
+        assert utils.list_uprns(after="1") == ["15", "2", "3"]
+
+    def test_failed_write_is_cleaned_up(
+        self, path_data: Path, home: Home, mocker: MockerFixture
+    ):
+        mocker.patch("python_challenge.utils.os.replace", side_effect=OSError)
+        with pytest.raises(OSError):
+            utils.save_home(home)
+        assert list(path_data.iterdir()) == []
+
+
+class TestResultsStore:
+
+    def test_get_results(
+        self, path_data: Path, results: RetrofitPlannerResponsePublic, run_id: str
+    ):
+        (path_data / f"{run_id}.json").write_text(results.model_dump_json())
+
+        assert utils.get_results(uuid=run_id) == results
+        assert utils.get_results(uuid=run_id.upper()) == results
+
+    @pytest.mark.parametrize(
+        "uuid", ["1e0e7511-9e40-4b13-8c52-4f9c26c41c56", "../906205784"]
+    )
+    def test_get_missing_results(self, path_data: Path, uuid: str):
+        with pytest.raises(FileNotFoundError):
+            utils.get_results(uuid=uuid)
+
+    def test_save_results(
+        self, path_data: Path, results: RetrofitPlannerResponsePublic, run_id: str
+    ):
+        assert utils.list_simulation_ids() == []
+
+        utils.save_results(results)
+
+        assert utils.get_results(uuid=run_id) == results
+        assert utils.list_simulation_ids() == [run_id]
+
+    def test_list_simulation_ids(self, path_data: Path, run_id: str, uprn: str):
+        (path_data / f"{run_id}.json").write_text("{}")
+        (path_data / f"{run_id.upper()}.json").write_text("{}")
+        (path_data / f"{uprn}.json").write_text("{}")
+
+        assert list(utils.iter_simulation_ids()) == [run_id]
+        assert utils.list_simulation_ids() == [run_id]
+        assert utils.list_simulation_ids(after=run_id) == []
+
+
+class TestDocumentCache:
+
+    def test_get_keeps_loaded(self, path_data: Path, home: Home, uprn: str):
+        utils.save_home(home)
+
+        loaded = utils.get_home(uprn=uprn)
+
+        assert utils.get_home(uprn=uprn) is loaded
+        assert utils.loaded_documents() == (
+            1,
+            (path_data / f"{uprn}.json").stat().st_size,
+        )
+
+    def test_get_replaced(self, path_data: Path, home: Home, uprn: str):
+        utils.save_home(home)
+        loaded = utils.get_home(uprn=uprn)
+
+        replaced = home.model_copy(
+            update={"north_angle": (home.north_angle + 90) % 360}
+        )
+        utils.save_home(replaced)
+
+        assert utils.get_home(uprn=uprn) is not loaded
+        assert utils.get_home(uprn=uprn) == replaced
+        assert utils.loaded_documents()[0] == 1
+
+    def test_evicts_least_recently_used(self, home: Home):
+        cache = utils._DocumentCache(max_bytes=10)
+        documents = [home.model_copy() for _ in range(3)]
+        cache.put(Path("a"), (1, 1), documents[0], 4)
+        cache.put(Path("b"), (1, 1), documents[1], 4)
+        assert cache.get(Path("a"), (1, 1)) is documents[0]
+
+        cache.put(Path("c"), (1, 1), documents[2], 4)
+
+        assert cache.get(Path("b"), (1, 1)) is None
+        assert cache.get(Path("a"), (1, 1)) is documents[0]
+        assert cache.get(Path("a"), (1, 2)) is None
+        assert (len(cache), cache.nbytes) == (2, 8)
+
+    def test_skips_too_large(self, home: Home):
+        cache = utils._DocumentCache(max_bytes=10)
+
+        cache.put(Path("a"), (1, 1), home, 11)
+
+        assert (len(cache), cache.nbytes) == (0, 0)
+
+
+class TestSaveDocumentsJSON:
+
+    def test_save(self, path_data: Path, home: Home, run_id: str):
+        utils.save_documents_json("homes", [("1", home.model_dump_json())])
+        utils.save_documents_json("results", [(run_id, "{}")])
+
+        assert utils.get_home(uprn="1") == home
+        assert utils.list_uprns() == ["1"]
+        assert utils.list_simulation_ids() == [run_id]
+
+    def test_failed_write_stores_nothing(self, path_data: Path, mocker: MockerFixture):
+        mocker.patch(
+            "python_challenge.utils.os.fdopen",
+            side_effect=[mocker.MagicMock(), OSError],
+        )
+
+        with pytest.raises(OSError):
+            utils.save_documents_json("homes", [("1", "{}"), ("2", "{}")])
+
+        assert list(path_data.iterdir()) == []
+        assert utils.list_uprns() == []
+
+
+class _CountingSingleFlight(utils._SingleFlight[object]):
+    """Counts the callers which have joined a load, or started one."""
+
+    def __init__(self, load: Callable[[str], object]) -> None:
+        super().__init__(load)
+        self.joined = threading.Semaphore(0)
+
+    def _join(self, key: str) -> tuple[Future[object], bool]:
+        joined = super()._join(key)
+        self.joined.release()
+        return joined
+
+    def wait_joined(self, callers: int) -> None:
+        for _ in range(callers):
+            assert self.joined.acquire(timeout=5)
+
+
+class TestSingleFlight:
+
+    @pytest.fixture
+    def release(self) -> threading.Event:
+        return threading.Event()
+
+    @pytest.fixture
+    def loads(self) -> list[str]:
+        return []
+
+    @pytest.fixture
+    def single_flight(
+        self, release: threading.Event, loads: list[str]
+    ) -> _CountingSingleFlight:
+        def load(key: str) -> object:
+            loads.append(key)
+            assert release.wait(5)
+            if key == "missing":
+                raise FileNotFoundError(key)
+            return object()
+
+        return _CountingSingleFlight(load)
+
+    def test_threads(
+        self,
+        single_flight: _CountingSingleFlight,
+        release: threading.Event,
+        loads: list[str],
+    ):
+        with ThreadPoolExecutor(max_workers=9) as executor:
+            futures = [executor.submit(single_flight, "a") for _ in range(8)]
+            futures.append(executor.submit(single_flight, "b"))
+            single_flight.wait_joined(9)
+            release.set()
+            documents = [future.result() for future in futures]
+
+        assert sorted(loads) == ["a", "b"]
+        assert len({id(document) for document in documents[:8]}) == 1
+        assert documents[8] is not documents[0]
+        # Once done, the next call loads again.
+        assert single_flight("a") is not documents[0]
+        assert loads.count("a") == 2
+
+    def test_exception(
+        self, single_flight: _CountingSingleFlight, release: threading.Event
+    ):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            futures = [executor.submit(single_flight, "missing") for _ in range(2)]
+            single_flight.wait_joined(2)
+            release.set()
+
+            for future in futures:
+                with pytest.raises(FileNotFoundError):
+                    future.result()
+
+    @pytest.mark.asyncio
+    async def test_async(
+        self,
+        single_flight: _CountingSingleFlight,
+        release: threading.Event,
+        loads: list[str],
+    ):
+        tasks = [asyncio.create_task(single_flight.acall("a")) for _ in range(4)]
+        thread = asyncio.create_task(asyncio.to_thread(single_flight, "a"))
+        await asyncio.to_thread(single_flight.wait_joined, 5)
+        # Cancelling the task which started the load doesn't cancel it for the others.
+        tasks[0].cancel()
+        release.set()
+        documents = await asyncio.gather(*tasks[1:], thread)
+
+        assert loads == ["a"]
+        assert len({id(document) for document in documents}) == 1
+        with pytest.raises(asyncio.CancelledError):
+            await tasks[0]
+
+    @pytest.mark.asyncio
+    async def test_aget(
+        self,
+        path_data: Path,
+        home: Home,
+        uprn: str,
+        results: RetrofitPlannerResponsePublic,
+        run_id: str,
+    ):
+        utils.save_home(home)
+        utils.save_results(results)
+
+        assert await utils.aget_home(uprn=uprn) == home
+        assert await utils.aget_results(uuid=run_id) == results
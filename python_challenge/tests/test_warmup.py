@@ -0,0 +1,122 @@
+import os
+import time
+import uuid
+from collections import Counter
+from collections.abc import Iterator
+from pathlib import Path
+
+import pydantic
+import pytest
+
+from python_challenge import geo
+from python_challenge import hotlist
+from python_challenge import utils
+from python_challenge.types.home import Home
+from python_challenge.types.retrofit_planner import RetrofitPlannerResponsePublic
+from python_challenge.warmup import _recent_results
+from python_challenge.warmup import build_models
+from python_challenge.warmup import warm_documents
+from python_challenge.warmup import warm_up
+
+
+@pytest.fixture
+def home_index(path_data: Path) -> Iterator[None]:
+    geo.get_home_index.cache_clear()
+    yield
+    geo.get_home_index.cache_clear()
+
+
+def test_build_models():
+    class Deferred(pydantic.BaseModel):
+        model_config = pydantic.ConfigDict(defer_build=True)
+
+        value: int
+
+    # The tests' package, depending on how pytest imported them.
+    package = Deferred.__module__.partition(".")[0]
+    assert not Deferred.__pydantic_complete__
+    assert build_models(package) >= 1
+    assert Deferred.__pydantic_complete__
+    assert build_models(package) == 0
+
+
+def test_warm_up(home_index: None, home: Home, results: RetrofitPlannerResponsePublic):
+    utils.save_home(home)
+    utils.save_results(results)
+
+    utils.clear_caches()
+
+    report = warm_up()
+
+    assert report.homes == 1
+    assert report.documents == 1
+    assert geo.get_home_index.cache_info().currsize == 1
+
+
+def test_warm_up_invalid_results(home_index: None, path_data: Path, run_id: str):
+    (path_data / f"{run_id}.json").write_text("{}")
+
+    report = warm_up()
+
+    assert report.homes == 0
+    assert report.documents == 0
+
+
+@pytest.fixture
+def stored(path_data: Path, home: Home, results: RetrofitPlannerResponsePublic) -> str:
+    """Store a Home, and its results as the oldest of three, returning their UPRN."""
+    utils.save_home(home)
+    for index, run_id in enumerate([str(results.simulation_id), *OTHER_RUN_IDS]):
+        utils.save_results(
+            results.model_copy(update={"simulation_id": uuid.UUID(run_id)})
+        )
+        path = path_data / f"{run_id}.json"
+        os.utime(path, ns=(index, index))
+    utils.clear_caches()
+    assert home.uprn is not None
+    return home.uprn
+
+
+OTHER_RUN_IDS = [
+    "2e0e7511-9e40-4b13-8c52-4f9c26c41c55",
+    "3e0e7511-9e40-4b13-8c52-4f9c26c41c55",
+]
+
+
+class TestWarmDocuments:
+
+    def test_hot_then_recent(self, stored: str, run_id: str):
+        hotlist.add_counts(Counter({("homes", stored): 2, ("results", run_id): 1}), 0)
+
+        assert warm_documents(documents=3) == 3
+
+        assert utils.loaded_documents()[0] == 3
+        loaded = [utils.get_home(uprn=stored), utils.get_results(uuid=run_id)]
+        utils.get_results(uuid=OTHER_RUN_IDS[1])
+        assert utils.loaded_documents()[0] == 3
+        assert utils.get_home(uprn=stored) is loaded[0]
+        assert utils.get_results(uuid=run_id) is loaded[1]
+
+    def test_skips_missing_invalid_and_loaded(
+        self, stored: str, run_id: str, path_data: Path
+    ):
+        hotlist.add_counts(Counter({("homes", "1"): 2, ("results", run_id): 1}), 0)
+        (path_data / f"{OTHER_RUN_IDS[1]}.json").write_text("{}")
+
+        # Neither the unknown Home, nor the invalid results, nor run_id twice.
+        assert warm_documents() == 2
+        assert utils.loaded_documents()[0] == 2
+
+    def test_time_budget(self, stored: str):
+        assert warm_documents(seconds=0) == 0
+
+    def test_recent_results(self, stored: str, run_id: str):
+        deadline = time.perf_counter() + 60
+
+        assert _recent_results(2, deadline) == OTHER_RUN_IDS[::-1]
+        assert _recent_results(5, deadline) == [*OTHER_RUN_IDS[::-1], run_id]
+        # The store isn't scanned past the deadline.
+        assert _recent_results(5, time.perf_counter()) == []
+
+    def test_memory_budget(self, stored: str):
+        assert warm_documents(max_bytes=1) == 1
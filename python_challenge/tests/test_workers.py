@@ -0,0 +1,40 @@
+import os
+
+import pytest
+from gunicorn.config import Config
+from gunicorn.glogging import Logger
+
+from python_challenge.workers import UvicornWorker
+
+
+def _worker(cfg: Config) -> UvicornWorker:
+    return UvicornWorker(0, os.getpid(), [], None, 30, cfg, Logger(cfg))
+
+
+def test_config():
+    cfg = Config()
+    cfg.set("worker_connections", 7)
+    cfg.set("keepalive", 9)
+    cfg.set("backlog", 128)
+
+    config = _worker(cfg).config
+
+    assert config.limit_concurrency == 7
+    assert config.timeout_keep_alive == 9
+    assert config.backlog == 128
+    assert config.loop == "uvloop"
+    assert config.http == "httptools"
+    assert config.h11_max_incomplete_event_size is None
+    assert config.lifespan == "off"
+
+
+def test_environment(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("UVICORN_LOOP", "asyncio")
+    monkeypatch.setenv("UVICORN_HTTP", "h11")
+    monkeypatch.setenv("UVICORN_H11_MAX_INCOMPLETE_EVENT_SIZE", "4096")
+
+    config = _worker(Config()).config
+
+    assert config.loop == "asyncio"
+    assert config.http == "h11"
+    assert config.h11_max_incomplete_event_size == 4096
@@ -0,0 +1,127 @@
+"""
+Number of gunicorn workers, and the concurrency of each, from the CPUs and memory
+available and how much of a request's time is spent waiting on I/O.
+
+Each ``UvicornWorker`` runs one event loop, and the API's views (validating and
+serializing pydantic models) hold the GIL while they run, so a worker uses at most about
+one CPU however many requests it serves at once. The rule of thumb of ``2 * CPUs + 1``
+is for sync workers blocked on I/O, and with async workers it only adds memory and
+contention for the same CPUs.
+
+Imported by ``gunicorn.conf.py`` before Django is set up, so it only uses the standard
+library.
+"""
+
+import math
+import os
+from pathlib import Path
+from typing import NamedTuple
+
+CGROUP = Path("/sys/fs/cgroup")
+SOMAXCONN = Path("/proc/sys/net/core/somaxconn")
+
+WORKER_MEMORY = 96 * 1024 * 1024
+"""
+Memory to allow for each worker, and for the master: about 30MiB of proportional set
+size once preloaded, plus the documents of the requests it is serving.
+"""
+DEFAULT_IO_RATIO = 0.05
+"""
+Fraction of a request's time spent waiting on I/O, as measured by ``tune_workers``.
+"""
+DEFAULT_REQUEST_SECONDS = 0.01
+"""Mean time to serve a request, as measured by ``tune_workers``."""
+DEFAULT_TIME_BUDGET = 10.0
+"""Seconds a request may take before it is cancelled."""
+MIN_CONCURRENCY = 16
+"""
+Lower bound of the concurrency limit, which counts the connection of the request itself
+and idle keep-alive connections too.
+"""
+MAX_CONCURRENCY = 1000
+MIN_BACKLOG = 64
+DEFAULT_SOMAXCONN = 4096
+
+
+class Resources(NamedTuple):
+    cpus: float
+    """CPUs available to the process, possibly a fraction under a cgroup quota."""
+    memory: int
+    """Memory available in bytes."""
+
+
+class Tuning(NamedTuple):
+    workers: int
+    limit_concurrency: int
+    """Connections and requests of a worker at once, above which it responds 503."""
+    backlog: int
+    """Connections waiting to be accepted by a worker, above which they are refused."""
+
+
+def _read(path: Path) -> str | None:
+    try:
+        return path.read_text().strip()
+    except OSError:
+        return None
+
+
+def _cpu_count() -> int:
+    """The CPUs the process may run on, or those of the machine off Linux."""
+    if hasattr(os, "sched_getaffinity"):
+        return len(os.sched_getaffinity(0))
+    # Python 3.13 counts the CPUs the process may run on elsewhere too.
+    cpu_count = getattr(os, "process_cpu_count", os.cpu_count)
+    return cpu_count() or 1
+
+
+def measure_resources(cgroup: Path = CGROUP) -> Resources:
+    """
+    The CPUs and memory of the machine, limited by the CPU affinity of the process and
+    the quotas of its (v2) cgroup, as set by containers.
+    """
+    cpus: float = _cpu_count()
+    if (cpu_max := _read(cgroup / "cpu.max")) and not cpu_max.startswith("max"):
+        quota, period = cpu_max.split()
+        cpus = min(cpus, int(quota) / int(period))
+    memory = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+    if (memory_max := _read(cgroup / "memory.max")) and memory_max != "max":
+        memory = min(memory, int(memory_max))
+    return Resources(cpus, memory)
+
+
+def max_backlog(somaxconn: Path = SOMAXCONN) -> int:
+    """
+    The kernel's limit of the backlog of a socket, which silently truncates larger ones.
+    """
+    return int(_read(somaxconn) or DEFAULT_SOMAXCONN)
+
+
+def tune(
+    resources: Resources,
+    io_ratio: float = DEFAULT_IO_RATIO,
+    request_seconds: float = DEFAULT_REQUEST_SECONDS,
+    time_budget: float = DEFAULT_TIME_BUDGET,
+    worker_memory: int = WORKER_MEMORY,
+    backlog_limit: int = DEFAULT_SOMAXCONN,
+) -> Tuning:
+    """
+    One worker per CPU, as many as fit in memory besides the master.
+
+    A request keeps its worker's CPU busy for ``1 - io_ratio`` of its time, so a worker
+    with more requests in flight than it can serve in ``time_budget`` would only serve
+    them late, or cancel them. Those are better refused straight away with a 503, and
+    connections beyond the workers' limits left in the backlog for the next free one.
+    """
+    if not 0 <= io_ratio < 1:
+        raise ValueError(f"io_ratio must be in [0, 1), got {io_ratio}")
+    if request_seconds <= 0:
+        raise ValueError(f"request_seconds must be positive, got {request_seconds}")
+    workers = max(
+        1, min(math.ceil(resources.cpus), resources.memory // worker_memory - 1)
+    )
+    cpu_seconds = request_seconds * (1 - io_ratio)
+    limit_concurrency = max(
+        MIN_CONCURRENCY, min(MAX_CONCURRENCY, int(time_budget / cpu_seconds))
+    )
+    backlog = min(max(MIN_BACKLOG, workers * limit_concurrency), backlog_limit)
+    return Tuning(workers, limit_concurrency, backlog)
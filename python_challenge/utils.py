@@ -5,26 +5,381 @@ These abstract away APIs or database interactions
 which would normally exist in a real application.
 """
 
+import asyncio
+import bisect
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from collections.abc import Iterable
+from collections.abc import Iterator
+from collections.abc import Sequence
+from concurrent.futures import Future
 from pathlib import Path
+from typing import Generic
+from typing import Literal
+from typing import TypeVar
+from typing import cast
+from uuid import UUID
 
+import pydantic
+from django.dispatch import Signal
+
+from .serialization import dump_json
 from .types.home import Home
 from .types.retrofit_planner import RetrofitPlannerResponsePublic
 
 PATH_DATA = Path(__file__).parent.parent / "data"
 
+DocumentKind = Literal["homes", "results"]
+
+T = TypeVar("T")
+M = TypeVar("M", bound=pydantic.BaseModel)
+
+DOCUMENT_CACHE_BYTES = 64 * 1024 * 1024
+"""Size of the stored JSON of the documents kept loaded in each process."""
+
+home_saved = Signal()
+"""
+Sent with the ``home`` keyword argument after a Home has been written to the store.
+"""
+
+
+def _path_home(uprn: str) -> Path:
+    if not uprn.isnumeric():
+        raise FileNotFoundError("UPRN not found")
+    return PATH_DATA / f"{uprn}.json"
+
+
+def _path_results(uuid: str) -> Path:
+    try:
+        simulation_id = UUID(uuid)
+    except ValueError:
+        raise FileNotFoundError("UUID not found")
+    return PATH_DATA / f"{simulation_id}.json"
+
+
+def _write_atomic(path: Path, data: str) -> None:
+    """
+    Write the file in one go, so readers never see a partially written document.
+    """
+    _write_many_atomic([(path, data)])
+
+
+def _write_many_atomic(files: Sequence[tuple[Path, str]]) -> None:
+    """
+    Write all the files, only replacing any of them once all have been written.
+    """
+    paths_tmp: list[tuple[str, Path]] = []
+    try:
+        for path, data in files:
+            fd, path_tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            paths_tmp.append((path_tmp, path))
+            with os.fdopen(fd, "w") as file:
+                file.write(data)
+        while paths_tmp:
+            path_tmp, path = paths_tmp[-1]
+            os.replace(path_tmp, path)
+            paths_tmp.pop()
+    except BaseException:
+        for path_tmp, _ in paths_tmp:
+            os.unlink(path_tmp)
+        raise
+
+
+class _SortedKeys:
+    """
+    Ordered keys of the stored documents, loaded on first use.
+
+    Supports keyset ("seek") pagination, which costs the same for any page.
+    """
+
+    def __init__(self, load: Callable[[], Iterable[str]]) -> None:
+        self._load = load
+        self._keys: list[str] | None = None
+        self._lock = threading.Lock()
+
+    def _get_keys(self) -> list[str]:
+        if self._keys is None:
+            self._keys = sorted(self._load())
+        return self._keys
+
+    def add(self, key: str) -> None:
+        with self._lock:
+            if self._keys is None:
+                return
+            index = bisect.bisect_left(self._keys, key)
+            if index == len(self._keys) or self._keys[index] != key:
+                self._keys.insert(index, key)
+
+    def page(self, after: str | None, limit: int) -> list[str]:
+        """
+        Up to ``limit`` keys, in order, following the ``after`` key.
+        """
+        with self._lock:
+            keys = self._get_keys()
+            start = 0 if after is None else bisect.bisect_right(keys, after)
+            return keys[start : start + limit]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._keys = None
+
+
+class _SingleFlight(Generic[T]):
+    """
+    Loads of documents, where concurrent loads of the same key (from threads or async
+    tasks) wait for the first one, and share its result or exception.
+
+    Callers share the document, so they must not modify it.
+    """
+
+    def __init__(self, load: Callable[[str], T]) -> None:
+        self._load = load
+        self._loads: dict[str, Future[T]] = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key: str) -> tuple[Future[T], bool]:
+        """The load of the key in flight, and whether the caller must run it."""
+        with self._lock:
+            if (future := self._loads.get(key)) is not None:
+                return future, False
+            future = self._loads[key] = Future()
+            return future, True
+
+    def _run(self, key: str, future: Future[T]) -> None:
+        try:
+            future.set_result(self._load(key))
+        except BaseException as error:
+            future.set_exception(error)
+        finally:
+            with self._lock:
+                del self._loads[key]
+
+    def __call__(self, key: str) -> T:
+        future, leader = self._join(key)
+        if leader:
+            self._run(key, future)
+        return future.result()
+
+    async def acall(self, key: str) -> T:
+        future, leader = self._join(key)
+        if leader:
+            # In a thread, which finishes the load for the others even if this task is
+            # cancelled.
+            asyncio.get_running_loop().run_in_executor(None, self._run, key, future)
+        return await asyncio.shield(asyncio.wrap_future(future))
+
+
+class _DocumentCache:
+    """
+    The most recently used documents, up to ``max_bytes`` of their stored JSON.
+
+    Each is kept with the version of the file it was loaded from, so a document
+    replaced since, e.g. by another process, is loaded again.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.nbytes = 0
+        self._documents: OrderedDict[
+            Path, tuple[tuple[int, int], pydantic.BaseModel, int]
+        ] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._documents)
+
+    def get(self, path: Path, version: tuple[int, int]) -> pydantic.BaseModel | None:
+        with self._lock:
+            cached = self._documents.get(path)
+            if cached is None or cached[0] != version:
+                return None
+            self._documents.move_to_end(path)
+            return cached[1]
+
+    def put(
+        self,
+        path: Path,
+        version: tuple[int, int],
+        document: pydantic.BaseModel,
+        size: int,
+    ) -> None:
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if (replaced := self._documents.pop(path, None)) is not None:
+                self.nbytes -= replaced[2]
+            self._documents[path] = (version, document, size)
+            self.nbytes += size
+            while self.nbytes > self.max_bytes:
+                _, (_, _, evicted) = self._documents.popitem(last=False)
+                self.nbytes -= evicted
+
+    def clear(self) -> None:
+        with self._lock:
+            self._documents.clear()
+            self.nbytes = 0
+
+
+_documents = _DocumentCache(DOCUMENT_CACHE_BYTES)
+
+
+def _version(path: Path) -> tuple[int, int]:
+    # Every write replaces the file, so the inode changes even within the mtime's
+    # resolution.
+    stat = path.stat()
+    return stat.st_ino, stat.st_mtime_ns
+
+
+def _load_document(path: Path, model: type[M]) -> M:
+    version = _version(path)
+    if (document := _documents.get(path, version)) is not None:
+        return cast(M, document)
+    with open(path) as file:
+        data = file.read()
+    document = model.model_validate_json(data)
+    _documents.put(path, version, document, len(data))
+    return document
+
+
+def loaded_documents() -> tuple[int, int]:
+    """
+    Number of documents kept loaded, and the size of their stored JSON.
+    """
+    return len(_documents), _documents.nbytes
+
+
+def _load_home(uprn: str) -> Home:
+    return _load_document(_path_home(uprn), Home)
+
+
+_home_loads = _SingleFlight(_load_home)
+
+
+def get_home(uprn: str) -> Home:
+    """
+    The stored Home, shared with other callers (and kept loaded), so not to be modified.
+    """
+    return _home_loads(uprn)
+
+
+async def aget_home(uprn: str) -> Home:
+    return await _home_loads.acall(uprn)
+
+
+def iter_uprns() -> Iterator[str]:
+    """
+    UPRNs of all the stored Homes, in no particular order.
+    """
+    for path in PATH_DATA.glob("*.json"):
+        if path.stem.isnumeric():
+            yield path.stem
+
+
+def iter_homes() -> Iterator[Home]:
+    for uprn in iter_uprns():
+        yield get_home(uprn=uprn)
+
+
+def list_uprns(after: str | None = None, limit: int = 1000) -> list[str]:
+    """
+    UPRNs of the stored Homes, in order as text (e.g. "10" before "9"), starting after
+    the ``after`` UPRN.
+    """
+    return _uprn_keys.page(after=after, limit=limit)
+
+
+def save_home(home: Home) -> None:
+    if not home.uprn:
+        raise ValueError("Home must have a UPRN to be stored")
+    _write_atomic(_path_home(home.uprn), home.model_dump_json())
+    _uprn_keys.add(home.uprn)
+    home_saved.send(sender=Home, home=home)
+
+
+def _load_results(uuid: str) -> RetrofitPlannerResponsePublic:
+    return _load_document(_path_results(uuid), RetrofitPlannerResponsePublic)
+
+
+_results_loads = _SingleFlight(_load_results)
+
+
+def get_results(uuid: str) -> RetrofitPlannerResponsePublic:
+    """
+    The stored results, shared with other callers (and kept loaded), so not to be
+    modified.
+    """
+    return _results_loads(uuid)
+
+
+async def aget_results(uuid: str) -> RetrofitPlannerResponsePublic:
+    return await _results_loads.acall(uuid)
+
+
+def get_results_version(uuid: str) -> tuple[int, int]:
+    """
+    Changes whenever the stored results are replaced, for caching data derived from them.
+    """
+    return _version(_path_results(uuid))
+
+
+def save_results(results: RetrofitPlannerResponsePublic) -> None:
+    simulation_id = str(results.simulation_id)
+    _write_atomic(_path_results(simulation_id), dump_json(results))
+    _simulation_keys.add(simulation_id)
+
+
+def save_documents_json(kind: DocumentKind, documents: Sequence[tuple[str, str]]):
+    """
+    Store already validated and serialized documents in one batch.
+
+    The documents are pairs of key (UPRN or simulation UUID) and JSON. Of documents
+    with the same key, the last is stored, as if they had been saved one by one.
+    Unlike save_home, this does not send the home_saved signal.
+    """
+    if kind == "homes":
+        path_for_key, keys = _path_home, _uprn_keys
+    else:
+        path_for_key, keys = _path_results, _simulation_keys
+    latest = dict(documents)
+    _write_many_atomic([(path_for_key(key), data) for key, data in latest.items()])
+    for key in latest:
+        keys.add(key)
+
+
+def iter_simulation_ids() -> Iterator[str]:
+    """
+    Simulation UUIDs of all the stored results, in no particular order.
+    """
+    for path in PATH_DATA.glob("*.json"):
+        try:
+            simulation_id = UUID(path.stem)
+        except ValueError:
+            continue
+        if str(simulation_id) == path.stem:
+            yield path.stem
+
+
+def list_simulation_ids(after: str | None = None, limit: int = 1000) -> list[str]:
+    """
+    Simulation UUIDs of the stored results, in order, starting after ``after``.
+    """
+    return _simulation_keys.page(after=after, limit=limit)
+
 
-def get_home(uprn: str) -> Home:  # pragma: no cover
-    if uprn == "906205784":
-        with open(PATH_DATA / "906205784.json") as file:
-            return Home.model_validate_json(file.read())
-    raise FileNotFoundError("UPRN not found")
+_uprn_keys = _SortedKeys(iter_uprns)
+_simulation_keys = _SortedKeys(iter_simulation_ids)
 
 
-def get_results(uuid: str) -> RetrofitPlannerResponsePublic:  # pragma: no cover
-    if uuid == "1e0e7511-9e40-4b13-8c52-4f9c26c41c55":
-        with open(PATH_DATA / "1e0e7511-9e40-4b13-8c52-4f9c26c41c55.json") as file:
-            return RetrofitPlannerResponsePublic.model_validate_json(file.read())
-    raise FileNotFoundError("UUID not found")
+def clear_caches() -> None:
+    """
+    Forget anything loaded from the store, e.g. after it has been changed externally.
+    """
+    _uprn_keys.clear()
+    _simulation_keys.clear()
+    _documents.clear()
 
 
 # TODO could make both of these into django models and have a migration script to
@@ -0,0 +1,159 @@
+"""
+Warm-up of a process before it serves requests.
+
+With gunicorn's ``preload_app``, the master imports the app and warms it up before it
+forks the workers. The workers then share the warm state copy-on-write instead of each
+building it, including the workers started to replace those recycled after
+``max_requests``.
+"""
+
+import heapq
+import importlib
+import time
+from collections.abc import Iterator
+from typing import NamedTuple
+
+import pydantic
+import structlog
+from django.urls import get_resolver
+
+from .geo import get_home_index
+from .hotlist import read_hot_list
+from .serialization import dump_json
+from .utils import DOCUMENT_CACHE_BYTES
+from .utils import DocumentKind
+from .utils import get_home
+from .utils import get_results
+from .utils import get_results_version
+from .utils import iter_simulation_ids
+from .utils import list_simulation_ids
+from .utils import list_uprns
+from .utils import loaded_documents
+
+logger = structlog.get_logger(__name__)
+
+LAZY_MODULES = ("numpy", "drf_spectacular.views")
+"""Modules imported on first use, which each worker would otherwise import again."""
+DOCUMENTS = 100
+"""Number of documents to load by default."""
+DOCUMENTS_SECONDS = 5.0
+"""Time to spend loading documents by default."""
+
+
+class WarmUpReport(NamedTuple):
+    models: int
+    """Number of pydantic models whose validators and serializers were built."""
+    homes: int
+    """Number of Homes in the spatial index."""
+    documents: int
+    """Number of documents loaded."""
+    seconds: float
+
+
+def _subclasses(cls: type) -> Iterator[type]:
+    for subclass in cls.__subclasses__():
+        yield subclass
+        yield from _subclasses(subclass)
+
+
+def build_models(package: str = "python_challenge") -> int:
+    """
+    Build the validators and serializers of the package's pydantic models which defer
+    building them (``defer_build``) until first use.
+    """
+    built = 0
+    for model in set(_subclasses(pydantic.BaseModel)):
+        if model.__module__.startswith(f"{package}.") and not (
+            model.__pydantic_complete__
+        ):
+            model.model_rebuild()
+            built += 1
+    return built
+
+
+def _recent_results(limit: int, deadline: float) -> list[str]:
+    """
+    Simulation UUIDs of up to ``limit`` of the most recently stored results, the most
+    recent first. The scan of the store stops at the ``deadline`` (a
+    ``time.perf_counter()``), so a large store can't hold up the warm-up past its budget.
+    """
+
+    def stored() -> Iterator[tuple[int, str]]:
+        for uuid in iter_simulation_ids():
+            if time.perf_counter() >= deadline:
+                return
+            try:
+                yield get_results_version(uuid)[1], uuid
+            except FileNotFoundError:  # pragma: no cover
+                continue  # Since deleted.
+
+    return [uuid for _, uuid in heapq.nlargest(limit, stored())]
+
+
+def _candidates(limit: int, deadline: float) -> Iterator[tuple[DocumentKind, str]]:
+    seen = set()
+    for kind, key, _ in read_hot_list():
+        seen.add((kind, key))
+        yield kind, key
+    for uuid in _recent_results(limit, deadline):
+        if ("results", uuid) not in seen:
+            yield "results", uuid
+
+
+def warm_documents(
+    documents: int = DOCUMENTS,
+    seconds: float = DOCUMENTS_SECONDS,
+    max_bytes: int = DOCUMENT_CACHE_BYTES,
+) -> int:
+    """
+    Load the most requested documents of the hot list, then the most recently stored
+    results, so they are kept loaded for their first requests.
+
+    Stops after loading ``documents``, after ``seconds``, or once the loaded documents
+    add up to ``max_bytes`` of JSON. Returns the number loaded.
+    """
+    start = time.perf_counter()
+    loaded = 0
+    for kind, key in _candidates(documents, start + seconds):
+        if loaded >= documents or time.perf_counter() - start >= seconds:
+            break
+        try:
+            if kind == "homes":
+                get_home(uprn=key)
+            else:
+                get_results(uuid=key)
+        except (FileNotFoundError, pydantic.ValidationError):
+            continue  # Since deleted or replaced.
+        loaded += 1
+        if loaded_documents()[1] >= max_bytes:
+            break
+    return loaded
+
+
+def warm_up(
+    documents: int = DOCUMENTS, documents_seconds: float = DOCUMENTS_SECONDS
+) -> WarmUpReport:
+    """
+    Import the URLs (and so the views) and the lazily imported modules, build the
+    deferred models, load the indexes of the stored documents, and the most requested
+    documents (see warm_documents).
+    """
+    start = time.perf_counter()
+    # Django only imports the URLs on the first request.
+    get_resolver().url_patterns
+    for module in LAZY_MODULES:
+        importlib.import_module(module)
+    models = build_models()
+    list_uprns(limit=1)
+    simulation_ids = list_simulation_ids(limit=1)
+    homes = len(get_home_index())
+    # Fills the lookup tables and templates of the EnergyProfile serialization.
+    for simulation_id in simulation_ids:
+        try:
+            results = get_results(uuid=simulation_id)
+        except (FileNotFoundError, pydantic.ValidationError) as error:
+            logger.warning("results_not_warmed", uuid=simulation_id, error=str(error))
+            continue
+        dump_json(results)
+    loaded = warm_documents(documents, documents_seconds)
+    return WarmUpReport(models, homes, loaded, time.perf_counter() - start)
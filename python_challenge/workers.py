@@ -0,0 +1,36 @@
+"""gunicorn worker classes, see ``gunicorn.conf.py``."""
+
+import os
+from typing import Any
+
+import uvicorn_worker
+
+
+class UvicornWorker(uvicorn_worker.UvicornWorker):
+    """
+    uvicorn's worker, explicitly on uvloop's event loop with httptools' HTTP parser
+    rather than whichever are installed, so a missing one fails the worker's start
+    instead of silently falling back to asyncio's and h11's.
+
+    Its concurrent connections and requests are limited to gunicorn's
+    ``worker_connections``, above which it responds 503, and its keep-alive timeout
+    and backlog follow gunicorn's ``keepalive`` and ``backlog``.
+
+    ``UVICORN_LOOP`` and ``UVICORN_HTTP`` choose another event loop and HTTP
+    implementation, and ``UVICORN_H11_MAX_INCOMPLETE_EVENT_SIZE`` limits the bytes h11
+    buffers for a request's line and headers.
+    """
+
+    CONFIG_KWARGS = {
+        **uvicorn_worker.UvicornWorker.CONFIG_KWARGS,
+        "loop": "uvloop",
+        "http": "httptools",
+    }
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.config.limit_concurrency = self.cfg.worker_connections
+        self.config.loop = os.environ.get("UVICORN_LOOP", self.config.loop)
+        self.config.http = os.environ.get("UVICORN_HTTP", self.config.http)
+        if size := os.environ.get("UVICORN_H11_MAX_INCOMPLETE_EVENT_SIZE"):
+            self.config.h11_max_incomplete_event_size = int(size)